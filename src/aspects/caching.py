@@ -1,5 +1,6 @@
 from functools import wraps
 import inspect
+from src.services.cache_service import CacheService
 
 class Caching(type):
     def __new__(mcs: type, name: str, bases: tuple, attrs: dict):
@@ -17,11 +18,18 @@ class Caching(type):
 
     @staticmethod
     def _create_cached_wrapper(original_method):
-        """Creates a wrapper that applies caching using the instance's cache_service."""
+        """
+        Creates a wrapper that applies caching using the instance's cache_service.
+        The cache plan (key builder, serializer, TTL from `@cached`) is built once here,
+        not on every call.
+        """
+        plan = CacheService.plan(original_method)
+
         @wraps(original_method)
         async def _cached_method_wrapper(self, *args, **kwargs):
-            if not hasattr(self, 'cache_service'):
+            cache_service = getattr(self, 'cache_service', None)
+            if cache_service is None:
                 return await original_method(self, *args, **kwargs)
             
-            return await self.cache_service.cache(original_method)(self, *args, **kwargs)
-        return _cached_method_wrapper
\ No newline at end of file
+            return await cache_service.call_cached(plan, self, *args, **kwargs)
+        return _cached_method_wrapper
@@ -1,4 +1,5 @@
-from typing import Callable
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple, Type
 
 def public(func: Callable) -> Callable:
     setattr(func, "_is_public", True)
@@ -11,3 +12,26 @@ def non_cacheable(func: Callable) -> Callable:
 def excluded_from_cache(func: Callable) -> Callable:
     setattr(func, "_is_excluded_from_cache", True)
     return func
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    ttl: Optional[int] = None
+    key: Optional[Callable[..., str]] = None
+    negative: Tuple[Type[Exception], ...] = ()
+    negative_ttl: Optional[int] = None
+
+
+def cached(ttl: Optional[int] = None, key: Optional[Callable[..., str]] = None,
+           negative: Tuple[Type[Exception], ...] = (), negative_ttl: Optional[int] = None) -> Callable[[Callable], Callable]:
+    """
+    Declares the cache policy of a method in a class using the Caching metaclass.
+    `ttl` overrides the default TTL; `key` receives the call arguments (without self)
+    and returns the argument part of the cache key.
+    Exceptions of the `negative` types are cached too, for `negative_ttl` seconds
+    (CACHE_NEGATIVE_TTL_SECONDS by default), and re-raised on every hit.
+    """
+    def decorator(func: Callable) -> Callable:
+        setattr(func, "_cache_policy", CachePolicy(ttl=ttl, key=key, negative=tuple(negative), negative_ttl=negative_ttl))
+        return func
+    return decorator
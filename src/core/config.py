@@ -24,11 +24,64 @@ class Settings(BaseSettings):
     SPREADSHEET_GID: Optional[str] = ""
     API_KEY: Optional[str] = ""
     TOKEN_URI: Optional[str] = ""
+    # Full sheet reads are split into ranges of GSPREAD_RANGE_ROWS rows fetched concurrently
+    # by up to GSPREAD_FETCH_WORKERS threads (0 reads the whole sheet in one request)
+    GSPREAD_RANGE_ROWS: int = 0
+    GSPREAD_FETCH_WORKERS: int = 4
+    # Where transactions come from: "gspread", "local" (the CSV below) or "snapshot" (cleaned
+    # transactions written by `ecommerce-cli snapshot` to METRICS_SNAPSHOT_DIR, as "parquet" or "feather")
+    METRICS_SOURCE: str = "gspread"
+    METRICS_SNAPSHOT_DIR: str = "public/data/snapshot"
+    METRICS_SNAPSHOT_FORMAT: str = "parquet"
+    # Local CSV source: its path, the parser ("auto" uses pyarrow when installed, else "c")
+    # and, when > 0, how many rows to parse at a time to bound peak memory (always the "c" parser)
+    METRICS_CSV_PATH: str = "public/data/data.csv"
+    METRICS_CSV_ENGINE: str = "auto"
+    METRICS_CSV_CHUNK_ROWS: int = 0
+    # Store repeating key columns (country, stock code, customer, invoice, description) as
+    # categoricals and downcast numeric columns where lossless; results are unchanged
+    METRICS_COMPACT_DTYPES: bool = False
+    # Source reads run off the event loop in a pool of METRICS_FETCH_WORKERS threads per process;
+    # a read that takes longer than METRICS_FETCH_TIMEOUT_SECONDS fails with a 504 (0 waits indefinitely)
+    METRICS_FETCH_WORKERS: int = 4
+    METRICS_FETCH_TIMEOUT_SECONDS: float = 60
 
     # cache
+    # Where cache entries live: "redis" (shared by every process), "memory" (bounded per-process LRU)
+    # or "sqlite" (a file on local disk shared by the processes of one host)
+    CACHE_BACKEND: str = "redis"
+    CACHE_MEMORY_MAX_BYTES: int = 256 * 1024 * 1024
+    CACHE_SQLITE_PATH: str = "./cache.sqlite3"
     CACHE_TTL_SECONDS: int = 300
+    # How long designated "not found" exceptions are cached (see `@cached(negative=...)`)
+    CACHE_NEGATIVE_TTL_SECONDS: int = 30
     CACHE_DF_TTL_SECONDS: int = 600
+    # Results tagged with the version of the DataFrame they were computed from; they are
+    # invalidated by a data change, so the TTL only bounds memory use
+    CACHE_DERIVED_TTL_SECONDS: int = 86400
+    # After the soft TTL the cached DataFrame is served stale while one background refresh runs
+    CACHE_DF_SOFT_TTL_SECONDS: int = 300
+    # DataFrame cache serialization: "arrow" (falls back to "pickle" without pyarrow), "pickle" or "json"
+    CACHE_DF_FORMAT: str = "arrow"
+    # Frames longer than CACHE_DF_CHUNK_ROWS rows are stored as row-group chunks behind a manifest
+    # (0 stores every frame as one value); replaced chunks stay readable for the grace period
+    CACHE_DF_CHUNK_ROWS: int = 100_000
+    CACHE_DF_CHUNK_GRACE_SECONDS: int = 60
+    # Per-worker in-memory copy of cached DataFrames; 0 disables it
+    CACHE_DF_L1_MAX_BYTES: int = 512 * 1024 * 1024
+    # Payloads of at least CACHE_COMPRESSION_MIN_BYTES are compressed with "auto" (zstd > lz4 > zlib,
+    # whichever is installed), "zstd", "lz4", "zlib", or not at all with "none"
+    CACHE_COMPRESSION_CODEC: str = "auto"
+    CACHE_COMPRESSION_MIN_BYTES: int = 16 * 1024
+    # Cross-process single-flight lock: how long a holder keeps it without a heartbeat,
+    # and how long other workers wait for the holder's result before computing themselves
+    CACHE_LOCK_TIMEOUT_SECONDS: int = 60
+    CACHE_LOCK_WAIT_SECONDS: int = 30
     REDIS_URL: str = "redis://localhost:6379/0"
+    # Shared connection pool (one per API process and per Celery worker process): its size,
+    # and how long a command waits for a free connection before failing
+    REDIS_POOL_MAX_CONNECTIONS: int = 50
+    REDIS_POOL_TIMEOUT_SECONDS: int = 5
     # celery
     CELERY_BROKER_URL: str = 'redis://localhost:6379/1'
     CELERY_RESULT_BACKEND: str = 'redis://localhost:6379/1'
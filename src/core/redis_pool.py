@@ -0,0 +1,103 @@
+from typing import Optional
+import logging
+import time
+
+from redis import asyncio as aioredis
+from redis.asyncio.connection import BlockingConnectionPool
+from redis.exceptions import ConnectionError
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class InstrumentedConnectionPool(BlockingConnectionPool):
+    """
+    Size-bounded connection pool that records how saturated it gets.
+    When every connection is checked out, callers wait up to `timeout` seconds for one
+    instead of opening more sockets; those waits are what `stats()` makes visible.
+    """
+    def reset(self):
+        super().reset()
+        self.reset_stats()
+
+    @property
+    def in_use(self) -> int:
+        # The queue holds one slot (an idle connection or a placeholder) per free connection.
+        return self.max_connections - self.pool.qsize()
+
+    def reset_stats(self) -> None:
+        self.acquisitions = 0
+        self.saturated_acquisitions = 0
+        self.timeouts = 0
+        self.peak_in_use = self.in_use
+        self.acquire_seconds = 0.0
+        self.max_acquire_seconds = 0.0
+
+    async def get_connection(self, command_name, *keys, **options):
+        saturated = self.pool.empty()
+        start = time.perf_counter()
+        try:
+            connection = await super().get_connection(command_name, *keys, **options)
+        except ConnectionError:
+            self.timeouts += 1
+            raise
+        elapsed = time.perf_counter() - start
+        self.acquisitions += 1
+        self.saturated_acquisitions += int(saturated)
+        self.peak_in_use = max(self.peak_in_use, self.in_use)
+        self.acquire_seconds += elapsed
+        self.max_acquire_seconds = max(self.max_acquire_seconds, elapsed)
+        return connection
+
+    def stats(self) -> dict:
+        return {
+            "max_connections": self.max_connections,
+            "open_connections": len(self._connections),
+            "in_use": self.in_use,
+            "peak_in_use": self.peak_in_use,
+            "acquisitions": self.acquisitions,
+            "saturated_acquisitions": self.saturated_acquisitions,
+            "timeouts": self.timeouts,
+            "avg_acquire_ms": round(self.acquire_seconds / self.acquisitions * 1000, 3) if self.acquisitions else None,
+            "max_acquire_ms": round(self.max_acquire_seconds * 1000, 3),
+        }
+
+
+# The pool of this process: created by the FastAPI lifespan handler or when a Celery worker process starts.
+_pool: Optional[InstrumentedConnectionPool] = None
+
+
+def create_redis_pool(url: Optional[str] = None, max_connections: Optional[int] = None, timeout: Optional[int] = None) -> InstrumentedConnectionPool:
+    # Cached DataFrames are binary, so responses are never decoded.
+    return InstrumentedConnectionPool.from_url(
+        url or settings.REDIS_URL,
+        max_connections=max_connections or settings.REDIS_POOL_MAX_CONNECTIONS,
+        timeout=timeout if timeout is not None else settings.REDIS_POOL_TIMEOUT_SECONDS,
+        decode_responses=False,
+    )
+
+
+def init_redis_pool(**kwargs) -> InstrumentedConnectionPool:
+    global _pool
+    if _pool is None:
+        _pool = create_redis_pool(**kwargs)
+        logger.info(f"Redis connection pool created (max {_pool.max_connections} connections)")
+    return _pool
+
+
+def get_redis_pool() -> Optional[InstrumentedConnectionPool]:
+    return _pool
+
+
+async def close_redis_pool() -> None:
+    global _pool
+    if _pool is not None:
+        pool, _pool = _pool, None
+        await pool.disconnect()
+        logger.info("Redis connection pool closed")
+
+
+def pooled_redis_client() -> aioredis.Redis:
+    """A client on this process's pool. Closing it is not needed and leaves the pool open."""
+    return aioredis.Redis(connection_pool=init_redis_pool())
@@ -0,0 +1,32 @@
+from functools import lru_cache
+from typing import Optional
+
+from redis.asyncio import Redis
+
+from src.core.config import settings
+from src.services.cache.cache_backend import CacheBackend
+from src.services.cache.impl.memory_cache_backend import MemoryCacheBackend
+from src.services.cache.impl.redis_cache_backend import RedisCacheBackend
+from src.services.cache.impl.sqlite_cache_backend import SqliteCacheBackend
+
+CACHE_BACKENDS = ("redis", "memory", "sqlite")
+
+
+@lru_cache
+def get_local_cache_backend(name: str) -> CacheBackend:
+    """The in-process and on-disk backends hold state, so each process builds them once."""
+    if name == "memory":
+        return MemoryCacheBackend(settings.CACHE_MEMORY_MAX_BYTES)
+    if name == "sqlite":
+        return SqliteCacheBackend(settings.CACHE_SQLITE_PATH)
+    raise ValueError(f"Unknown local cache backend '{name}'")
+
+
+def build_cache_backend(redis_client: Optional[Redis] = None, name: Optional[str] = None) -> CacheBackend:
+    """Returns the backend selected by CACHE_BACKEND; the Redis one wraps `redis_client`."""
+    name = name or settings.CACHE_BACKEND
+    if name not in CACHE_BACKENDS:
+        raise ValueError(f"CACHE_BACKEND must be one of {CACHE_BACKENDS}, got '{name}'")
+    if name == "redis":
+        return RedisCacheBackend(redis_client)
+    return get_local_cache_backend(name)
@@ -1,11 +1,42 @@
 import json
 import os
+import threading
+from typing import Optional
 import gspread
 from gspread import Client
 from src.core.config import settings
 
+# The client of this process, and the pid that created it (a forked worker builds its own).
+_client: Optional[Client] = None
+_client_pid: Optional[int] = None
+_client_lock = threading.Lock()
+
 
 def get_gspread_client() -> Client:
+    """
+    Returns this process's gspread client, creating it on first use.
+    Credentials are read and parsed once; the client's authorized session refreshes
+    the access token by itself when it expires, so the client is reused for the process lifetime.
+    """
+    global _client, _client_pid
+    if _client is not None and _client_pid == os.getpid():
+        return _client
+    with _client_lock:
+        if _client is None or _client_pid != os.getpid():
+            _client = create_gspread_client()
+            _client_pid = os.getpid()
+        return _client
+
+
+def reset_gspread_client() -> None:
+    """Drops the process client (e.g. after rotating credentials); the next call creates a new one."""
+    global _client, _client_pid
+    with _client_lock:
+        _client = None
+        _client_pid = None
+
+
+def create_gspread_client() -> Client:
     """Create a gspread client from several possible credential sources.
 
     The function supports:
@@ -77,7 +108,3 @@ def get_gspread_client() -> Client:
         )
         raise RuntimeError(msg) from exc
 
-
-# Do not create a global client at import time; callers should call
-# `get_gspread_client()` when they need a client. This avoids import-time
-# failures in CI when credentials aren't available.
\ No newline at end of file
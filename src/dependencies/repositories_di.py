@@ -14,12 +14,28 @@ def get_user_repository(db: Session = Depends(get_db_session)) -> UserRepository
 # MetricsRepository
 # ----------------------------------------------------------------------
 
-from gspread import Client
+from typing import Optional
+from src.core.config import settings
 from src.dependencies.gspread_client import get_gspread_client
 from src.repositories.impl.metrics_repository_gspread import MetricsRepositoryGspread
+from src.repositories.impl.metrics_repository_lazy import MetricsRepositoryLazy
 from src.repositories.metrics_repository import MetricsRepository
 from src.repositories.impl.metrics_repository_local import MetricsRepositoryLocal
+from src.repositories.impl.metrics_repository_snapshot import MetricsRepositorySnapshot
 
-def get_metrics_repository(_gspread_client: Client = Depends(get_gspread_client)) -> MetricsRepository:
-    # return MetricsRepositoryLocal()
-    return MetricsRepositoryGspread(_gspread_client)
\ No newline at end of file
+METRICS_SOURCES = ("gspread", "local", "snapshot")
+
+def build_metrics_repository(source: Optional[str] = None) -> MetricsRepository:
+    """Returns the repository of the METRICS_SOURCE source (or of `source`)."""
+    source = source or settings.METRICS_SOURCE
+    if source not in METRICS_SOURCES:
+        raise ValueError(f"METRICS_SOURCE must be one of {METRICS_SOURCES}, got '{source}'")
+    if source == "local":
+        return MetricsRepositoryLocal()
+    if source == "snapshot":
+        return MetricsRepositorySnapshot()
+    # The gspread client is only created (once per process) when a cache miss needs the sheet.
+    return MetricsRepositoryLazy(lambda: MetricsRepositoryGspread(get_gspread_client()))
+
+def get_metrics_repository() -> MetricsRepository:
+    return build_metrics_repository()
@@ -16,16 +16,31 @@ from src.services.metrics.metrics_service import MetricsService
 from src.dependencies.repositories_di import get_metrics_repository
 from src.services.cache_service import CacheService
 from src.repositories.metrics_repository import MetricsRepository
+from src.core.redis_pool import get_redis_pool
+from src.dependencies.cache_backend import build_cache_backend
+from src.services.cache.cache_backend import CacheBackend
 
 async def get_redis_client():
-    redis = await aioredis.from_url(settings.REDIS_URL, encoding="utf-8", decode_responses=True)
+    """
+    Yields a client on the app-lifetime pool created by the lifespan handler.
+    Without it (e.g. the app was not started through its lifespan) a client is
+    opened and closed for this request only.
+    """
+    pool = get_redis_pool()
+    if pool is not None:
+        yield aioredis.Redis(connection_pool=pool)
+        return
+    redis = await aioredis.from_url(settings.REDIS_URL, decode_responses=False)
     try:
         yield redis
     finally:
         await redis.close()
 
-def get_cache_service(redis_client: aioredis.Redis = Depends(get_redis_client)) -> CacheService:
-    return CacheService(redis_client)
+def get_cache_backend(redis_client: aioredis.Redis = Depends(get_redis_client)) -> CacheBackend:
+    return build_cache_backend(redis_client)
+
+def get_cache_service(cache_backend: CacheBackend = Depends(get_cache_backend)) -> CacheService:
+    return CacheService(cache_backend)
 
 # ----------------------------------------------------------------------
 # CookieService
@@ -56,8 +71,8 @@ def get_injected_user_service(
 # AuthService
 # ----------------------------------------------------------------------
 
-def get_auth_service(user_repository: UserRepository = Depends(get_user_repository), cookie_service: CookieService = Depends(get_cookie_service)):
-    return AuthService(user_repository, cookie_service)
+def get_auth_service(user_repository: UserRepository = Depends(get_user_repository), cookie_service: CookieService = Depends(get_cookie_service), cache_service: CacheService = Depends(get_cache_service)):
+    return AuthService(user_repository, cookie_service, cache_service)
 
 # ----------------------------------------------------------------------
 # MetricsService
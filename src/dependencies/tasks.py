@@ -1,21 +1,24 @@
 import gspread
 import os
-from redis import asyncio as aioredis
-
 from src.core.config import settings
+from src.core.redis_pool import pooled_redis_client
+from src.dependencies.cache_backend import build_cache_backend
 from src.repositories.impl.metrics_repository_gspread import MetricsRepositoryGspread
 from src.repositories.impl.metrics_repository_local import MetricsRepositoryLocal
 from src.repositories.metrics_repository import MetricsRepository
 from src.services.cache_service import CacheService
 from src.services.metrics.metrics_service import MetricsService
 from src.dependencies.gspread_client import get_gspread_client
+from src.dependencies.repositories_di import build_metrics_repository
 
 def get_metrics_repository() -> MetricsRepository:
     """
     Returns an instance of a metrics repository.
-    It uses the Gspread implementation if USE_GSPREAD_CLIENT is set to 'true',
-    otherwise it falls back to the local CSV implementation.
+    It uses the METRICS_SOURCE repository; for the default gspread source it
+    falls back to the local CSV implementation when no client can be created.
     """
+    if settings.METRICS_SOURCE != "gspread":
+        return build_metrics_repository()
     try:
         client = get_gspread_client()
         return MetricsRepositoryGspread(gspread_client=client)
@@ -26,8 +29,7 @@ def get_metrics_repository() -> MetricsRepository:
 
 async def get_metrics_service_instance() -> MetricsService:
     """Creates and returns an instance of MetricsService with its dependencies."""
-    redis_client = await aioredis.from_url(settings.REDIS_URL, encoding="utf-8", decode_responses=True)
-    cache_service = CacheService(redis_client)
+    cache_service = CacheService(build_cache_backend(pooled_redis_client()))
     metrics_repository = get_metrics_repository()
     
     metrics_service = MetricsService(metrics_repository, cache_service, settings.CACHE_DF_TTL_SECONDS)
@@ -0,0 +1,8 @@
+from typing import Iterable
+from fastapi import status
+from src.exceptions.generic_exceptions import MyHTTPException
+
+class InvalidCacheKeyPrefix(MyHTTPException):
+    def __init__(self, prefix: str, allowed_prefixes: Iterable[str]):
+        allowed = ", ".join(f"'{allowed}'" for allowed in allowed_prefixes)
+        super().__init__(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=f"Cache key prefix '{prefix}' must start with one of {allowed}")
@@ -1,5 +1,10 @@
-from src.exceptions.generic_exceptions import NotFoundException
+from fastapi import status
+from src.exceptions.generic_exceptions import MyHTTPException, NotFoundException
 
 class CountryNotFoundException(NotFoundException):
     def __init__(self, country_name: str):
-        super().__init__(detail=f"Country {country_name} not found")
\ No newline at end of file
+        super().__init__(detail=f"Country {country_name} not found")
+
+class MetricsSourceTimeoutException(MyHTTPException):
+    def __init__(self, timeout_seconds: float):
+        super().__init__(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=f"The metrics source did not answer within {timeout_seconds:g} seconds")
@@ -6,14 +6,24 @@ from src.core.middleware import JWTCookieAuthMiddleware
 from src.core.config import settings
 from src.core.logging_config import setup_logging
 from contextlib import asynccontextmanager
-from src.dependencies.services_di import get_redis_client
+from src.core.redis_pool import init_redis_pool, close_redis_pool
 
 setup_logging()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One bounded Redis pool for the lifetime of the process instead of a connection per request.
+    init_redis_pool()
+    try:
+        yield
+    finally:
+        await close_redis_pool()
+
 app = FastAPI(
     description="API REST",
     version="1.0.1",
     exception_handlers=exception_handlers,
+    lifespan=lifespan,
 )
 
 def set_up(app: FastAPI):
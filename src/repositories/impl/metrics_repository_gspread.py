@@ -1,17 +1,102 @@
-from gspread import Client
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+import numpy as np
+from gspread import Client, Worksheet
 from pandas import DataFrame
-from src.repositories.metrics_repository import MetricsRepository
+from src.core.config import settings
+from src.repositories.metrics_repository import MetricsRepository, RowWatermark, row_fingerprint
 
 class MetricsRepositoryGspread(MetricsRepository):
-    def __init__(self, gspread_client: Client):
+    """
+    Reads the transactions sheet as raw 2-D cell values (strings, as formatted in the sheet)
+    and builds the columns directly; MetricsService converts the numeric and date columns itself.
+    """
+    def __init__(self, gspread_client: Client, range_rows: Optional[int] = None, fetch_workers: Optional[int] = None):
         self.client: Client = gspread_client
+        self.range_rows = settings.GSPREAD_RANGE_ROWS if range_rows is None else range_rows
+        self.fetch_workers = fetch_workers or settings.GSPREAD_FETCH_WORKERS
     
     def get_sheet_name(self) -> str:
         return "data"
+
+    def _worksheet(self) -> Worksheet:
+        return self.client.open(self.get_sheet_name()).sheet1
         
     def get_raw_transactions(self) -> DataFrame:
-            sheet_name: str = self.get_sheet_name()
-            sheet_instance = self.client.open(sheet_name).sheet1
-            return DataFrame(sheet_instance.get_all_records())
-        
-            
\ No newline at end of file
+        df, _ = self.get_raw_transactions_with_watermark()
+        return df
+
+    def get_raw_transactions_with_watermark(self) -> tuple[DataFrame, Optional[RowWatermark]]:
+        values = _without_trailing_blank_rows(self._read_values(self._worksheet()))
+        if not values:
+            return DataFrame(), None
+        header, rows = values[0], values[1:]
+        return _to_dataframe(header, rows), RowWatermark.of(header, rows)
+
+    def _read_values(self, worksheet: Worksheet) -> List[List[str]]:
+        """
+        The whole grid, header first. Large sheets are read as row ranges fetched concurrently;
+        each range is padded back to its full height because the API drops its trailing blank rows.
+        """
+        row_count = worksheet.row_count
+        if not self.range_rows or row_count <= self.range_rows:
+            return worksheet.get_all_values()
+        bounds = [(start, min(start + self.range_rows - 1, row_count)) for start in range(1, row_count + 1, self.range_rows)]
+        with ThreadPoolExecutor(max_workers=min(self.fetch_workers, len(bounds))) as executor:
+            parts = list(executor.map(lambda bound: worksheet.get(f"{bound[0]}:{bound[1]}"), bounds))
+        values: List[List[str]] = []
+        for (start, end), part in zip(bounds, parts):
+            values.extend(part)
+            values.extend([] for _ in range(end - start + 1 - len(part)))
+        return values
+
+    def get_raw_transactions_after(self, watermark: RowWatermark) -> Optional[tuple[DataFrame, RowWatermark]]:
+        """
+        One batch request reads the header, the last ingested row (to check nothing above the
+        watermark changed) and every row after it, so the cost scales with the new rows only.
+        """
+        if watermark.rows == 0:
+            return None
+        worksheet = self._worksheet()
+        last_row_number = watermark.rows + 1  # row 1 is the header
+        ranges = ["1:1", f"{last_row_number}:{last_row_number}"]
+        if last_row_number < worksheet.row_count:
+            ranges.append(f"{last_row_number + 1}:{worksheet.row_count}")
+        header_range, last_row_range, *new_rows_range = worksheet.batch_get(ranges)
+
+        header = header_range[0] if header_range else []
+        last_row = last_row_range[0] if last_row_range else []
+        if row_fingerprint(header) != watermark.header or row_fingerprint(last_row) != watermark.last_row:
+            return None
+
+        new_rows = _without_trailing_blank_rows(list(new_rows_range[0]) if new_rows_range else [])
+        if not new_rows:
+            return _to_dataframe(header, []), watermark
+        return _to_dataframe(header, new_rows), RowWatermark(
+            rows=watermark.rows + len(new_rows), header=watermark.header, last_row=row_fingerprint(new_rows[-1])
+        )
+
+
+def _without_trailing_blank_rows(rows: List[List[str]]) -> List[List[str]]:
+    # Blank rows at the end of the grid are not data.
+    end = len(rows)
+    while end and not any(rows[end - 1]):
+        end -= 1
+    return rows[:end]
+
+
+def _to_dataframe(header: List[str], rows: List[List[str]]) -> DataFrame:
+    """
+    Builds the columns from one 2-D object array instead of per-row records.
+    Range reads drop trailing blank cells, so short rows are padded back to the header width.
+    """
+    width = len(header)
+    if not rows:
+        return DataFrame({i: np.empty(0, dtype=object) for i in range(width)}).set_axis(header, axis=1)
+    grid = np.empty((len(rows), width), dtype=object)
+    for i, row in enumerate(rows):
+        if len(row) == width:
+            grid[i] = row
+        else:
+            grid[i] = list(row[:width]) + [""] * (width - len(row))
+    return DataFrame({i: grid[:, i] for i in range(width)}).set_axis(header, axis=1)
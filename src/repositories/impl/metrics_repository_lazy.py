@@ -0,0 +1,38 @@
+from typing import Callable, Optional
+from pandas import DataFrame
+from src.repositories.metrics_repository import MetricsRepository, RowWatermark
+
+
+class MetricsRepositoryLazy(MetricsRepository):
+    """
+    Defers building the real repository (and whatever client it needs) until source data
+    is actually read, so requests answered from the cache never create it.
+    """
+    def __init__(self, factory: Callable[[], MetricsRepository]):
+        self._factory = factory
+        self._repository: Optional[MetricsRepository] = None
+
+    @property
+    def repository(self) -> MetricsRepository:
+        if self._repository is None:
+            self._repository = self._factory()
+        return self._repository
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._repository is not None
+
+    def get_sheet_name(self) -> str:
+        return self.repository.get_sheet_name()
+
+    def get_raw_transactions(self) -> DataFrame:
+        return self.repository.get_raw_transactions()
+
+    def get_clean_transactions(self) -> Optional[DataFrame]:
+        return self.repository.get_clean_transactions()
+
+    def get_raw_transactions_with_watermark(self) -> tuple[DataFrame, Optional[RowWatermark]]:
+        return self.repository.get_raw_transactions_with_watermark()
+
+    def get_raw_transactions_after(self, watermark: RowWatermark) -> Optional[tuple[DataFrame, RowWatermark]]:
+        return self.repository.get_raw_transactions_after(watermark)
@@ -1,11 +1,149 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+import logging
+import time
+from src.core.config import settings
 from src.repositories.metrics_repository import MetricsRepository
 from pandas import DataFrame
+import numpy as np
 import pandas as pd
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # pragma: no cover - depends on the environment
+    pa = None
+    pa_csv = None
+
+logger = logging.getLogger(__name__)
+
+CSV_ENGINES = ("auto", "pyarrow", "c")
+DATETIME = "datetime64[ns]"
+
+
+@dataclass(frozen=True)
+class CsvSchema:
+    """
+    The columns to read and their dtypes ("str", a numpy numeric dtype or DATETIME);
+    columns missing from `dtypes` are skipped. Datetime columns are parsed with `date_format`.
+    """
+    dtypes: Dict[str, str]
+    date_format: Optional[str] = None
+
+    @property
+    def usecols(self) -> List[str]:
+        return list(self.dtypes)
+
+    @property
+    def date_columns(self) -> List[str]:
+        return [column for column, dtype in self.dtypes.items() if dtype == DATETIME]
+
+
+TRANSACTIONS_CSV_SCHEMA = CsvSchema(
+    dtypes={
+        "InvoiceNo": "str",
+        "StockCode": "str",
+        "Description": "str",
+        "Quantity": "float64",
+        "InvoiceDate": DATETIME,
+        "UnitPrice": "float64",
+        "CustomerID": "str",
+        "Country": "str",
+    },
+    date_format="%m/%d/%Y %H:%M",
+)
+
+
 class MetricsRepositoryLocal(MetricsRepository):
-    
+    """
+    Reads the transactions from a local CSV with an explicit schema, so only the needed
+    columns are parsed, straight to their dtypes, and dates are parsed with a known format.
+    A file that does not fit the schema is read untyped and left to MetricsService to clean.
+    """
+    def __init__(self, path: Optional[str] = None, schema: Optional[CsvSchema] = TRANSACTIONS_CSV_SCHEMA, engine: Optional[str] = None, chunk_rows: Optional[int] = None):
+        self.path = path or settings.METRICS_CSV_PATH
+        self.schema = schema
+        self.engine = resolve_engine(engine or settings.METRICS_CSV_ENGINE)
+        self.chunk_rows = settings.METRICS_CSV_CHUNK_ROWS if chunk_rows is None else chunk_rows
+
     def get_sheet_name(self) -> str:
         return "data"
-    
+
     def get_raw_transactions(self) -> DataFrame:
-        return pd.read_csv("public/data/data.csv", encoding="utf-8")
\ No newline at end of file
+        if self.schema is None:
+            return pd.read_csv(self.path, encoding="utf-8")
+        start = time.perf_counter()
+        try:
+            if self.chunk_rows:
+                df = self._read_chunked()
+            elif self.engine == "pyarrow":
+                df = self._read_pyarrow()
+            else:
+                df = self._read_c()
+        except (ValueError, TypeError, KeyError) as exc:
+            # pyarrow's ArrowInvalid is a ValueError too.
+            logger.warning(f"{self.path} does not match its schema ({exc}); reading it untyped")
+            return pd.read_csv(self.path, encoding="utf-8")
+        logger.info(f"Read {len(df)} rows from {self.path} in {(time.perf_counter() - start) * 1000:.0f} ms")
+        return df
+
+    def _read_pyarrow(self) -> DataFrame:
+        column_types = {column: _arrow_type(dtype) for column, dtype in self.schema.dtypes.items()}
+        table = pa_csv.read_csv(
+            self.path,
+            convert_options=pa_csv.ConvertOptions(
+                column_types=column_types,
+                include_columns=self.schema.usecols,
+                strings_can_be_null=True,
+                timestamp_parsers=[self.schema.date_format] if self.schema.date_format else None,
+            ),
+        )
+        df = table.to_pandas()
+        # Missing strings are NaN, as with pandas' own parser, not None.
+        for column, dtype in self.schema.dtypes.items():
+            if dtype == "str" and table.column(column).null_count:
+                df[column] = df[column].fillna(np.nan)
+        return df
+
+    def _read_c(self) -> DataFrame:
+        return self._parse_dates(pd.read_csv(self.path, encoding="utf-8", **self._read_csv_options()))
+
+    def _read_chunked(self) -> DataFrame:
+        """Parses `chunk_rows` rows at a time, so only one chunk of raw date strings is alive at once."""
+        chunks = pd.read_csv(self.path, encoding="utf-8", chunksize=self.chunk_rows, **self._read_csv_options())
+        return pd.concat((self._parse_dates(chunk) for chunk in chunks), ignore_index=True)
+
+    def _read_csv_options(self) -> dict:
+        return {
+            "engine": "c",
+            "usecols": self.schema.usecols,
+            "dtype": {column: dtype for column, dtype in self.schema.dtypes.items() if dtype != DATETIME},
+        }
+
+    def _parse_dates(self, df: DataFrame) -> DataFrame:
+        for column in self.schema.date_columns:
+            raw = df[column]
+            parsed = pd.to_datetime(raw, format=self.schema.date_format, errors="coerce")
+            failed = parsed.isna() & raw.notna()
+            if failed.any():
+                parsed[failed] = pd.to_datetime(raw[failed], errors="coerce")
+            df[column] = parsed
+        return df
+
+
+def resolve_engine(requested: str) -> str:
+    if requested not in CSV_ENGINES:
+        raise ValueError(f"METRICS_CSV_ENGINE must be one of {CSV_ENGINES}, got '{requested}'")
+    if requested == "c" or pa_csv is not None:
+        return "pyarrow" if requested == "auto" else requested
+    if requested == "pyarrow":
+        logger.warning("pyarrow is not installed; reading CSV files with pandas' C parser")
+    return "c"
+
+
+def _arrow_type(dtype: str) -> "pa.DataType":
+    if dtype == "str":
+        return pa.string()
+    if dtype == DATETIME:
+        return pa.timestamp("ns")
+    return pa.from_numpy_dtype(np.dtype(dtype))
@@ -0,0 +1,189 @@
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pandas import DataFrame
+from src.core.config import settings
+from src.repositories.metrics_repository import MetricsRepository
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as pa_feather
+    import pyarrow.parquet as pa_parquet
+except ImportError:  # pragma: no cover - depends on the environment
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+SNAPSHOT_FORMATS = {"parquet": "parquet", "feather": "feather"}  # format -> file extension
+
+
+@dataclass(frozen=True)
+class SnapshotManifest:
+    """
+    Describes the current snapshot. The manifest is swapped in after its data file is
+    complete, so whoever reads it always finds the file it names.
+    `index` is the column the frame's index is rebuilt from (the index itself is not stored).
+    """
+    file: str
+    format: str
+    rows: int
+    min_invoice_date: Optional[str]
+    max_invoice_date: Optional[str]
+    fingerprint: str
+    created_at: str
+    index: Optional[str] = None
+
+    def encode(self) -> str:
+        return json.dumps(asdict(self), indent=2)
+
+    @classmethod
+    def decode(cls, raw: str) -> "SnapshotManifest":
+        return cls(**json.loads(raw))
+
+
+class MetricsRepositorySnapshot(MetricsRepository):
+    """
+    Reads cleaned transactions from a columnar snapshot written by `ecommerce-cli snapshot`,
+    memory-mapping the file, so workers start from disk without gspread or `_process_dataframe`.
+    """
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = Path(directory or settings.METRICS_SNAPSHOT_DIR)
+
+    def get_sheet_name(self) -> str:
+        return "data"
+
+    def read_manifest(self) -> SnapshotManifest:
+        path = self.directory / MANIFEST_FILE
+        if not path.exists():
+            raise FileNotFoundError(f"No transactions snapshot in {self.directory}; run `ecommerce-cli snapshot` first")
+        return SnapshotManifest.decode(path.read_text(encoding="utf-8"))
+
+    def get_clean_transactions(self) -> DataFrame:
+        _require_pyarrow()
+        start = time.perf_counter()
+        manifest = self.read_manifest()
+        path = str(self.directory / manifest.file)
+        if manifest.format == "feather":
+            table = pa_feather.read_table(path, memory_map=True)
+        else:
+            table = pa_parquet.read_table(path, memory_map=True)
+        if table.num_rows != manifest.rows:
+            raise RuntimeError(f"Snapshot {path} has {table.num_rows} rows, its manifest says {manifest.rows}")
+        df = table.to_pandas()
+        if manifest.index:
+            df = df.set_index(manifest.index, drop=False)
+        logger.info(f"Read {len(df)} rows from snapshot {path} in {(time.perf_counter() - start) * 1000:.0f} ms")
+        return df
+
+    def get_raw_transactions(self) -> DataFrame:
+        # The snapshot only holds cleaned rows; cleaning them again is harmless.
+        return self.get_clean_transactions()
+
+
+def write_snapshot(df: DataFrame, directory: str, fmt: str = "parquet", date_column: str = "invoicedate") -> SnapshotManifest:
+    """
+    Atomically replaces the snapshot in `directory` with the cleaned frame `df`.
+    The data goes to a temporary file renamed to a name of its own (from its fingerprint),
+    then the manifest is replaced the same way. The previous data file is kept for readers
+    that read the old manifest; older ones are removed.
+    """
+    _require_pyarrow()
+    if fmt not in SNAPSHOT_FORMATS:
+        raise ValueError(f"Snapshot format must be one of {tuple(SNAPSHOT_FORMATS)}, got '{fmt}'")
+    target = Path(directory)
+    target.mkdir(parents=True, exist_ok=True)
+
+    index = df.index.name if df.index.name in df.columns else None
+    table = pa.Table.from_pandas(df.reset_index(drop=True) if index else df, preserve_index=index is None)
+    data_tmp = _temporary_path(target)
+    try:
+        if fmt == "feather":
+            pa_feather.write_feather(table, data_tmp)
+        else:
+            pa_parquet.write_table(table, data_tmp)
+        fingerprint = _file_fingerprint(data_tmp)
+        data_file = f"transactions-{fingerprint[:16]}.{SNAPSHOT_FORMATS[fmt]}"
+        _fsync(data_tmp)
+        os.replace(data_tmp, target / data_file)
+    except BaseException:
+        Path(data_tmp).unlink(missing_ok=True)
+        raise
+
+    dates = df[date_column] if date_column in df.columns and len(df) else None
+    manifest = SnapshotManifest(
+        file=data_file,
+        format=fmt,
+        rows=len(df),
+        min_invoice_date=dates.min().isoformat() if dates is not None else None,
+        max_invoice_date=dates.max().isoformat() if dates is not None else None,
+        fingerprint=fingerprint,
+        created_at=datetime.now(timezone.utc).isoformat(),
+        index=index,
+    )
+    previous = _previous_data_file(target)
+    manifest_tmp = _temporary_path(target)
+    try:
+        with open(manifest_tmp, "w", encoding="utf-8") as fh:
+            fh.write(manifest.encode())
+        _fsync(manifest_tmp)
+        os.replace(manifest_tmp, target / MANIFEST_FILE)
+    except BaseException:
+        Path(manifest_tmp).unlink(missing_ok=True)
+        raise
+    _fsync_directory(target)
+
+    for stale in target.glob("transactions-*"):
+        if stale.name not in (data_file, previous):
+            stale.unlink(missing_ok=True)
+    logger.info(f"Wrote snapshot {target / data_file} ({len(df)} rows)")
+    return manifest
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise RuntimeError("Transactions snapshots need pyarrow; install it to read or write them")
+
+
+def _temporary_path(directory: Path) -> str:
+    fd, path = tempfile.mkstemp(dir=directory, prefix=".snapshot-", suffix=".tmp")
+    os.close(fd)
+    return path
+
+
+def _previous_data_file(directory: Path) -> Optional[str]:
+    try:
+        return SnapshotManifest.decode((directory / MANIFEST_FILE).read_text(encoding="utf-8")).file
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def _file_fingerprint(path: str) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _fsync(path: str) -> None:
+    with open(path, "rb") as fh:
+        os.fsync(fh.fileno())
+
+
+def _fsync_directory(directory: Path) -> None:
+    # Makes the renames durable; directories cannot be opened on Windows.
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(directory, os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
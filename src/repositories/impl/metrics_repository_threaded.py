@@ -0,0 +1,106 @@
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from functools import partial
+from typing import Optional, Union
+import asyncio
+import logging
+import os
+import threading
+import time
+from pandas import DataFrame
+from src.core.config import settings
+from src.exceptions.metrics_exceptions import MetricsSourceTimeoutException
+from src.repositories.metrics_repository import AsyncMetricsRepository, MetricsRepository, RowWatermark
+
+logger = logging.getLogger(__name__)
+
+# The read pool of this process, and the pid that created it (a forked worker builds its own).
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_pid: Optional[int] = None
+_executor_lock = threading.Lock()
+
+
+def get_fetch_executor() -> ThreadPoolExecutor:
+    """Returns this process's pool of METRICS_FETCH_WORKERS threads that source reads run in."""
+    global _executor, _executor_pid
+    if _executor is not None and _executor_pid == os.getpid():
+        return _executor
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(max_workers=max(1, settings.METRICS_FETCH_WORKERS), thread_name_prefix="metrics-fetch")
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def reset_fetch_executor() -> None:
+    """Shuts the process pool down (queued reads are cancelled); the next read creates a new one."""
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is not None and _executor_pid == os.getpid():
+            _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+        _executor_pid = None
+
+
+class MetricsRepositoryThreaded(AsyncMetricsRepository):
+    """
+    Adapts a synchronous MetricsRepository to the async contract: each read runs in a bounded
+    thread pool while the event loop keeps serving other requests.
+    A read that takes longer than `timeout_seconds` (0 waits indefinitely) raises
+    MetricsSourceTimeoutException. A read whose caller is cancelled or times out is dropped
+    if it is still queued; one already running cannot be interrupted, so it finishes in its
+    thread and its result is discarded.
+    """
+    def __init__(self, repository: MetricsRepository, timeout_seconds: Optional[float] = None, executor: Optional[Executor] = None):
+        self.repository = repository
+        self.timeout_seconds = settings.METRICS_FETCH_TIMEOUT_SECONDS if timeout_seconds is None else timeout_seconds
+        self._executor = executor
+
+    def get_sheet_name(self) -> str:
+        return self.repository.get_sheet_name()
+
+    async def get_raw_transactions(self) -> DataFrame:
+        return await self._run("get_raw_transactions")
+
+    async def get_clean_transactions(self) -> Optional[DataFrame]:
+        return await self._run("get_clean_transactions")
+
+    async def get_raw_transactions_with_watermark(self) -> tuple[DataFrame, Optional[RowWatermark]]:
+        return await self._run("get_raw_transactions_with_watermark")
+
+    async def get_raw_transactions_after(self, watermark: RowWatermark) -> Optional[tuple[DataFrame, RowWatermark]]:
+        return await self._run("get_raw_transactions_after", watermark)
+
+    async def _run(self, method: str, *args):
+        executor = self._executor or get_fetch_executor()
+        future = executor.submit(partial(getattr(self.repository, method), *args))
+        waiter = asyncio.wrap_future(future)
+        start = time.perf_counter()
+        try:
+            # asyncio.wait does not raise on timeout, so a TimeoutError raised by the read itself
+            # is not mistaken for ours.
+            done, _ = await asyncio.wait((waiter,), timeout=self.timeout_seconds or None)
+        except asyncio.CancelledError:
+            self._abandon(method, waiter, future, start)
+            raise
+        if not done:
+            self._abandon(method, waiter, future, start)
+            raise MetricsSourceTimeoutException(self.timeout_seconds)
+        return waiter.result()
+
+    @staticmethod
+    def _abandon(method: str, waiter: asyncio.Future, future: Future, start: float) -> None:
+        waiter.cancel()
+        if future.cancel():
+            logger.info(f"Dropped queued source read {method}")
+            return
+        logger.warning(f"Abandoned source read {method} after {time.perf_counter() - start:.1f}s; it runs until it returns")
+        future.add_done_callback(
+            lambda _: logger.info(f"Abandoned source read {method} returned after {time.perf_counter() - start:.1f}s")
+        )
+
+
+def as_async_metrics_repository(repository: Union[MetricsRepository, AsyncMetricsRepository]) -> AsyncMetricsRepository:
+    """Returns `repository` itself when it is async already, else wrapped in MetricsRepositoryThreaded."""
+    if isinstance(repository, AsyncMetricsRepository):
+        return repository
+    return MetricsRepositoryThreaded(repository)
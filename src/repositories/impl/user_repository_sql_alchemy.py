@@ -3,6 +3,10 @@ from sqlalchemy import exists
 from src.database.models.user import User as UserModel
 from src.repositories.user_repository import UserRepository
 
+# Cached reads of this table are tagged with its cache version: services that write to it
+# call CacheService.bump_table_version(USERS_TABLE) once the write is committed.
+USERS_TABLE = UserModel.__tablename__
+
 class UserRepository(UserRepository):
     def __init__(self, db: Session):
         self.db = db
@@ -1,6 +1,41 @@
 from pandas import DataFrame
 from abc import ABC, abstractmethod
-from typing import Optional
+from dataclasses import asdict, dataclass
+from typing import List, Optional, Sequence
+import hashlib
+import json
+
+
+@dataclass(frozen=True)
+class RowWatermark:
+    """
+    How far an append-only source has been ingested: the number of data rows read so far,
+    plus fingerprints of the header and of the last row read. If either fingerprint no longer
+    matches, rows were edited or removed and the source must be reloaded in full.
+    """
+    rows: int
+    header: str
+    last_row: str
+
+    @classmethod
+    def of(cls, header: Sequence, rows: List[Sequence]) -> "RowWatermark":
+        return cls(rows=len(rows), header=row_fingerprint(header), last_row=row_fingerprint(rows[-1] if rows else []))
+
+    def encode(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def decode(cls, raw: Optional[str]) -> Optional["RowWatermark"]:
+        return cls(**json.loads(raw)) if raw else None
+
+
+def row_fingerprint(row: Sequence) -> str:
+    # Trailing blank cells are not returned by every read, so they are ignored.
+    values = [str(value) for value in row]
+    while values and values[-1] == "":
+        values.pop()
+    return hashlib.blake2b("\x1f".join(values).encode("utf-8"), digest_size=8).hexdigest()
+
 
 class MetricsRepository(ABC):
     @abstractmethod
@@ -9,4 +44,43 @@ class MetricsRepository(ABC):
     
     @abstractmethod
     def get_raw_transactions(self) -> DataFrame:
-        pass
\ No newline at end of file
+        pass
+
+    def get_clean_transactions(self) -> Optional[DataFrame]:
+        """Transactions already cleaned by MetricsService, for sources that store them that way; None otherwise."""
+        return None
+
+    def get_raw_transactions_with_watermark(self) -> tuple[DataFrame, Optional[RowWatermark]]:
+        """Reads every row, plus the watermark to resume from (None when incremental reads are not supported)."""
+        return self.get_raw_transactions(), None
+
+    def get_raw_transactions_after(self, watermark: RowWatermark) -> Optional[tuple[DataFrame, RowWatermark]]:
+        """
+        Reads only the rows appended after `watermark`, with the new watermark.
+        Returns None when that is not possible (unsupported, or the header or existing rows changed).
+        """
+        return None
+
+
+class AsyncMetricsRepository(ABC):
+    """
+    The contract MetricsService reads transactions through: reads are awaited, so a slow
+    source never blocks the event loop. MetricsRepository implementations are adapted
+    to it by MetricsRepositoryThreaded.
+    """
+    @abstractmethod
+    def get_sheet_name(self) -> str:
+        pass
+
+    @abstractmethod
+    async def get_raw_transactions(self) -> DataFrame:
+        pass
+
+    async def get_clean_transactions(self) -> Optional[DataFrame]:
+        return None
+
+    async def get_raw_transactions_with_watermark(self) -> tuple[DataFrame, Optional[RowWatermark]]:
+        return await self.get_raw_transactions(), None
+
+    async def get_raw_transactions_after(self, watermark: RowWatermark) -> Optional[tuple[DataFrame, RowWatermark]]:
+        return None
@@ -1,5 +1,7 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from src.dependencies.services_di import get_metrics_service, get_cache_service
+from src.exceptions.cache_exceptions import InvalidCacheKeyPrefix
+from src.services.cache_service import CACHE_KEY_PREFIXES
 from src.services.metrics.metrics_service import MetricsService
 
 router = APIRouter(prefix="/admin", tags=["admin"])
@@ -8,6 +10,24 @@ router = APIRouter(prefix="/admin", tags=["admin"])
 async def clear_cache(cache_service = Depends(get_cache_service)):
     await cache_service.delete_cache()
     return {"message": "Cache cleared successfully"}
+
+@router.delete("/cache/keys", status_code=200)
+async def invalidate_cache_prefix(prefix: str = Query(..., min_length=1, description="Redis key prefix, e.g. 'cache:' or 'metrics:clean_dataframe'."),
+                                  cache_service = Depends(get_cache_service)):
+    # Only keys owned by the cache may be deleted, never other data in the database (e.g. Celery's).
+    if not prefix.startswith(CACHE_KEY_PREFIXES):
+        raise InvalidCacheKeyPrefix(prefix, CACHE_KEY_PREFIXES)
+    deleted: int = await cache_service.invalidate_prefix(prefix)
+    return {"message": f"Cache keys with prefix '{prefix}' invalidated", "deleted": deleted}
+
+@router.get("/cache/stats", status_code=200)
+async def get_cache_stats(cache_service = Depends(get_cache_service)):
+    return cache_service.get_stats()
+
+@router.delete("/cache/stats", status_code=200)
+async def reset_cache_stats(cache_service = Depends(get_cache_service)):
+    cache_service.reset_stats()
+    return {"message": "Cache stats reset successfully"}
     
 @router.post("/tasks/warm-up-cache")
 async def clear_cache(metrics_service: MetricsService = Depends(get_metrics_service)):
@@ -15,7 +15,7 @@ async def register(
     register_user_dto: RegisterUserDTO,
     response: Response, user_auth_service: AuthService = Depends(get_auth_service)
 ) -> UserDTO:
-    new_user = user_auth_service.register(register_user_dto, response)
+    new_user = await user_auth_service.register(register_user_dto, response)
     return UserDTO.model_validate(new_user, from_attributes=True)
 
 @public
@@ -13,18 +13,17 @@ UserServiceDep = Depends(get_injected_user_service)
 
 @router.delete("", status_code=status.HTTP_200_OK)
 async def delete_all(user_service: UserService = UserServiceDep):
-    user_service.delete_all()
+    await user_service.delete_all()
     return {"message": "All users deleted"}
 
 @router.get("/me", status_code=status.HTTP_200_OK, response_model=UserDTO)
 async def get_current_user(request: Request, user_service: UserService = UserServiceDep) -> UserDTO:
-    # user_service methods are synchronous; call directly
-    user = user_service.get_current_user(request)
+    user = await user_service.get_current_user(request)
     return UserDTO.model_validate(user, from_attributes=True)
 
 @router.get("/{id}", status_code=status.HTTP_200_OK, response_model=UserDTO)
 async def get_user_by_id(id:str, user_service: UserService = UserServiceDep) -> UserDTO:
-    user = user_service.get_user_by_id(id)
+    user = await user_service.get_user_by_id(id)
     return UserDTO.model_validate(user, from_attributes=True)
 
 @router.get("", status_code=status.HTTP_200_OK, response_model=PageResponse[UserDTO])
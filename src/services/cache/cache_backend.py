@@ -0,0 +1,130 @@
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Dict, List, Optional, Union
+import uuid
+
+from redis.exceptions import LockError
+
+Key = Union[str, bytes]
+
+
+class CacheLock(ABC):
+    """Non-blocking, expiring lock; `reacquire` resets its TTL and raises LockError once it was lost."""
+    name: str
+
+    @abstractmethod
+    async def acquire(self, blocking: bool = False) -> bool:
+        pass
+
+    @abstractmethod
+    async def reacquire(self) -> None:
+        pass
+
+    @abstractmethod
+    async def release(self) -> None:
+        pass
+
+
+class CacheBackend(ABC):
+    """
+    Storage used by CacheService. Values are bytes (str values are stored UTF-8 encoded)
+    and `ex` is a TTL in seconds; the semantics follow the Redis commands of the same name.
+    """
+    @abstractmethod
+    async def get(self, key: Key) -> Optional[bytes]:
+        pass
+
+    @abstractmethod
+    async def mget(self, keys: List[Key]) -> List[Optional[bytes]]:
+        pass
+
+    @abstractmethod
+    async def set(self, key: Key, value: Union[bytes, str], ex: Optional[int] = None, nx: bool = False) -> Optional[bool]:
+        """Returns True when written, None when `nx` is set and the key already exists."""
+        pass
+
+    @abstractmethod
+    async def set_many(self, mapping: Dict[Key, Union[bytes, str]], ex: Optional[int] = None) -> None:
+        """Writes several entries in one round trip (a pipeline on Redis)."""
+        pass
+
+    @abstractmethod
+    async def delete(self, *keys: Key) -> int:
+        pass
+
+    @abstractmethod
+    async def expire_many(self, keys: List[Key], ex: int) -> None:
+        """Shortens or extends the TTL of existing keys; missing keys are ignored."""
+        pass
+
+    @abstractmethod
+    async def incr(self, key: Key) -> int:
+        pass
+
+    @abstractmethod
+    def scan_iter(self, prefix: str, count: int = 500) -> AsyncIterator[Key]:
+        """Iterates over the keys starting with `prefix` without blocking the store."""
+        pass
+
+    @abstractmethod
+    def lock(self, name: str, timeout: float) -> CacheLock:
+        pass
+
+    def stats(self) -> dict:
+        return {"backend": type(self).__name__}
+
+    def reset_stats(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+class TokenLock(CacheLock):
+    """
+    Lock for backends without native locks: an entry holding a random token with a TTL.
+    The backend provides the atomic compare-and-expire / compare-and-delete operations.
+    """
+    def __init__(self, backend: "TokenLockingBackend", name: str, timeout: float):
+        self.backend = backend
+        self.name = name
+        self.timeout = timeout
+        self.token: Optional[bytes] = None
+
+    async def acquire(self, blocking: bool = False) -> bool:
+        token = uuid.uuid4().hex.encode("ascii")
+        if await self.backend.set(self.name, token, ex=self.timeout, nx=True):
+            self.token = token
+            return True
+        return False
+
+    async def reacquire(self) -> None:
+        if self.token is None or not await self.backend.expire_if_equal(self.name, self.token, self.timeout):
+            raise LockError(f"Cannot reacquire a lock that is no longer owned: {self.name}")
+
+    async def release(self) -> None:
+        token, self.token = self.token, None
+        if token is None or not await self.backend.delete_if_equal(self.name, token):
+            raise LockError(f"Cannot release a lock that is no longer owned: {self.name}")
+
+
+class TokenLockingBackend(CacheBackend):
+    @abstractmethod
+    async def expire_if_equal(self, key: Key, value: bytes, ex: float) -> bool:
+        pass
+
+    @abstractmethod
+    async def delete_if_equal(self, key: Key, value: bytes) -> bool:
+        pass
+
+    def lock(self, name: str, timeout: float) -> CacheLock:
+        return TokenLock(self, name, timeout)
+
+
+def to_bytes(value: Union[bytes, str, int, float]) -> bytes:
+    if isinstance(value, bytes):
+        return value
+    return str(value).encode("utf-8")
+
+
+def to_str(key: Key) -> str:
+    return key.decode("utf-8") if isinstance(key, bytes) else key
@@ -0,0 +1,102 @@
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Dict, Iterator, List
+import time
+
+# Upper bounds (milliseconds) of the latency histogram buckets; the last bucket is unbounded.
+LATENCY_BUCKETS_MS = (0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+STAGES = ("lookup", "deserialize", "compute", "write")
+
+
+@dataclass
+class LatencyHistogram:
+    counts: List[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1))
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    def observe(self, ms: float) -> None:
+        self.counts[bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def as_dict(self) -> dict:
+        buckets = {f"le_{bound}ms": n for bound, n in zip(LATENCY_BUCKETS_MS, self.counts)}
+        buckets["gt_last"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else None,
+            "max_ms": round(self.max_ms, 3),
+            "buckets": buckets,
+        }
+
+
+@dataclass
+class FamilyMetrics:
+    hits: int = 0
+    local_hits: int = 0
+    negative_hits: int = 0  # hits (or local hits) that re-raised a cached exception
+    misses: int = 0
+    bypasses: int = 0
+    errors: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    latency: Dict[str, LatencyHistogram] = field(default_factory=lambda: {stage: LatencyHistogram() for stage in STAGES})
+
+    def as_dict(self) -> dict:
+        lookups = self.hits + self.local_hits + self.misses
+        return {
+            "hits": self.hits,
+            "local_hits": self.local_hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.hits + self.local_hits) / lookups, 4) if lookups else None,
+            "bypasses": self.bypasses,
+            "errors": self.errors,
+            "bytes_read": self.bytes_read,
+            "bytes_written": self.bytes_written,
+            "latency": {stage: histogram.as_dict() for stage, histogram in self.latency.items()},
+        }
+
+
+class CacheMetrics:
+    """
+    Per key family (method qualname or DataFrame key) counters and latency histograms
+    for each cache stage: lookup, deserialize, compute-on-miss and write.
+    """
+    def __init__(self):
+        self._families: Dict[str, FamilyMetrics] = defaultdict(FamilyMetrics)
+        self._lock = Lock()
+
+    def increment(self, family: str, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            metrics = self._families[family]
+            setattr(metrics, counter, getattr(metrics, counter) + amount)
+
+    def observe(self, family: str, stage: str, seconds: float) -> None:
+        with self._lock:
+            self._families[family].latency[stage].observe(seconds * 1000)
+
+    @contextmanager
+    def timed(self, family: str, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(family, stage, time.perf_counter() - start)
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            return {family: metrics.as_dict() for family, metrics in self._families.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._families.clear()
+
+
+cache_metrics = CacheMetrics()
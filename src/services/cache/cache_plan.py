@@ -0,0 +1,88 @@
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from enum import Enum
+from functools import cached_property
+from typing import Any, Callable, Optional, Tuple, Type
+import hashlib
+import inspect
+import json
+
+from pydantic import BaseModel
+
+from src.services.cache.serializers import CompiledSerializer
+
+# Length in bytes of the argument digest; 16 bytes gives 32 hex characters per key.
+KEY_DIGEST_SIZE = 16
+
+
+def canonical(value: Any) -> Any:
+    """
+    Reduces an argument to plain JSON data that is equal for equal values in every process:
+    models become their dumped fields, sets are sorted and dict keys are sorted on encoding.
+    """
+    if isinstance(value, BaseModel):
+        return {"__model__": type(value).__name__, **canonical(value.model_dump(mode="json"))}
+    if isinstance(value, Enum):
+        return canonical(value.value)
+    if isinstance(value, dict):
+        return {str(k): canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [canonical(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted((canonical(v) for v in value), key=repr)
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    # Arbitrary objects fall back to their repr, as keys always did.
+    return {"__repr__": repr(value)}
+
+
+def args_key(args: tuple, kwargs: dict) -> str:
+    """Fixed-length digest of the canonical encoding of the arguments."""
+    encoded = json.dumps([canonical(args), canonical(kwargs)], sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=KEY_DIGEST_SIZE).hexdigest()
+
+
+@dataclass(frozen=True)
+class CachePlan:
+    """
+    Everything the generic cache needs to know about a method, resolved once when the
+    method is decorated: its key family, how to build its key, its serializer and TTL.
+    """
+    func: Callable[..., Any]
+    family: str
+    serializer: CompiledSerializer
+    ttl: Optional[int] = None
+    key_args: Optional[Callable[..., str]] = None
+    negative_exceptions: Tuple[Type[BaseException], ...] = ()
+    negative_ttl: Optional[int] = None
+
+    @cached_property
+    def _signature(self) -> Optional[inspect.Signature]:
+        try:
+            return inspect.signature(self.func)
+        except (TypeError, ValueError):
+            return None
+
+    def build_key(self, *args: Any, **kwargs: Any) -> str:
+        """
+        `<family>:<digest>`, where the digest covers the arguments bound to the signature
+        with defaults applied, so f(3), f(limit=3) and f() with a default of 3 share an entry.
+        A key function from the method's `@cached` policy is used verbatim instead.
+        """
+        if self.key_args:
+            return f"{self.family}:{self.key_args(*args, **kwargs)}"
+        return f"{self.family}:{args_key(*self._normalize(args, kwargs))}"
+
+    def _normalize(self, args: tuple, kwargs: dict) -> tuple[tuple, dict]:
+        if self._signature is None:
+            return args, kwargs
+        try:
+            # The first parameter is the instance, which is not part of the key.
+            bound = self._signature.bind(None, *args, **kwargs)
+        except TypeError:
+            return args, kwargs
+        bound.apply_defaults()
+        arguments = dict(list(bound.arguments.items())[1:])
+        return (), arguments
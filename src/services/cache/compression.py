@@ -0,0 +1,147 @@
+from collections import defaultdict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Callable, Dict, Optional, Tuple
+import logging
+import time
+import zlib
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # pragma: no cover - depends on the environment
+    lz4_frame = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Compressed payloads start with this marker followed by a one-byte codec tag.
+# Neither JSON entries nor the "EDF1:" DataFrame header can start with a NUL byte,
+# so anything without the marker is read back as-is.
+MARKER = b"\x00C"
+
+Codec = Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]
+
+
+def _available_codecs() -> Dict[str, Tuple[bytes, Codec]]:
+    codecs: Dict[str, Tuple[bytes, Codec]] = {
+        "zlib": (b"z", (lambda data: zlib.compress(data, 1), zlib.decompress)),
+    }
+    if lz4_frame is not None:
+        codecs["lz4"] = (b"4", (lz4_frame.compress, lz4_frame.decompress))
+    if zstandard is not None:
+        codecs["zstd"] = (b"s", (zstandard.ZstdCompressor(level=3).compress, zstandard.ZstdDecompressor().decompress))
+    return codecs
+
+
+CODECS = _available_codecs()
+CODECS_BY_TAG = {tag: (name, codec) for name, (tag, codec) in CODECS.items()}
+# "auto" picks the fastest good codec that is installed.
+AUTO_PREFERENCE = ("zstd", "lz4", "zlib")
+
+
+def resolve_codec(name: str) -> Optional[str]:
+    """Returns the codec to use for `name`, None when compression is disabled."""
+    if name == "none":
+        return None
+    if name == "auto":
+        return next(codec for codec in AUTO_PREFERENCE if codec in CODECS)
+    if name not in CODECS:
+        logger.warning(f"Cache compression codec '{name}' is not installed; falling back to zlib")
+        return "zlib"
+    return name
+
+
+@dataclass
+class FamilyCompressionStats:
+    writes: int = 0
+    compressed_writes: int = 0
+    raw_bytes: int = 0
+    stored_bytes: int = 0
+    encode_seconds: float = 0.0
+    reads: int = 0
+    decode_seconds: float = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "writes": self.writes,
+            "compressed_writes": self.compressed_writes,
+            "raw_bytes": self.raw_bytes,
+            "stored_bytes": self.stored_bytes,
+            "compression_ratio": round(self.raw_bytes / self.stored_bytes, 3) if self.stored_bytes else None,
+            "encode_ms": round(self.encode_seconds * 1000, 3),
+            "reads": self.reads,
+            "decode_ms": round(self.decode_seconds * 1000, 3),
+        }
+
+
+class CompressionStats:
+    """Compression ratio and encode/decode time, aggregated per key family."""
+    def __init__(self):
+        self._families: Dict[str, FamilyCompressionStats] = defaultdict(FamilyCompressionStats)
+        self._lock = Lock()
+
+    def record_write(self, family: str, raw_bytes: int, stored_bytes: int, compressed: bool, seconds: float) -> None:
+        with self._lock:
+            stats = self._families[family]
+            stats.writes += 1
+            stats.compressed_writes += int(compressed)
+            stats.raw_bytes += raw_bytes
+            stats.stored_bytes += stored_bytes
+            stats.encode_seconds += seconds
+
+    def record_read(self, family: str, seconds: float) -> None:
+        with self._lock:
+            stats = self._families[family]
+            stats.reads += 1
+            stats.decode_seconds += seconds
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            return {family: stats.as_dict() for family, stats in self._families.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._families.clear()
+
+
+compression_stats = CompressionStats()
+
+
+class PayloadCompressor:
+    """
+    Transparently compresses cache payloads at or above `min_bytes`.
+    The codec is recorded in the stored value, so entries written with any codec
+    (or uncompressed ones) stay readable when the configuration changes.
+    """
+    def __init__(self, codec: str = "auto", min_bytes: int = 16 * 1024, stats: Optional[CompressionStats] = None):
+        self.codec = resolve_codec(codec)
+        self.min_bytes = min_bytes
+        self.stats = stats if stats is not None else compression_stats
+
+    def compress(self, payload: bytes, family: str) -> bytes:
+        start = time.perf_counter()
+        stored = payload
+        if self.codec is not None and len(payload) >= self.min_bytes:
+            tag, (compress, _) = CODECS[self.codec]
+            compressed = MARKER + tag + compress(payload)
+            # Incompressible payloads are stored as-is.
+            if len(compressed) < len(payload):
+                stored = compressed
+        self.stats.record_write(family, len(payload), len(stored), stored is not payload, time.perf_counter() - start)
+        return stored
+
+    def decompress(self, stored: bytes | str, family: str) -> bytes | str:
+        if isinstance(stored, str) or not stored.startswith(MARKER):
+            return stored
+        start = time.perf_counter()
+        tag = stored[len(MARKER):len(MARKER) + 1]
+        if tag not in CODECS_BY_TAG:
+            raise ValueError(f"Cached value was compressed with codec tag {tag!r}, which is not installed")
+        _, (_, decompress) = CODECS_BY_TAG[tag]
+        payload = decompress(stored[len(MARKER) + 1:])
+        self.stats.record_read(family, time.perf_counter() - start)
+        return payload
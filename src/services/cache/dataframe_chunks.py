@@ -0,0 +1,51 @@
+from dataclasses import asdict, dataclass
+from typing import List, Optional
+import json
+
+from pandas import DataFrame
+
+# Written under the frame's own key instead of the payload when the frame is stored in chunks.
+# It cannot be mistaken for a payload: those start with "EDF1:", a compression marker or legacy JSON.
+MANIFEST_HEADER = b"EDFM1\n"
+
+
+@dataclass(frozen=True)
+class ChunkManifest:
+    """
+    Describes a DataFrame stored as row-group chunks under `<key>:chunk:<generation>:<i>`.
+    The generation is the frame's content fingerprint, so every write of new data goes to
+    fresh chunk keys and swapping the manifest publishes it atomically.
+    """
+    generation: str
+    chunks: int
+    rows: int
+
+    def chunk_keys(self, key: str) -> List[str]:
+        return chunk_keys(key, self.generation, self.chunks)
+
+    def encode(self) -> bytes:
+        return MANIFEST_HEADER + json.dumps(asdict(self)).encode("utf-8")
+
+    @classmethod
+    def decode(cls, payload: bytes | str | None) -> Optional["ChunkManifest"]:
+        """Returns the manifest, or None when `payload` is a whole serialized frame."""
+        if not isinstance(payload, bytes) or not payload.startswith(MANIFEST_HEADER):
+            return None
+        return cls(**json.loads(payload[len(MANIFEST_HEADER):]))
+
+
+def chunk_keys(key: str, generation: str, chunks: int) -> List[str]:
+    return [chunk_key(key, generation, i) for i in range(chunks)]
+
+
+def chunk_key(key: str, generation: str, index: int) -> str:
+    return f"{chunk_prefix(key, generation)}{index}"
+
+
+def chunk_prefix(key: str, generation: str) -> str:
+    """Prefix of the chunk keys of one generation."""
+    return f"{key}:chunk:{generation}:"
+
+
+def split_rows(df: DataFrame, chunk_rows: int) -> List[DataFrame]:
+    return [df.iloc[start:start + chunk_rows] for start in range(0, len(df), chunk_rows)]
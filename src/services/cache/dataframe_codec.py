@@ -0,0 +1,87 @@
+from enum import Enum
+from io import BytesIO, StringIO
+from typing import Optional
+import pickle
+import logging
+
+import pandas as pd
+from pandas import DataFrame
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - depends on the environment
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+# Every binary payload starts with this header so readers can tell which codec
+# wrote it. Entries without it are legacy `to_json(orient='split')` strings.
+HEADER_PREFIX = b"EDF1:"
+HEADER_END = b"\n"
+
+
+class DataFrameFormat(str, Enum):
+    JSON = "json"
+    ARROW = "arrow"
+    PICKLE = "pickle"
+
+
+def resolve_format(requested: str | DataFrameFormat) -> DataFrameFormat:
+    """Returns the requested format, falling back to pickle when pyarrow is missing."""
+    fmt = DataFrameFormat(requested)
+    if fmt is DataFrameFormat.ARROW and pa is None:
+        logger.warning("pyarrow is not installed; falling back to pickle DataFrame cache format")
+        return DataFrameFormat.PICKLE
+    return fmt
+
+
+def encode_dataframe(df: DataFrame, fmt: str | DataFrameFormat = DataFrameFormat.ARROW) -> bytes:
+    """
+    Serializes a DataFrame into a self-describing binary payload.
+    Arrow and pickle keep dtypes (datetimes, categoricals) and the index intact.
+    """
+    fmt = resolve_format(fmt)
+    if fmt is DataFrameFormat.ARROW:
+        body = _encode_arrow(df)
+    elif fmt is DataFrameFormat.PICKLE:
+        body = pickle.dumps(df, protocol=5)
+    else:
+        body = df.to_json(orient="split", date_format="iso").encode("utf-8")
+    return HEADER_PREFIX + fmt.value.encode("ascii") + HEADER_END + body
+
+
+def decode_dataframe(payload: bytes | str) -> DataFrame:
+    """Deserializes a payload written by `encode_dataframe` or a legacy JSON entry."""
+    fmt, body = split_header(payload)
+    if fmt is None:
+        text = body.decode("utf-8") if isinstance(body, bytes) else body
+        return pd.read_json(StringIO(text), orient="split")
+    if fmt is DataFrameFormat.ARROW:
+        return _decode_arrow(body)
+    if fmt is DataFrameFormat.PICKLE:
+        return pickle.loads(body)
+    return pd.read_json(StringIO(body.decode("utf-8")), orient="split")
+
+
+def split_header(payload: bytes | str) -> tuple[Optional[DataFrameFormat], bytes | str]:
+    """Returns the format recorded in the header (None for legacy entries) and the body."""
+    if isinstance(payload, str) or not payload.startswith(HEADER_PREFIX):
+        return None, payload
+    end = payload.index(HEADER_END, len(HEADER_PREFIX))
+    fmt = DataFrameFormat(payload[len(HEADER_PREFIX):end].decode("ascii"))
+    return fmt, payload[end + 1:]
+
+
+def _encode_arrow(df: DataFrame) -> bytes:
+    table = pa.Table.from_pandas(df, preserve_index=True)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _decode_arrow(body: bytes) -> DataFrame:
+    if pa is None:
+        raise RuntimeError("Cached DataFrame was written in Arrow format but pyarrow is not installed")
+    with pa.ipc.open_stream(BytesIO(body)) as reader:
+        return reader.read_all().to_pandas()
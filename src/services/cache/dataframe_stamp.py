@@ -0,0 +1,58 @@
+from dataclasses import dataclass
+from typing import Optional, Sequence
+import hashlib
+import time
+
+
+@dataclass(frozen=True)
+class DataFrameStamp:
+    """
+    Metadata stored next to a cached DataFrame (under `<key>:version`).
+    `version` is a fingerprint of the serialized frame, so it only changes when the data
+    does; `fresh_until` is the soft-TTL deadline (epoch seconds, 0 when the entry never
+    goes stale before its hard TTL). `chunks` is the number of chunks a chunked frame is
+    stored in under generation `version` (0 when stored as one value), so its chunk keys
+    are known without reading the manifest.
+    """
+    version: str
+    fresh_until: float = 0.0
+    chunks: int = 0
+
+    @classmethod
+    def new(cls, payload: bytes | Sequence[bytes], soft_ttl_seconds: Optional[int] = None) -> "DataFrameStamp":
+        """`payload` is the serialized frame, or the list of its chunks when stored chunked."""
+        if isinstance(payload, bytes):
+            return cls(version=fingerprint(payload), fresh_until=_fresh_until(soft_ttl_seconds))
+        return cls(version=fingerprint(*payload), fresh_until=_fresh_until(soft_ttl_seconds), chunks=len(payload))
+
+    def refreshed(self, soft_ttl_seconds: Optional[int] = None) -> "DataFrameStamp":
+        """The same version, fresh again from now."""
+        return DataFrameStamp(version=self.version, fresh_until=_fresh_until(soft_ttl_seconds), chunks=self.chunks)
+
+    @classmethod
+    def decode(cls, raw: bytes | str | None) -> Optional["DataFrameStamp"]:
+        if raw is None:
+            return None
+        if isinstance(raw, bytes):
+            raw = raw.decode("utf-8")
+        version, _, rest = raw.partition("@")
+        fresh_until, _, chunks = rest.partition("@")
+        return cls(version=version, fresh_until=float(fresh_until or 0), chunks=int(chunks or 0))
+
+    def encode(self) -> str:
+        # Frames stored as one value keep the two-field form.
+        return f"{self.version}@{self.fresh_until}@{self.chunks}" if self.chunks else f"{self.version}@{self.fresh_until}"
+
+    def is_stale(self, now: Optional[float] = None) -> bool:
+        return bool(self.fresh_until) and (now or time.time()) >= self.fresh_until
+
+
+def _fresh_until(soft_ttl_seconds: Optional[int]) -> float:
+    return time.time() + soft_ttl_seconds if soft_ttl_seconds else 0.0
+
+
+def fingerprint(*payloads: bytes) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for payload in payloads:
+        digest.update(payload)
+    return digest.hexdigest()
@@ -0,0 +1,118 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
+import time
+
+from src.services.cache.cache_backend import Key, TokenLockingBackend, to_bytes, to_str
+
+
+class MemoryCacheBackend(TokenLockingBackend):
+    """
+    Bounded in-process LRU cache backend for single-node deployments and benchmarks.
+    Entries are evicted least-recently-used first once their values exceed `max_bytes`.
+    Nothing is shared between processes, so each API/Celery worker fills its own copy.
+    """
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[Optional[float], bytes]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = Lock()
+        self.evictions = 0
+
+    def _live_entry(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _remove(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._bytes -= len(entry[1])
+        return True
+
+    def _store(self, key: str, value: bytes, expires_at: Optional[float]) -> None:
+        self._remove(key)
+        if len(value) > self.max_bytes:
+            return
+        self._entries[key] = (expires_at, value)
+        self._bytes += len(value)
+        while self._bytes > self.max_bytes:
+            evicted, _ = next(iter(self._entries.items()))
+            self._remove(evicted)
+            self.evictions += 1
+
+    async def get(self, key: Key) -> Optional[bytes]:
+        with self._lock:
+            return self._live_entry(to_str(key))
+
+    async def mget(self, keys: List[Key]) -> List[Optional[bytes]]:
+        with self._lock:
+            return [self._live_entry(to_str(key)) for key in keys]
+
+    async def set(self, key: Key, value: Union[bytes, str], ex: Optional[int] = None, nx: bool = False) -> Optional[bool]:
+        key = to_str(key)
+        with self._lock:
+            if nx and self._live_entry(key) is not None:
+                return None
+            self._store(key, to_bytes(value), time.monotonic() + ex if ex else None)
+            return True
+
+    async def set_many(self, mapping: Dict[Key, Union[bytes, str]], ex: Optional[int] = None) -> None:
+        expires_at = time.monotonic() + ex if ex else None
+        with self._lock:
+            for key, value in mapping.items():
+                self._store(to_str(key), to_bytes(value), expires_at)
+
+    async def expire_many(self, keys: List[Key], ex: int) -> None:
+        with self._lock:
+            for key in map(to_str, keys):
+                value = self._live_entry(key)
+                if value is not None:
+                    self._entries[key] = (time.monotonic() + ex, value)
+
+    async def delete(self, *keys: Key) -> int:
+        with self._lock:
+            return sum(self._remove(to_str(key)) for key in keys)
+
+    async def incr(self, key: Key) -> int:
+        key = to_str(key)
+        with self._lock:
+            current = self._live_entry(key)
+            # Like INCR, keep the TTL of an existing key.
+            expires_at = self._entries[key][0] if current is not None else None
+            value = int(current or 0) + 1
+            self._store(key, to_bytes(value), expires_at)
+            return value
+
+    async def scan_iter(self, prefix: str, count: int = 500) -> AsyncIterator[Key]:
+        with self._lock:
+            keys = [key for key in self._entries if key.startswith(prefix)]
+        for key in keys:
+            yield key
+
+    async def expire_if_equal(self, key: Key, value: bytes, ex: float) -> bool:
+        key = to_str(key)
+        with self._lock:
+            if self._live_entry(key) != value:
+                return False
+            self._entries[key] = (time.monotonic() + ex, value)
+            return True
+
+    async def delete_if_equal(self, key: Key, value: bytes) -> bool:
+        key = to_str(key)
+        with self._lock:
+            return self._live_entry(key) == value and self._remove(key)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**super().stats(), "entries": len(self._entries), "bytes": self._bytes, "max_bytes": self.max_bytes, "evictions": self.evictions}
+
+    def reset_stats(self) -> None:
+        self.evictions = 0
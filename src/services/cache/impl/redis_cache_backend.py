@@ -0,0 +1,62 @@
+from typing import AsyncIterator, Dict, List, Optional, Union
+
+from redis.asyncio import Redis
+
+from src.core.redis_pool import InstrumentedConnectionPool
+from src.services.cache.cache_backend import CacheBackend, CacheLock, Key
+
+_GLOB_SPECIAL_CHARS = str.maketrans({c: f"\\{c}" for c in "*?[]\\"})
+
+
+class RedisCacheBackend(CacheBackend):
+    """Cache backend on a `redis.asyncio` client, shared by every API and Celery worker process."""
+    def __init__(self, redis_client: Redis):
+        self.redis_client = redis_client
+
+    async def get(self, key: Key) -> Optional[bytes]:
+        return await self.redis_client.get(key)
+
+    async def mget(self, keys: List[Key]) -> List[Optional[bytes]]:
+        return await self.redis_client.mget(keys)
+
+    async def set(self, key: Key, value: Union[bytes, str], ex: Optional[int] = None, nx: bool = False) -> Optional[bool]:
+        return await self.redis_client.set(key, value, ex=ex, nx=nx)
+
+    async def set_many(self, mapping: Dict[Key, Union[bytes, str]], ex: Optional[int] = None) -> None:
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            for key, value in mapping.items():
+                pipe.set(key, value, ex=ex)
+            await pipe.execute()
+
+    async def expire_many(self, keys: List[Key], ex: int) -> None:
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.expire(key, ex)
+            await pipe.execute()
+
+    async def delete(self, *keys: Key) -> int:
+        # UNLINK reclaims the memory in a background thread instead of blocking Redis.
+        return await self.redis_client.unlink(*keys) if keys else 0
+
+    async def incr(self, key: Key) -> int:
+        return await self.redis_client.incr(key)
+
+    async def scan_iter(self, prefix: str, count: int = 500) -> AsyncIterator[Key]:
+        async for key in self.redis_client.scan_iter(match=f"{prefix.translate(_GLOB_SPECIAL_CHARS)}*", count=count):
+            yield key
+
+    def lock(self, name: str, timeout: float) -> CacheLock:
+        # thread_local=False: the heartbeat task reacquires the lock from another task.
+        return self.redis_client.lock(name, timeout=timeout, thread_local=False)
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        pool = getattr(self.redis_client, "connection_pool", None)
+        if isinstance(pool, InstrumentedConnectionPool):
+            stats["redis_pool"] = pool.stats()
+        return stats
+
+    def reset_stats(self) -> None:
+        pool = getattr(self.redis_client, "connection_pool", None)
+        if isinstance(pool, InstrumentedConnectionPool):
+            pool.reset_stats()
@@ -0,0 +1,193 @@
+from threading import Lock
+from typing import AsyncIterator, Dict, List, Optional, Union
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+
+from src.services.cache.cache_backend import Key, TokenLockingBackend, to_bytes, to_str
+
+logger = logging.getLogger(__name__)
+
+_NOT_EXPIRED = "(expires_at IS NULL OR expires_at > ?)"
+
+
+class SqliteCacheBackend(TokenLockingBackend):
+    """
+    Persistent local-disk cache backend on a SQLite file. Entries survive restarts and are
+    shared by every process on the host (WAL mode lets readers run while one process writes).
+    Expired rows are skipped on read and purged every `purge_every` writes.
+    Queries run in a worker thread so large values do not block the event loop.
+    """
+    def __init__(self, path: str, purge_every: int = 1000):
+        self.path = path
+        self.purge_every = purge_every
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)"
+        )
+        self._lock = Lock()
+        self._writes = 0
+
+    async def _run(self, func, *args):
+        def locked():
+            with self._lock:
+                return func(*args)
+        return await asyncio.to_thread(locked)
+
+    @staticmethod
+    def _expires_at(ex: Optional[float]) -> Optional[float]:
+        return time.time() + ex if ex else None
+
+    def _get(self, key: str) -> Optional[bytes]:
+        row = self._connection.execute(
+            f"SELECT value FROM cache_entries WHERE key = ? AND {_NOT_EXPIRED}", (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def _mget(self, keys: List[str]) -> List[Optional[bytes]]:
+        if not keys:
+            return []
+        placeholders = ",".join("?" * len(keys))
+        rows = self._connection.execute(
+            f"SELECT key, value FROM cache_entries WHERE key IN ({placeholders}) AND {_NOT_EXPIRED}", (*keys, time.time())
+        ).fetchall()
+        values = dict(rows)
+        return [values.get(key) for key in keys]
+
+    def _set(self, key: str, value: bytes, ex: Optional[float], nx: bool) -> Optional[bool]:
+        now = time.time()
+        if nx:
+            # Insert, or take over the key only if the existing entry has expired.
+            cursor = self._connection.execute(
+                "INSERT INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at "
+                "WHERE cache_entries.expires_at IS NOT NULL AND cache_entries.expires_at <= ?",
+                (key, value, self._expires_at(ex), now),
+            )
+            written = cursor.rowcount > 0
+        else:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)", (key, value, self._expires_at(ex))
+            )
+            written = True
+        self._writes += 1
+        if self._writes % self.purge_every == 0:
+            self._connection.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (now,))
+        return True if written else None
+
+    def _set_many(self, rows: List[tuple]) -> None:
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            self._connection.executemany("INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)", rows)
+            self._connection.execute("COMMIT")
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            raise
+
+    def _expire_many(self, keys: List[str], ex: int) -> None:
+        placeholders = ",".join("?" * len(keys))
+        self._connection.execute(
+            f"UPDATE cache_entries SET expires_at = ? WHERE key IN ({placeholders}) AND {_NOT_EXPIRED}",
+            (self._expires_at(ex), *keys, time.time()),
+        )
+
+    def _delete(self, keys: List[str]) -> int:
+        placeholders = ",".join("?" * len(keys))
+        return self._connection.execute(f"DELETE FROM cache_entries WHERE key IN ({placeholders})", keys).rowcount
+
+    def _incr(self, key: str) -> int:
+        # BEGIN IMMEDIATE takes the write lock, so concurrent processes cannot interleave.
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._connection.execute(
+                f"SELECT value, expires_at FROM cache_entries WHERE key = ? AND {_NOT_EXPIRED}", (key, time.time())
+            ).fetchone()
+            value = int(row[0]) + 1 if row else 1
+            self._connection.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, to_bytes(value), row[1] if row else None),
+            )
+            self._connection.execute("COMMIT")
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            raise
+        return value
+
+    def _scan(self, prefix: str, after: Optional[str], count: int) -> List[str]:
+        clauses, params = [], []
+        if prefix:
+            # Range on the primary key: every key starting with `prefix` sorts in [prefix, upper).
+            clauses.append("key >= ? AND key < ?")
+            params += [prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)]
+        if after is not None:
+            clauses.append("key > ?")
+            params.append(after)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._connection.execute(f"SELECT key FROM cache_entries {where} ORDER BY key LIMIT ?", (*params, count)).fetchall()
+        return [row[0] for row in rows]
+
+    def _expire_if_equal(self, key: str, value: bytes, ex: float) -> bool:
+        return self._connection.execute(
+            f"UPDATE cache_entries SET expires_at = ? WHERE key = ? AND value = ? AND {_NOT_EXPIRED}",
+            (self._expires_at(ex), key, value, time.time()),
+        ).rowcount > 0
+
+    def _delete_if_equal(self, key: str, value: bytes) -> bool:
+        return self._connection.execute(
+            f"DELETE FROM cache_entries WHERE key = ? AND value = ? AND {_NOT_EXPIRED}", (key, value, time.time())
+        ).rowcount > 0
+
+    async def get(self, key: Key) -> Optional[bytes]:
+        return await self._run(self._get, to_str(key))
+
+    async def mget(self, keys: List[Key]) -> List[Optional[bytes]]:
+        return await self._run(self._mget, [to_str(key) for key in keys])
+
+    async def set(self, key: Key, value: Union[bytes, str], ex: Optional[int] = None, nx: bool = False) -> Optional[bool]:
+        return await self._run(self._set, to_str(key), to_bytes(value), ex, nx)
+
+    async def set_many(self, mapping: Dict[Key, Union[bytes, str]], ex: Optional[int] = None) -> None:
+        expires_at = self._expires_at(ex)
+        await self._run(self._set_many, [(to_str(key), to_bytes(value), expires_at) for key, value in mapping.items()])
+
+    async def expire_many(self, keys: List[Key], ex: int) -> None:
+        if keys:
+            await self._run(self._expire_many, [to_str(key) for key in keys], ex)
+
+    async def delete(self, *keys: Key) -> int:
+        if not keys:
+            return 0
+        return await self._run(self._delete, [to_str(key) for key in keys])
+
+    async def incr(self, key: Key) -> int:
+        return await self._run(self._incr, to_str(key))
+
+    async def scan_iter(self, prefix: str, count: int = 500) -> AsyncIterator[Key]:
+        after = None
+        while True:
+            keys = await self._run(self._scan, prefix, after, count)
+            for key in keys:
+                yield key
+            if len(keys) < count:
+                return
+            after = keys[-1]
+
+    async def expire_if_equal(self, key: Key, value: bytes, ex: float) -> bool:
+        return await self._run(self._expire_if_equal, to_str(key), value, ex)
+
+    async def delete_if_equal(self, key: Key, value: bytes) -> bool:
+        return await self._run(self._delete_if_equal, to_str(key), value)
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._connection.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+        return {**super().stats(), "path": self.path, "entries": entries}
+
+    async def close(self) -> None:
+        await self._run(self._connection.close)
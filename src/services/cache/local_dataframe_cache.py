@@ -0,0 +1,89 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Optional
+import logging
+
+from pandas import DataFrame
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Entry:
+    version: str
+    df: DataFrame
+    nbytes: int
+
+
+class LocalDataFrameCache:
+    """
+    Per-process (L1) cache of deserialized DataFrames sitting in front of Redis.
+
+    Entries are tagged with the dataset version they were loaded with and are only
+    served while that version is still current. Frames are shared between requests,
+    so callers must treat them as read-only.
+    """
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @property
+    def current_bytes(self) -> int:
+        return sum(entry.nbytes for entry in self._entries.values())
+
+    def get(self, key: str, version: Optional[str]) -> Optional[DataFrame]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or version is None or entry.version != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.df
+
+    def put(self, key: str, version: Optional[str], df: DataFrame) -> None:
+        if not self.enabled or version is None:
+            return
+        nbytes = int(df.memory_usage(deep=True, index=True).sum())
+        if nbytes > self.max_bytes:
+            logger.warning(f"L1 cache skipped for key: {key}; {nbytes} bytes exceeds budget of {self.max_bytes}")
+            return
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = _Entry(version=version, df=df, nbytes=nbytes)
+            while self.current_bytes > self.max_bytes:
+                evicted_key, _ = self._entries.popitem(last=False)
+                self.evictions += 1
+                logger.info(f"L1 cache evicted key: {evicted_key}")
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Drops one entry, or every entry when no key is given."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.hits = self.misses = self.evictions = 0
@@ -0,0 +1,64 @@
+from dataclasses import dataclass
+from typing import Iterator, Optional, Tuple, Type
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Negative entries start with this marker. Serialized results are JSON and compressed
+# payloads start with "\x00C", so neither can be mistaken for one.
+NEGATIVE_MARKER = b"\x00N"
+
+ExceptionTypes = Tuple[Type[BaseException], ...]
+
+
+@dataclass(frozen=True)
+class CachedException:
+    """
+    A designated exception (e.g. CountryNotFoundException) cached in place of a result,
+    so repeated requests for something that does not exist are answered from the cache.
+    It is rebuilt from its args and attributes without calling `__init__`, since exception
+    constructors take different arguments (a country name, a detail message, ...).
+    """
+    exception_type: Type[BaseException]
+    args: tuple
+    state: dict
+
+    @classmethod
+    def from_exception(cls, exc: BaseException) -> "CachedException":
+        return cls(exception_type=type(exc), args=exc.args, state=dict(vars(exc)))
+
+    def encode(self) -> bytes:
+        """Raises TypeError/ValueError when the exception state is not JSON serializable."""
+        body = {"type": _type_name(self.exception_type), "args": list(self.args), "state": self.state}
+        return NEGATIVE_MARKER + json.dumps(body).encode("utf-8")
+
+    @classmethod
+    def decode(cls, payload: bytes | str, allowed: ExceptionTypes) -> Optional["CachedException"]:
+        """
+        Returns the cached exception, or None when `payload` is a regular result. Only the
+        designated types (and their subclasses) are rebuilt; anything else reads as a miss.
+        """
+        if not isinstance(payload, bytes) or not payload.startswith(NEGATIVE_MARKER):
+            return None
+        body = json.loads(payload[len(NEGATIVE_MARKER):])
+        exception_type = next((t for t in _with_subclasses(allowed) if _type_name(t) == body["type"]), None)
+        if exception_type is None:
+            raise ValueError(f"Negative cache entry for {body['type']}, which is not a designated exception")
+        return cls(exception_type=exception_type, args=tuple(body["args"]), state=body["state"])
+
+    def to_exception(self) -> BaseException:
+        exc = self.exception_type.__new__(self.exception_type)
+        exc.args = self.args
+        vars(exc).update(self.state)
+        return exc
+
+
+def _type_name(exception_type: type) -> str:
+    return f"{exception_type.__module__}.{exception_type.__qualname__}"
+
+
+def _with_subclasses(types: ExceptionTypes) -> Iterator[type]:
+    for t in types:
+        yield t
+        yield from _with_subclasses(tuple(t.__subclasses__()))
@@ -0,0 +1,101 @@
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Callable, Dict
+import inspect
+import logging
+import math
+import typing
+
+import numpy as np
+from pydantic import PydanticSchemaGenerationError, TypeAdapter
+from pydantic_core import PydanticSerializationError
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CompiledSerializer:
+    """Serializes values of one return type straight to JSON bytes and back."""
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[bytes | str], Any]
+
+
+def _json_fallback(value: Any) -> Any:
+    """Handles the pandas/numpy scalars that end up in results built from DataFrames."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise PydanticSerializationError(f"Unable to serialize unknown type: {type(value)}")
+
+
+class SerializerRegistry:
+    """
+    Builds one serializer per return annotation and reuses it for every call.
+
+    Types pydantic understands (models, `List[Model]`, `PageResponse`, primitives) get a
+    `TypeAdapter`, so a whole `List[BaseModel]` is dumped and validated in a single
+    pydantic-core call. Anything else (no annotation, SQLAlchemy models, values that
+    do not match their annotation) goes through the legacy recursive serializer.
+    """
+    def __init__(self, legacy_factory: Callable[[Any], CompiledSerializer]):
+        self.legacy_factory = legacy_factory
+        self._by_type: Dict[Any, CompiledSerializer] = {}
+        self._by_function: Dict[Callable[..., Any], CompiledSerializer] = {}
+
+    def for_function(self, func: Callable[..., Any]) -> CompiledSerializer:
+        serializer = self._by_function.get(func)
+        if serializer is None:
+            serializer = self.for_type(_return_annotation(func))
+            self._by_function[func] = serializer
+        return serializer
+
+    def for_type(self, return_type: Any) -> CompiledSerializer:
+        try:
+            serializer = self._by_type.get(return_type)
+        except TypeError:  # unhashable annotation
+            return self._compile(return_type)
+        if serializer is None:
+            serializer = self._compile(return_type)
+            self._by_type[return_type] = serializer
+        return serializer
+
+    def _compile(self, return_type: Any) -> CompiledSerializer:
+        legacy = self.legacy_factory(return_type)
+        if return_type is inspect.Signature.empty or return_type is Any:
+            return legacy
+        try:
+            adapter = TypeAdapter(return_type)
+        except (PydanticSchemaGenerationError, TypeError) as e:
+            logger.info(f"Using legacy cache serializer for {return_type}: {e}")
+            return legacy
+
+        def dumps(value: Any) -> bytes:
+            try:
+                payload = adapter.dump_json(value, fallback=_json_fallback, warnings="error")
+            except (PydanticSerializationError, TypeError, ValueError):
+                return legacy.dumps(value)
+            # pydantic writes NaN and infinities as null, which float fields reject on load;
+            # json keeps them as the NaN/Infinity constants that validate_json accepts.
+            if b"null" in payload and _has_non_finite_float(adapter.dump_python(value, warnings=False)):
+                return legacy.dumps(value)
+            return payload
+
+        return CompiledSerializer(dumps=dumps, loads=adapter.validate_json)
+
+
+def _has_non_finite_float(value: Any) -> bool:
+    if isinstance(value, float):
+        return not math.isfinite(value)
+    if isinstance(value, dict):
+        return any(_has_non_finite_float(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(_has_non_finite_float(v) for v in value)
+    return False
+
+
+def _return_annotation(func: Callable[..., Any]) -> Any:
+    try:
+        return typing.get_type_hints(func).get("return", inspect.Signature.empty)
+    except Exception:
+        return inspect.signature(func).return_annotation
@@ -0,0 +1,73 @@
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict
+import asyncio
+import logging
+
+from redis.exceptions import LockError
+
+from src.services.cache.cache_backend import CacheBackend
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls for the same key into a single in-flight task.
+    The first caller starts the task; everyone else awaits its result.
+    """
+    def __init__(self):
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._tasks[key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        else:
+            logger.info(f"Single-flight: joining in-flight computation for key: {key}")
+        # shield() keeps one cancelled waiter from cancelling the computation for the others.
+        return await asyncio.shield(task)
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._tasks
+
+
+@asynccontextmanager
+async def cache_lock(backend: CacheBackend, name: str, timeout: float) -> AsyncIterator[bool]:
+    """
+    Tries to take a lock on the cache backend without blocking and yields whether it was acquired.
+    While held, a heartbeat task keeps resetting the lock TTL so a slow holder does not
+    lose it, while a crashed holder still releases it after `timeout` seconds.
+    """
+    lock = backend.lock(name, timeout)
+    try:
+        acquired = await lock.acquire(blocking=False)
+    except Exception as e:
+        logger.error(f"Cache lock error for {name}: {e}")
+        yield True  # The backend is unavailable; let the caller compute rather than wait forever.
+        return
+
+    if not acquired:
+        yield False
+        return
+
+    heartbeat = asyncio.create_task(_heartbeat(lock, timeout / 3))
+    try:
+        yield True
+    finally:
+        heartbeat.cancel()
+        try:
+            await lock.release()
+        except LockError:
+            logger.warning(f"Cache lock {name} expired before release")
+
+
+async def _heartbeat(lock, interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await lock.reacquire()
+        except LockError:
+            logger.warning(f"Cache lock {lock.name} lost while computing")
+            return
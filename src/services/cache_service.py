@@ -1,140 +1,534 @@
 from redis.asyncio import Redis
 import pandas as pd
 from pandas import DataFrame
-from typing import Optional, Callable, Any, Type
+from typing import Optional, Callable, Any, Type, Awaitable, Union
 import logging
 from functools import wraps
 from src.core.config import settings
-from io import StringIO
+from src.services.cache.dataframe_codec import encode_dataframe, decode_dataframe, resolve_format
+from src.services.cache.local_dataframe_cache import LocalDataFrameCache
+from src.services.cache.single_flight import SingleFlight, cache_lock
+from src.services.cache.cache_backend import CacheBackend, to_str
+from src.services.cache.impl.redis_cache_backend import RedisCacheBackend
+from src.services.cache.dataframe_stamp import DataFrameStamp
+from src.services.cache.dataframe_chunks import ChunkManifest, chunk_keys, split_rows
+from src.services.cache.compression import PayloadCompressor
+from src.services.cache.serializers import CompiledSerializer, SerializerRegistry
+from src.services.cache.cache_plan import CachePlan
+from src.services.cache.negative_cache import CachedException
+from src.services.cache.cache_metrics import CacheMetrics, cache_metrics
+from src.aspects.decorators import CachePolicy
+import asyncio
 import inspect
 import json
+import time
 import typing
+import uuid
 from pydantic import BaseModel, create_model
 from sqlalchemy.orm import DeclarativeMeta
 logger = logging.getLogger(__name__)
 
+# Shared by every CacheService created in this worker process (services are built per request).
+local_dataframe_cache = LocalDataFrameCache(settings.CACHE_DF_L1_MAX_BYTES)
+single_flight = SingleFlight()
+# Keeps fire-and-forget refresh tasks referenced until they finish.
+_background_tasks: set = set()
+
+# Sentinel for "not in cache"; None is a legitimate cached value.
+_MISSING = object()
+
+# Generic entries live under "cache:v<namespace version>:"; bumping the version orphans
+# every entry at once and the old ones age out through their TTL.
+NAMESPACE_PREFIX = "cache"
+NAMESPACE_VERSION_KEY = "cache_meta:namespace_version"
+# Random token per source table (e.g. users); writes to the table replace it, which
+# orphans every entry tagged with the old one in all workers.
+TABLE_VERSION_PREFIX = "cache_meta:table_version:"
+# Key prefixes owned by the cache (generic entries and cached DataFrames), used by delete_cache.
+CACHE_KEY_PREFIXES = (f"{NAMESPACE_PREFIX}:", "metrics:")
+
+def _on_background_task_done(task: asyncio.Task) -> None:
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Background cache refresh failed: {task.exception()}")
+
 class CacheService:
-    def __init__(self, redis_client: Redis):
-        self.redis_client = redis_client
+    lock_poll_interval_seconds: float = 0.1
+
+    def __init__(self, backend: Union[CacheBackend, Redis], df_format: Optional[str] = None, local_cache: Optional[LocalDataFrameCache] = None):
+        # A bare Redis client is accepted for convenience and wrapped in the Redis backend.
+        self.backend: CacheBackend = backend if isinstance(backend, CacheBackend) else RedisCacheBackend(backend)
         self.ttl = settings.CACHE_TTL_SECONDS
+        self.df_format = resolve_format(df_format or settings.CACHE_DF_FORMAT)
+        self.local_cache = local_cache if local_cache is not None else local_dataframe_cache
+        self.single_flight = single_flight
+        self.lock_timeout = settings.CACHE_LOCK_TIMEOUT_SECONDS
+        self.lock_wait = settings.CACHE_LOCK_WAIT_SECONDS
+        self.df_soft_ttl = settings.CACHE_DF_SOFT_TTL_SECONDS
+        self.derived_ttl = settings.CACHE_DERIVED_TTL_SECONDS
+        self.negative_ttl = settings.CACHE_NEGATIVE_TTL_SECONDS
+        self.df_chunk_rows = settings.CACHE_DF_CHUNK_ROWS
+        self.df_chunk_grace = settings.CACHE_DF_CHUNK_GRACE_SECONDS
+        self.compressor = PayloadCompressor(settings.CACHE_COMPRESSION_CODEC, settings.CACHE_COMPRESSION_MIN_BYTES)
+        self.metrics: CacheMetrics = cache_metrics
+
+    @staticmethod
+    def key_family(key: str) -> str:
+        """Groups generic keys by the method that produced them (the part after the namespace)."""
+        if key.startswith(f"{NAMESPACE_PREFIX}:v"):
+            key = key.split(":", 2)[2]
+        return key.split(":", 1)[0]
+
+    async def get_namespace_version(self) -> int:
+        version = await self.backend.get(NAMESPACE_VERSION_KEY)
+        return int(version) if version is not None else 0
+
+    async def bump_namespace(self) -> int:
+        """Invalidates every generic entry by moving to a new namespace version."""
+        version = await self.backend.incr(NAMESPACE_VERSION_KEY)
+        logger.info(f"Cache namespace bumped to v{version}")
+        return version
+
+    async def namespaced_key(self, key: str, dataset_versions: tuple[str, ...] = ()) -> str:
+        return self._build_key(await self.get_namespace_version(), key, dataset_versions)
+
+    @staticmethod
+    def _build_key(namespace_version: int, key: str, dataset_versions: tuple[str, ...] = ()) -> str:
+        tag = f"|ds={','.join(dataset_versions)}" if dataset_versions else ""
+        return f"{NAMESPACE_PREFIX}:v{namespace_version}:{key}{tag}"
+
+    async def _get_namespace_and_dataset_versions(self, dataframe_keys: tuple[str, ...], tables: tuple[str, ...] = ()) -> tuple[int, tuple[Optional[str], ...]]:
+        """
+        Reads the namespace version and the current version of each dependency frame and
+        table in one round trip. A table that has no version yet is given one.
+        """
+        raw = await self.backend.mget([
+            NAMESPACE_VERSION_KEY,
+            *(self.version_key(k) for k in dataframe_keys),
+            *(self.table_version_key(t) for t in tables),
+        ])
+        namespace_version = int(raw[0]) if raw[0] is not None else 0
+        stamps = [DataFrameStamp.decode(value) for value in raw[1:len(dataframe_keys) + 1]]
+        table_versions = [
+            to_str(value) if value is not None else await self._create_table_version(table)
+            for table, value in zip(tables, raw[len(dataframe_keys) + 1:])
+        ]
+        return namespace_version, (*(stamp.version if stamp else None for stamp in stamps), *table_versions)
+
+    @staticmethod
+    def table_version_key(table: str) -> str:
+        return f"{TABLE_VERSION_PREFIX}{table}"
+
+    async def _create_table_version(self, table: str) -> str:
+        # NX: when several workers race, they all end up with the token of the first one.
+        await self.backend.set(self.table_version_key(table), uuid.uuid4().hex, nx=True)
+        return to_str(await self.backend.get(self.table_version_key(table)))
+
+    async def bump_table_version(self, table: str) -> None:
+        """
+        Invalidates, in every worker, the cached results of services that declare `table` in
+        `cache_depends_on_tables`. Call it after each committed write to the table.
+        """
+        await self.backend.set(self.table_version_key(table), uuid.uuid4().hex)
+        logger.info(f"Cache version of table '{table}' bumped")
+
+    @staticmethod
+    def version_key(key: str) -> str:
+        return f"{key}:version"
+
+    async def get_dataframe_stamp(self, key: str) -> Optional[DataFrameStamp]:
+        """Returns the version/freshness stamp written alongside the cached DataFrame, if any."""
+        return DataFrameStamp.decode(await self.backend.get(self.version_key(key)))
 
     async def get_dataframe(self, key: str) -> Optional[DataFrame]:
         """
         Retrieves and deserializes a pandas DataFrame from the cache.
+        The in-process L1 copy is served while its version matches the one in the backend.
         """
-        cached_df_json = await self.redis_client.get(key)
-        if cached_df_json:
-            logger.info(f"Cache HIT for key: {key}")
-            return pd.read_json(StringIO(cached_df_json), orient='split')
+        df, _ = await self._read_dataframe(key)
+        return df
+
+    async def _read_dataframe(self, key: str) -> tuple[Optional[DataFrame], Optional[DataFrameStamp]]:
+        start = time.perf_counter()
+        stamp = await self.get_dataframe_stamp(key)
+        version = stamp.version if stamp else None
+        if self.local_cache.enabled:
+            local_df = self.local_cache.get(key, version)
+            if local_df is not None:
+                logger.info(f"L1 cache HIT for key: {key} (version {version})")
+                self.metrics.observe(key, "lookup", time.perf_counter() - start)
+                self.metrics.increment(key, "local_hits")
+                return local_df, stamp
+
+        payload = await self.backend.get(key)
+        self.metrics.observe(key, "lookup", time.perf_counter() - start)
+        if payload:
+            manifest = ChunkManifest.decode(payload)
+            self.metrics.increment(key, "bytes_read", len(payload))
+            # For chunked frames this also covers fetching the chunks, which overlaps with decoding them.
+            with self.metrics.timed(key, "deserialize"):
+                if manifest is None:
+                    df = decode_dataframe(self.compressor.decompress(payload, key))
+                else:
+                    df = await self._read_chunks(key, manifest)
+            if df is not None:
+                logger.info(f"Cache HIT for key: {key}")
+                self.metrics.increment(key, "hits")
+                self.local_cache.put(key, version, df)
+                return df, stamp
         logger.info(f"Cache MISS for key: {key}")
-        return None
+        self.metrics.increment(key, "misses")
+        return None, None
 
+    async def get_dataframe_with_stamp(self, key: str) -> tuple[Optional[DataFrame], Optional[DataFrameStamp]]:
+        """Like get_dataframe, but also returns the stamp of the version that was read."""
+        return await self._read_dataframe(key)
 
-    async def set_dataframe(self, key: str, df: DataFrame, ttl_seconds: int) -> None:
+    async def set_dataframe(self, key: str, df: DataFrame, ttl_seconds: int, soft_ttl_seconds: Optional[int] = None) -> DataFrameStamp:
         """
         Serializes and stores a pandas DataFrame in the cache with a TTL.
+        The payload is binary, so a Redis backend's client must not decode responses.
+        The stamp is written after the frame; its version is a content fingerprint, so L1
+        copies and derived entries tagged with it are only invalidated when the data changes.
+        It also records when the entry goes stale (soft TTL) while the backend keeps it until the hard TTL.
+        Returns the new stamp.
         """
-        df_json = df.to_json(orient='split')
-        await self.redis_client.set(key, df_json, ex=ttl_seconds)
-        logger.info(f"Cache SET for key: {key} with TTL: {ttl_seconds}s")
+        soft_ttl_seconds = self._soft_ttl(ttl_seconds, soft_ttl_seconds)
+        with self.metrics.timed(key, "write"):
+            previous = await self.get_dataframe_stamp(key)
+            chunked = bool(self.df_chunk_rows) and len(df) > self.df_chunk_rows
+            if chunked:
+                stamp, stored_bytes = await self._write_chunks(key, df, ttl_seconds, soft_ttl_seconds)
+            else:
+                encoded = encode_dataframe(df, self.df_format)
+                stamp = DataFrameStamp.new(encoded, soft_ttl_seconds)
+                payload = self.compressor.compress(encoded, key)
+                await self.backend.set(key, payload, ex=ttl_seconds)
+                stored_bytes = len(payload)
+            await self.backend.set(self.version_key(key), stamp.encode(), ex=ttl_seconds)
+            await self._retire_chunks(key, previous, keep_generation=stamp.version if chunked else None)
+        self.metrics.increment(key, "bytes_written", stored_bytes)
+        self.local_cache.put(key, stamp.version, df)
+        logger.info(f"Cache SET for key: {key} with TTL: {ttl_seconds}s ({self.df_format.value}, {stored_bytes} bytes)")
+        return stamp
 
-    def cache_dataframe(self, key: str, ttl_seconds: int):
+    def _soft_ttl(self, ttl_seconds: int, soft_ttl_seconds: Optional[int]) -> Optional[int]:
+        if soft_ttl_seconds is None:
+            soft_ttl_seconds = self.df_soft_ttl
+        return soft_ttl_seconds if 0 < soft_ttl_seconds < ttl_seconds else None
+
+    async def touch_dataframe(self, key: str, ttl_seconds: int, soft_ttl_seconds: Optional[int] = None) -> Optional[DataFrameStamp]:
+        """
+        Marks the cached frame as fresh again and extends its TTL without rewriting it, for when
+        the source has not changed. Returns the new stamp, or None if nothing is cached under `key`.
+        """
+        stamp = await self.get_dataframe_stamp(key)
+        if stamp is None:
+            return None
+        stamp = stamp.refreshed(self._soft_ttl(ttl_seconds, soft_ttl_seconds))
+        chunks = chunk_keys(key, stamp.version, stamp.chunks)
+        await self.backend.expire_many([key, self.metadata_key(key), *chunks], ttl_seconds)
+        await self.backend.set(self.version_key(key), stamp.encode(), ex=ttl_seconds)
+        logger.info(f"Cache TOUCH for key: {key} with TTL: {ttl_seconds}s")
+        return stamp
+
+    @staticmethod
+    def metadata_key(key: str) -> str:
+        return f"{key}:meta"
+
+    async def set_dataframe_metadata(self, key: str, version: str, value: str, ttl_seconds: int) -> None:
+        """
+        Stores `value` next to the cached frame, bound to the frame `version` it describes;
+        it is ignored once the frame is replaced by another version.
+        """
+        await self.backend.set(self.metadata_key(key), f"{version}@{value}", ex=ttl_seconds)
+
+    async def get_dataframe_metadata(self, key: str, version: str) -> Optional[str]:
+        raw = await self.backend.get(self.metadata_key(key))
+        if raw is None:
+            return None
+        stored_version, _, value = to_str(raw).partition("@")
+        return value if stored_version == version else None
+
+    async def _write_chunks(self, key: str, df: DataFrame, ttl_seconds: int, soft_ttl_seconds: Optional[int]) -> tuple[DataFrameStamp, int]:
+        """
+        Stores `df` as row-group chunks of CACHE_DF_CHUNK_ROWS rows plus a manifest under `key`.
+        The chunks go to keys of their own generation in one pipeline; only then is the manifest
+        swapped in with a single SET, so readers see either the old frame or the new one.
+        """
+        def encode_chunks() -> tuple[DataFrameStamp, ChunkManifest, dict[str, bytes]]:
+            encoded = [encode_dataframe(chunk, self.df_format) for chunk in split_rows(df, self.df_chunk_rows)]
+            stamp = DataFrameStamp.new(encoded, soft_ttl_seconds)
+            manifest = ChunkManifest(generation=stamp.version, chunks=len(encoded), rows=len(df))
+            return stamp, manifest, {chunk_key: self.compressor.compress(payload, key) for chunk_key, payload in zip(manifest.chunk_keys(key), encoded)}
+
+        stamp, manifest, chunks = await asyncio.to_thread(encode_chunks)
+        await self.backend.set_many(chunks, ex=ttl_seconds)
+        await self.backend.set(key, manifest.encode(), ex=ttl_seconds)
+        return stamp, sum(map(len, chunks.values()))
+
+    async def _retire_chunks(self, key: str, previous: Optional[DataFrameStamp], keep_generation: Optional[str]) -> None:
+        """
+        Gives the chunks of the replaced frame (known from its stamp) CACHE_DF_CHUNK_GRACE_SECONDS
+        to live instead of their full TTL, long enough for readers that fetched its manifest to
+        finish. Chunks of a generation that a concurrent writer replaced before its stamp was
+        read just expire with their TTL.
+        """
+        if previous is not None and previous.chunks and previous.version != keep_generation:
+            await self.backend.expire_many(chunk_keys(key, previous.version, previous.chunks), self.df_chunk_grace)
+
+    async def _read_chunks(self, key: str, manifest: ChunkManifest) -> Optional[DataFrame]:
+        """Fetches the chunks concurrently and decodes each one in a worker thread as it arrives."""
+        async def read_chunk(chunk_key: str) -> Optional[DataFrame]:
+            stored = await self.backend.get(chunk_key)
+            if stored is None:
+                return None
+            self.metrics.increment(key, "bytes_read", len(stored))
+            return await asyncio.to_thread(lambda: decode_dataframe(self.compressor.decompress(stored, key)))
+
+        frames = await asyncio.gather(*(read_chunk(k) for k in manifest.chunk_keys(key)))
+        if any(frame is None for frame in frames):
+            logger.warning(f"Chunks of cached frame {key} (generation {manifest.generation}) have expired")
+            return None
+        return pd.concat(frames)
+
+    def cache_dataframe(self, key: str, ttl_seconds: int, soft_ttl_seconds: Optional[int] = None):
         """
         Decorator to cache the result of a function that returns a pandas DataFrame.
+        Once the soft TTL has passed the cached frame is still returned immediately,
+        and a single background refresh recomputes it (stale-while-revalidate).
         """
         def decorator(func: Callable[..., Any]):
             logger.info("executing cache_dataframe")
+            async def lookup():
+                cached_df = await self.get_dataframe(key)
+                return _MISSING if cached_df is None else cached_df
+
             @wraps(func)
             async def wrapper(*args, **kwargs):
-                cached_df = await self.get_dataframe(key)
+                async def compute():
+                    with self.metrics.timed(key, "compute"):
+                        new_df = await func(*args, **kwargs)
+                    await self.set_dataframe(key, new_df, ttl_seconds, soft_ttl_seconds)
+                    return new_df
+
+                cached_df, stamp = await self._read_dataframe(key)
                 if cached_df is not None:
+                    if stamp is not None and stamp.is_stale():
+                        self._refresh_in_background(key, compute)
                     return cached_df
-                
-                new_df = await func(*args, **kwargs)
-                await self.set_dataframe(key, new_df, ttl_seconds)
-                return new_df
+
+                return await self._compute_once(key, lookup, compute)
             
             return wrapper
         
         return decorator
 
+    def _refresh_in_background(self, key: str, compute: Callable[[], Awaitable[Any]]) -> None:
+        """
+        Schedules one refresh of a stale entry without making the caller wait for it.
+        Only one task per process and one holder of the backend refresh lock across processes run it.
+        """
+        refresh_key = f"refresh:{key}"
+        if self.single_flight.in_flight(refresh_key):
+            return
+
+        async def refresh():
+            async with cache_lock(self.backend, f"lock:{refresh_key}", self.lock_timeout) as acquired:
+                if not acquired:
+                    return
+                logger.info(f"Refreshing stale cache entry in background: {key}")
+                await compute()
+
+        task = asyncio.ensure_future(self.single_flight.do(refresh_key, refresh))
+        _background_tasks.add(task)
+        task.add_done_callback(_on_background_task_done)
+
+    @classmethod
+    def plan(cls, func: Callable[..., Any], policy: Optional[CachePolicy] = None) -> CachePlan:
+        """Resolves the key family, serializer and policy of a cached function once."""
+        policy = policy or getattr(func, "_cache_policy", None) or CachePolicy()
+        return CachePlan(
+            func=func,
+            family=func.__qualname__,
+            serializer=serializer_registry.for_function(func),
+            ttl=policy.ttl,
+            key_args=policy.key,
+            negative_exceptions=policy.negative,
+            negative_ttl=policy.negative_ttl,
+        )
+
     def cache(self, func: Callable[..., Any]) -> Callable[..., Any]:
         """
         Decorator to cache the result of a generic async function.
         The result must be JSON serializable.
         """
+        plan = self.plan(func)
+
         @wraps(func)
         async def wrapper(instance, *args, **kwargs):
-            logger.info("executing cache")
-            key: str = self.generate_key(func, instance, *args, **kwargs)
+            return await self.call_cached(plan, instance, *args, **kwargs)
+        return wrapper
+
+    async def call_cached(self, plan: CachePlan, instance: Any, *args: Any, **kwargs: Any) -> Any:
+        """
+        Runs `plan.func` through the generic cache.
+
+        If the instance declares `cache_depends_on` (cached DataFrame keys), the entry is
+        tagged with the current version of those frames and kept for CACHE_DERIVED_TTL_SECONDS:
+        it stays valid exactly as long as the frames it was computed from.
+        Likewise `cache_depends_on_tables` tags it with the version of database tables, which
+        `bump_table_version` replaces when they are written.
+        Exceptions of the plan's negative types are cached for a short TTL and re-raised on hits.
+        """
+        func = plan.func
+        dependencies: tuple[str, ...] = tuple(getattr(instance, "cache_depends_on", ()))
+        tables: tuple[str, ...] = tuple(getattr(instance, "cache_depends_on_tables", ()))
+        namespace_version, dataset_versions = await self._get_namespace_and_dataset_versions(dependencies, tables)
+        if None in dataset_versions:
+            # The source frame is not cached yet: we cannot tell which data the result
+            # would be computed from, so it is not cached either.
+            logger.info(f"Cache BYPASS for '{plan.family}': dependency frame not cached yet")
+            self.metrics.increment(plan.family, "bypasses")
+            return await func(instance, *args, **kwargs)
+
+        key: str = self._build_key(namespace_version, plan.build_key(*args, **kwargs), dataset_versions)
+        cached_value = await self._get_cached(key, plan)
+        if cached_value is not _MISSING:
+            return self._unwrap(cached_value, plan.family)
+
+        logger.info(f"Cache MISS for generic key: {key}")
+        self.metrics.increment(plan.family, "misses")
+        ttl_seconds = plan.ttl or (self.derived_ttl if dependencies else None)
+
+        async def compute():
             try:
-                cached_value = await self.redis_client.get(key)
-                if cached_value is not None:
-                    logger.info(f"Cache HIT for generic key: {key}")
-                    data = json.loads(cached_value)
-                    return_type = inspect.signature(func).return_annotation
-
-                    if return_type is inspect.Signature.empty:
-                        logger.warning(f"Cache deserialization skipped for '{func.__qualname__}': Missing return type. Returning raw dict.")
-                        return data
-
-                    return self._deserialize_data(data, return_type)
-            except Exception as e:
-                logger.error(f"Cache GET error for key {key}: {e}")
-
-            logger.info(f"Cache MISS for generic key: {key}")
-            result = await func(instance, *args, **kwargs)
-            await self.set_cache(key, result)
+                with self.metrics.timed(plan.family, "compute"):
+                    result = await func(instance, *args, **kwargs)
+            except plan.negative_exceptions as e:
+                await self._set_negative(key, e, plan)
+                raise
+            await self.set_cache(key, result, ttl_seconds, serializer=plan.serializer)
             return result
-        return wrapper
+
+        return self._unwrap(await self._compute_once(key, lambda: self._get_cached(key, plan), compute), plan.family)
+
+    async def _get_cached(self, key: str, plan: CachePlan) -> Any:
+        """Reads and deserializes a generic cache entry. Returns _MISSING on a miss or read error."""
+        try:
+            with self.metrics.timed(plan.family, "lookup"):
+                cached_value = await self.backend.get(key)
+            if cached_value is not None:
+                logger.info(f"Cache HIT for generic key: {key}")
+                with self.metrics.timed(plan.family, "deserialize"):
+                    value = self._decode_entry(self.compressor.decompress(cached_value, plan.family), plan)
+                self.metrics.increment(plan.family, "hits")
+                self.metrics.increment(plan.family, "bytes_read", len(cached_value))
+                return value
+        except Exception as e:
+            logger.error(f"Cache GET error for key {key}: {e}")
+            self.metrics.increment(plan.family, "errors")
+        return _MISSING
+
+    @staticmethod
+    def _decode_entry(payload: bytes | str, plan: CachePlan) -> Any:
+        """Deserializes a result, or returns the CachedException stored by a negative entry."""
+        if plan.negative_exceptions:
+            cached_exception = CachedException.decode(payload, plan.negative_exceptions)
+            if cached_exception is not None:
+                return cached_exception
+        return plan.serializer.loads(payload)
+
+    def _unwrap(self, value: Any, family: str) -> Any:
+        """Returns a cached result, or re-raises the exception cached in its place."""
+        if isinstance(value, CachedException):
+            self.metrics.increment(family, "negative_hits")
+            raise value.to_exception()
+        return value
+
+    async def _set_negative(self, key: str, exc: BaseException, plan: CachePlan) -> None:
+        try:
+            payload = CachedException.from_exception(exc).encode()
+            await self.backend.set(key, payload, ex=plan.negative_ttl or self.negative_ttl)
+            logger.info(f"Cache SET negative entry for key: {key} ({type(exc).__name__})")
+        except Exception as e:
+            logger.error(f"Cache SET error for negative entry {key}: {e}")
+
+    async def _compute_once(self, key: str, lookup: Callable[[], Awaitable[Any]], compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Fills a missing cache entry with single-flight semantics: concurrent callers in this
+        process share one task, and across processes only the holder of the backend lock computes.
+        Everyone else polls the cache until the holder has written the value.
+        """
+        async def fill():
+            async with cache_lock(self.backend, f"lock:{key}", self.lock_timeout) as acquired:
+                if acquired:
+                    # Another process may have filled the entry between our miss and the lock.
+                    value = await lookup()
+                    if value is not _MISSING:
+                        return value
+                    return await compute()
+
+                value = await self._wait_for_fill(lookup)
+                if value is not _MISSING:
+                    return value
+                logger.warning(f"Timed out waiting for cache lock on key: {key}; computing without it")
+                return await compute()
+
+        return await self.single_flight.do(key, fill)
+
+    async def _wait_for_fill(self, lookup: Callable[[], Awaitable[Any]]) -> Any:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.lock_wait
+        while loop.time() < deadline:
+            await asyncio.sleep(self.lock_poll_interval_seconds)
+            value = await lookup()
+            if value is not _MISSING:
+                return value
+        return _MISSING
     
-    def _deserialize_data(self, data: Any, return_type: Type) -> Any:
+    @classmethod
+    def _deserialize_data(cls, data: Any, return_type: Type) -> Any:
         """Recursively deserializes data into the specified Pydantic or SQLAlchemy model type."""
         origin = typing.get_origin(return_type)
 
         if origin in (list, typing.List) and isinstance(data, list):
             item_type = typing.get_args(return_type)[0]
-            return [self._deserialize_data(item, item_type) for item in data]
+            return [cls._deserialize_data(item, item_type) for item in data]
 
         if inspect.isclass(return_type) and issubclass(return_type, BaseModel):
             return return_type.model_validate(data)
         
-        if isinstance(return_type, DeclarativeMeta): # It's a SQLAlchemy model class
+        if isinstance(return_type, DeclarativeMeta) or (inspect.isclass(return_type) and hasattr(return_type, "__table__")): # It's a SQLAlchemy model class
             return return_type(**data)
 
         return data # Fallback for simple types
 
-    def generate_key(self, func: Callable[..., Any], instance: Any, *args: Any, **kwargs: Any) -> str:
-        """
-        Generates a robust cache key based on the function's qualified name
-        and a representation of its arguments.
-        """
-        func_name = func.__qualname__
-        # Use repr() for a stable representation of basic types. Avoids complex object string conversion.
-        args_repr = [repr(a) for a in args]
-        kwargs_repr = [f"{k}={repr(v)}" for k, v in sorted(kwargs.items())]
-        return f"{func_name}:{':'.join(args_repr + kwargs_repr)}"
-    
-    async def set_cache(self, key: str, value: Any, ttl_seconds: Optional[int] = None) -> None:
+    async def set_cache(self, key: str, value: Any, ttl_seconds: Optional[int] = None, serializer: Optional[CompiledSerializer] = None) -> None:
         """Serializes and stores a value in the cache with a TTL."""
         if ttl_seconds is None:
             ttl_seconds = self.ttl
         
-        serialized_value = self._serialize_value(value)
-        await self.redis_client.set(key, serialized_value, ex=ttl_seconds)
+        family = self.key_family(key)
+        with self.metrics.timed(family, "write"):
+            serialized_value = serializer.dumps(value) if serializer else self._serialize_value(value).encode("utf-8")
+            payload = self.compressor.compress(serialized_value, family)
+            await self.backend.set(key, payload, ex=ttl_seconds)
+        self.metrics.increment(family, "bytes_written", len(payload))
 
-    def _serialize_value(self, value: Any) -> str:
+    @classmethod
+    def _serialize_value(cls, value: Any) -> str:
         """Recursively serializes a value to a JSON string."""
         if isinstance(value, (list, tuple)):
             # Correctly handle lists by serializing each item and then the whole list.
             # We need to load the inner serialized string back to an object before the final dump.
-            processed_items = [json.loads(self._serialize_value(item)) for item in value]
+            processed_items = [json.loads(cls._serialize_value(item)) for item in value]
             return json.dumps(processed_items)
 
         if isinstance(value, BaseModel): # It's a Pydantic model
             # Serialize Pydantic models by recursively serializing their fields
             # This correctly handles nested SQLAlchemy models inside Pydantic models.
-            obj_dict = {field: json.loads(self._serialize_value(getattr(value, field))) for field in value.model_fields}
+            obj_dict = {field: json.loads(cls._serialize_value(getattr(value, field))) for field in type(value).model_fields}
             return json.dumps(obj_dict)
 
         if hasattr(value, '_sa_instance_state'): # It's a SQLAlchemy instance
@@ -148,8 +542,63 @@ class CacheService:
         
         return json.dumps(value) # Fallback for simple types
         
+    def get_stats(self) -> dict:
+        """Per key family cache metrics, plus the stats of the local DataFrame tier, compression and the backend."""
+        return {
+            "families": self.metrics.snapshot(),
+            "local_dataframes": self.local_cache.stats(),
+            "compression": self.compressor.stats.snapshot(),
+            "backend": self.backend.stats(),
+        }
+
+    def reset_stats(self) -> None:
+        self.metrics.reset()
+        self.local_cache.reset_stats()
+        self.compressor.stats.reset()
+        self.backend.reset_stats()
+
+    def invalidate_local_dataframes(self, key: Optional[str] = None) -> None:
+        """Drops this worker's L1 DataFrame copies (one key, or all of them)."""
+        self.local_cache.invalidate(key)
+
+    async def invalidate_prefix(self, prefix: str, batch_size: int = 500) -> int:
+        """
+        Deletes every key starting with `prefix`. Keys are found with an incremental scan and
+        removed in batches (SCAN + UNLINK on Redis), so the store is never blocked the way KEYS/FLUSHDB would.
+        """
+        deleted = 0
+        batch = []
+        async for key in self.backend.scan_iter(prefix, count=batch_size):
+            batch.append(key)
+            if len(batch) >= batch_size:
+                deleted += await self.backend.delete(*batch)
+                batch = []
+        if batch:
+            deleted += await self.backend.delete(*batch)
+        logger.info(f"Cache invalidated {deleted} keys with prefix: {prefix}")
+        return deleted
+
     async def delete_cache(self) -> None:
         """
-        Deletes the cache.
+        Deletes the cache without touching other data in the database (e.g. Celery's).
+        The namespace bump makes generic entries unreachable immediately; the
+        incremental delete then reclaims their memory.
         """
-        await self.redis_client.flushdb()
\ No newline at end of file
+        await self.bump_namespace()
+        for prefix in CACHE_KEY_PREFIXES:
+            await self.invalidate_prefix(prefix)
+        self.invalidate_local_dataframes()
+
+
+def _legacy_serializer(return_type: Any) -> CompiledSerializer:
+    """Recursive json-based serializer used for return types pydantic cannot handle."""
+    def loads(data: bytes | str) -> Any:
+        value = json.loads(data)
+        if return_type is inspect.Signature.empty:
+            return value
+        return CacheService._deserialize_data(value, return_type)
+
+    return CompiledSerializer(dumps=lambda value: CacheService._serialize_value(value).encode("utf-8"), loads=loads)
+
+
+serializer_registry = SerializerRegistry(_legacy_serializer)
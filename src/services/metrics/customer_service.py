@@ -15,7 +15,7 @@ class CustomerService(MetricsService):
     async def get_top_spenders(self, top_spenders_params: TopSpendersMetricsParams) -> List[Spender]:
         db: DataFrame = await self.get_clean_data_frame()
         top_spenders = (
-            db.groupby(self.customer_id)
+            db.groupby(self.customer_id, observed=True)
             .agg(
                 total_spent=(self.total_price, "sum"),
                 total_units_sold=(self.quantity, "sum"),
@@ -130,7 +130,7 @@ class CustomerService(MetricsService):
 
         snapshot_date = pd.to_datetime(df[self.invoice_date]).max() + pd.Timedelta(days=1)
         df_rfm = (
-            df.groupby(self.customer_id)
+            df.groupby(self.customer_id, observed=True)
             .agg(
         recency=(self.invoice_date, lambda x: int((snapshot_date - pd.to_datetime(x.max())) / pd.Timedelta(days=1))),
                 frequency=(self.invoice_no, "nunique"),
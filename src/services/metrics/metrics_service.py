@@ -1,24 +1,54 @@
-from src.repositories.metrics_repository import MetricsRepository
+from src.repositories.impl.metrics_repository_threaded import as_async_metrics_repository
+from src.repositories.metrics_repository import AsyncMetricsRepository, MetricsRepository, RowWatermark
 import pandas as pd
 import numpy as np
 from pandas import DataFrame, Series
 from pandas.core.resample import DatetimeIndexResampler
 from src.schemas.metrics import KPIsSummary, Serie, SerieType, TopCountryRevenue, TopCountryRevenueParams
-from typing import List
+from typing import List, Optional
 from src.exceptions.metrics_exceptions import CountryNotFoundException
 from src.exceptions.generic_exceptions import BadRequestException
 from src.schemas.pagination import PageParams, PageResponse
 from src.services.cache_service import CacheService
-from typing import Callable, Awaitable
+from src.core.config import settings
+from typing import Callable, Awaitable, Dict, Union
 from src.aspects.caching import Caching
-from src.aspects.decorators import excluded_from_cache
+from src.aspects.decorators import cached, excluded_from_cache
+from pandas.api.types import union_categoricals
+from pandas.tseries.api import guess_datetime_format
+import asyncio
 import logging
+import re
+import time
+import warnings
 
 logger = logging.getLogger(__name__)
 
+# Values inspected to decide whether a text column has thousands separators to strip.
+NUMERIC_SAMPLE_SIZE = 1000
+# Distinct values a date column's format is detected from.
+DATE_SAMPLE_SIZE = 50
+TIME_DIRECTIVES = ("%H", "%I", "%M", "%S", "%f", "%p")
+# In compact mode a key column becomes categorical when at most this share of its values is distinct.
+CATEGORY_MAX_DISTINCT_RATIO = 0.5
+
+def _split_date_time_format(date_format: str) -> Optional[tuple[str, str]]:
+    """("%m/%d/%Y", "%H:%M") for "%m/%d/%Y %H:%M"; None unless the format is a date part, one space and a time part."""
+    day_format, separator, time_format = date_format.partition(" ")
+    if not separator or " " in time_format:
+        return None
+    if any(directive in TIME_DIRECTIVES for directive in re.findall(r"%.", day_format)):
+        return None
+    time_directives = re.findall(r"%.", time_format)
+    if not time_directives or any(directive not in TIME_DIRECTIVES for directive in time_directives):
+        return None
+    return day_format, time_format
+
+
 class MetricsService(metaclass=Caching):
-    def __init__(self, metrics_repository: MetricsRepository, cache_service: CacheService, cache_df_ttl_seconds: int):
-        self.metrics_repository: MetricsRepository = metrics_repository
+    def __init__(self, metrics_repository: Union[MetricsRepository, AsyncMetricsRepository], cache_service: CacheService, cache_df_ttl_seconds: int, compact_dtypes: Optional[bool] = None):
+        # Synchronous repositories are read in a thread pool, so fetches never block the event loop.
+        self.metrics_repository: AsyncMetricsRepository = as_async_metrics_repository(metrics_repository)
         self.invoice_no: str = "invoiceno"
         self.stock_code: str = "stockcode"
         self.description: str = "description"
@@ -28,31 +58,141 @@ class MetricsService(metaclass=Caching):
         self.customer_id: str = "customerid"
         self.country: str = "country"
         self.total_price: str = "total_price"
-        
+        # Compact mode: keys that repeat are stored as categoricals; summed measures keep float64,
+        # since float32 sums would round differently.
+        self.compact_dtypes: bool = settings.METRICS_COMPACT_DTYPES if compact_dtypes is None else compact_dtypes
+        self.category_columns: tuple[str, ...] = (self.country, self.stock_code, self.customer_id, self.invoice_no, self.description)
+        self.summed_columns: tuple[str, ...] = (self.quantity, self.total_price)
+
         self.cache_service = cache_service
         self.df_cache_key = "metrics:clean_dataframe"
+        # Cached results of the public methods are derived from this frame.
+        self.cache_depends_on = (self.df_cache_key,)
         self.cache_df_ttl_seconds = cache_df_ttl_seconds
+        self._clean_data_frame_loader: Callable[[], Awaitable[DataFrame]] | None = None
         
         
     def _clean_and_convert_to_numeric(self, series: pd.Series) -> Series:
         """
-        Cleans a pandas Series by removing commas and stripping whitespace,
-        then converts it to a numeric type. Non-convertible values become 0.
+        Converts a column to float64. Values that are missing or not finite numbers
+        (after removing thousands separators and whitespace) become 0, and how many
+        there were is logged.
         """
-        cleaned = series.astype(str).str.replace(",", "").str.strip()
+        numeric, coerced = self._convert_to_numeric(series)
+        if coerced:
+            logger.warning(f"Set {coerced} missing or non-numeric values of {series.name!r} to 0")
+        return numeric
 
-        numeric = pd.to_numeric(cleaned, errors="coerce")
+    def _convert_to_numeric(self, series: pd.Series) -> tuple[Series, int]:
+        """
+        Returns the float64 column and the number of values coerced to 0.
+        Numeric columns skip string work entirely. Text columns are only stripped of
+        separators up front when a sample of them contains any; otherwise they are parsed
+        directly and just the values that fail to parse are cleaned and retried.
+        """
+        if pd.api.types.is_numeric_dtype(series.dtype):
+            values = series.to_numpy(dtype=float, na_value=np.nan)
+        else:
+            has_separators = series.head(NUMERIC_SAMPLE_SIZE).astype(str).str.contains(",", regex=False).any()
+            parsed = pd.to_numeric(self._strip_separators(series) if has_separators else series, errors="coerce")
+            if not has_separators:
+                failed = parsed.isna() & series.notna()
+                if failed.any():
+                    parsed = parsed.astype(float)
+                    parsed[failed] = pd.to_numeric(self._strip_separators(series[failed]), errors="coerce")
+            values = parsed.to_numpy(dtype=float, na_value=np.nan)
 
-        numeric = numeric.replace([pd.NA, pd.NaT], np.nan)
-        try:
-            mask_finite = np.isfinite(numeric.values)
-            numeric.loc[~mask_finite] = np.nan
-        except Exception:
-            numeric = numeric.replace([np.inf, -np.inf, float('inf'), -float('inf')], np.nan)
+        finite = np.isfinite(values)
+        coerced = len(values) - int(finite.sum())
+        if coerced:
+            values = np.where(finite, values, 0.0)
+        return pd.Series(values, index=series.index, name=series.name), coerced
 
-        numeric = numeric.fillna(0.0)
-        return numeric.astype(float)
+    @staticmethod
+    def _strip_separators(series: pd.Series) -> Series:
+        # to_numeric already skips surrounding whitespace; non-string values are kept as they are.
+        text = series if pd.api.types.is_string_dtype(series.dtype) else series.astype(str)
+        stripped = text.str.replace(",", "", regex=False)
+        return stripped.where(stripped.notna(), series)
     
+    def _parse_dates(self, series: pd.Series) -> Series:
+        """
+        Parses a date column; unparseable values become NaT. Each distinct value is parsed
+        once (dates repeat for every line of an invoice), with the format detected from a
+        sample; only the values that do not match it fall back to per-value inference.
+        """
+        if pd.api.types.is_datetime64_any_dtype(series.dtype):
+            return series
+        start = time.perf_counter()
+        codes, uniques = pd.factorize(series)
+        unique_values = pd.Series(uniques, dtype=object)
+        factorized = time.perf_counter()
+        date_format = self._detect_date_format(unique_values)
+        detected = time.perf_counter()
+
+        if date_format:
+            parsed = self._parse_with_format(unique_values, date_format)
+        else:
+            parsed = pd.Series(pd.NaT, index=unique_values.index, dtype="datetime64[ns]")
+        parsed_at = time.perf_counter()
+
+        failed = parsed.isna()
+        if failed.any():
+            parsed[failed] = pd.to_datetime(unique_values[failed].astype(str), format="mixed", errors="coerce")
+        fallback_at = time.perf_counter()
+
+        # Missing values have code -1, which the fill turns into NaT.
+        dates = pd.Series(parsed.array.take(codes, allow_fill=True), index=series.index, name=series.name)
+        logger.info(
+            f"Parsed {len(series)} {series.name!r} values ({len(unique_values)} distinct, format {date_format}): "
+            f"distinct {(factorized - start) * 1000:.0f} ms, detect {(detected - factorized) * 1000:.0f} ms, parse {(parsed_at - detected) * 1000:.0f} ms, "
+            f"fallback {(fallback_at - parsed_at) * 1000:.0f} ms ({int(failed.sum())} values), "
+            f"expand {(time.perf_counter() - fallback_at) * 1000:.0f} ms"
+        )
+        return dates
+
+    def _parse_with_format(self, values: pd.Series, date_format: str) -> Series:
+        """
+        Parses distinct values with `date_format`. When it is a date format and a time format
+        separated by a space, each part is parsed once per distinct part (a year of invoices
+        has a few hundred days and at most 1440 minutes) and the two are added up.
+        """
+        split_format = _split_date_time_format(date_format)
+        if split_format is None or values.empty:
+            return pd.to_datetime(values, format=date_format, errors="coerce")
+        day_format, time_format = split_format
+        texts = values.astype(str).tolist()
+        day_codes, day_uniques = pd.factorize(np.asarray([text.partition(" ")[0] for text in texts], dtype=object))
+        time_codes, time_uniques = pd.factorize(np.asarray([text.partition(" ")[2] for text in texts], dtype=object))
+        days = pd.to_datetime(pd.Series(day_uniques, dtype=object), format=day_format, errors="coerce").to_numpy()
+        times = pd.to_datetime(pd.Series(time_uniques, dtype=object), format=time_format, errors="coerce")
+        offsets = (times - times.dt.normalize()).to_numpy()
+        parsed = pd.Series(days[day_codes] + offsets[time_codes], index=values.index)
+        # Values the split does not fit (e.g. repeated spaces) get the whole format.
+        failed = parsed.isna()
+        if failed.any():
+            parsed[failed] = pd.to_datetime(values[failed], format=date_format, errors="coerce")
+        return parsed
+
+    def _detect_date_format(self, values: pd.Series) -> Optional[str]:
+        """The strftime format, among those guessed for a sample of `values`, that parses most of the sample."""
+        sample = values.head(DATE_SAMPLE_SIZE).astype(str)
+        candidates: List[str] = []
+        with warnings.catch_warnings():
+            # guess_datetime_format warns when it picks day-first without being asked to.
+            warnings.simplefilter("ignore", UserWarning)
+            for value in sample:
+                for dayfirst in (False, True):
+                    guessed = guess_datetime_format(value, dayfirst=dayfirst)
+                    if guessed and guessed not in candidates:
+                        candidates.append(guessed)
+        best, best_parsed = None, 0
+        for candidate in candidates:
+            parsed = int(pd.to_datetime(sample, format=candidate, errors="coerce").notna().sum())
+            if parsed > best_parsed:
+                best, best_parsed = candidate, parsed
+        return best
+
     @excluded_from_cache
     def _process_dataframe(self, df: DataFrame) -> DataFrame:
         """Processes the raw dataframe by cleaning, transforming, and adding columns."""
@@ -66,7 +206,7 @@ class MetricsService(metaclass=Caching):
         df[self.unit_price] = self._clean_and_convert_to_numeric(df[self.unit_price])
 
         # Parse dates safely; coerce invalid parse to NaT and drop those rows
-        df[self.invoice_date] = pd.to_datetime(df[self.invoice_date], errors="coerce")
+        df[self.invoice_date] = self._parse_dates(df[self.invoice_date])
         if df[self.invoice_date].isna().any():
             logger.warning(f"Found {df[self.invoice_date].isna().sum()} rows with invalid {self.invoice_date}; dropping them")
             df = df[df[self.invoice_date].notna()].copy()
@@ -83,25 +223,159 @@ class MetricsService(metaclass=Caching):
         except Exception as e:
             logger.exception(f"Failed to set index on dataframe using {self.invoice_date}: {e}")
 
+        if self.compact_dtypes:
+            df = self._compact_dtypes(df)
         return df
 
+    @excluded_from_cache
+    def _compact_dtypes(self, df: DataFrame) -> DataFrame:
+        """Compacts the frame's columns (see `_compact_columns`) and logs their memory before and after."""
+        df, report = self._compact_columns(df)
+        if report:
+            before = sum(used for used, _ in report.values())
+            after = sum(used for _, used in report.values())
+            details = ", ".join(f"{column} {used / 2**20:.1f} -> {compact / 2**20:.1f} MB" for column, (used, compact) in report.items())
+            logger.info(f"Compacted {len(report)} columns from {before / 2**20:.1f} MB to {after / 2**20:.1f} MB: {details}")
+        return df
+
+    @excluded_from_cache
+    def _compact_columns(self, df: DataFrame) -> tuple[DataFrame, Dict[str, tuple[int, int]]]:
+        """
+        Returns the frame with its low-cardinality key columns as categoricals and its numeric
+        columns downcast where every value stays the same, and the bytes each converted column
+        used before and after.
+        """
+        report: Dict[str, tuple[int, int]] = {}
+        for column in df.columns:
+            series = df[column]
+            if column in self.category_columns:
+                compact = self._to_categorical(series)
+            elif column not in self.summed_columns:
+                compact = self._downcast_numeric(series)
+            else:
+                compact = None
+            if compact is not None:
+                report[column] = (int(series.memory_usage(index=False, deep=True)), int(compact.memory_usage(index=False, deep=True)))
+                df[column] = compact
+        return df, report
+
+    @staticmethod
+    def _to_categorical(series: pd.Series) -> Optional[Series]:
+        """The column as a categorical with sorted categories (so groups come out in the same order), or None if too many values are distinct."""
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            return None
+        try:
+            codes, categories = pd.factorize(series, sort=True)
+        except TypeError:
+            # Values of mixed types cannot be sorted.
+            return None
+        if len(categories) > CATEGORY_MAX_DISTINCT_RATIO * len(series):
+            return None
+        return pd.Series(pd.Categorical.from_codes(codes, categories), index=series.index, name=series.name)
+
+    @staticmethod
+    def _downcast_numeric(series: pd.Series) -> Optional[Series]:
+        """The column in the smallest numeric dtype that holds every value exactly, or None if that is its own dtype."""
+        if pd.api.types.is_integer_dtype(series.dtype):
+            downcast = pd.to_numeric(series, downcast="integer")
+        elif pd.api.types.is_float_dtype(series.dtype) and series.dtype.itemsize > 4:
+            downcast = series.astype(np.float32)
+            if not np.array_equal(downcast.to_numpy(dtype=np.float64), series.to_numpy(dtype=np.float64), equal_nan=True):
+                return None
+        else:
+            return None
+        return None if downcast.dtype == series.dtype else downcast
+
+    @excluded_from_cache
+    def _append_rows(self, df: DataFrame, new_rows: DataFrame) -> DataFrame:
+        """
+        Appends `new_rows` to `df`. Compacted columns stay compact: categorical ones take the
+        union of both categories and downcast ones are downcast again.
+        """
+        combined = pd.concat([df, new_rows])
+        for column in df.columns:
+            if column not in new_rows.columns or combined[column].dtype == df[column].dtype:
+                continue
+            if isinstance(df[column].dtype, pd.CategoricalDtype):
+                try:
+                    combined[column] = union_categoricals([df[column], new_rows[column].astype("category")], sort_categories=True)
+                    continue
+                except TypeError:
+                    # The new values' categories have another dtype (e.g. all missing).
+                    compact = self._to_categorical(combined[column])
+            else:
+                compact = self._downcast_numeric(combined[column])
+            if compact is not None:
+                combined[column] = compact
+        return combined
+
+    @excluded_from_cache
+    async def load_clean_transactions(self) -> DataFrame:
+        """Reads the transactions from the repository and cleans them, unless it stores them clean already."""
+        df = await self.metrics_repository.get_clean_transactions()
+        if df is not None:
+            return df
+        raw_df = await self.metrics_repository.get_raw_transactions()
+        return await asyncio.to_thread(self._process_dataframe, raw_df)
+
     @excluded_from_cache
     async def warm_up_dataframe_cache(self) -> None:
-        raw_df: DataFrame = self.metrics_repository.get_raw_transactions()
-        df = self._process_dataframe(raw_df)
-        await self.cache_service.set_dataframe(self.df_cache_key, df, self.cache_df_ttl_seconds)
+        """
+        Refreshes the cached clean frame. The source is append-only, so when the cached frame
+        has a watermark only the rows appended since are fetched, cleaned and appended;
+        otherwise (or when the repository cannot resume from the watermark) it is reloaded in full.
+        """
+        if await self._append_new_transactions():
+            return
+        df = await self.metrics_repository.get_clean_transactions()
+        watermark = None
+        if df is None:
+            raw_df, watermark = await self.metrics_repository.get_raw_transactions_with_watermark()
+            df = await asyncio.to_thread(self._process_dataframe, raw_df)
+        stamp = await self.cache_service.set_dataframe(self.df_cache_key, df, self.cache_df_ttl_seconds)
+        if watermark is not None:
+            await self.cache_service.set_dataframe_metadata(self.df_cache_key, stamp.version, watermark.encode(), self.cache_df_ttl_seconds)
+        logger.info(f"Warm-up reloaded {len(df)} rows")
+
+    @excluded_from_cache
+    async def _append_new_transactions(self) -> bool:
+        """Returns False when a full reload is needed."""
+        cached_df, stamp = await self.cache_service.get_dataframe_with_stamp(self.df_cache_key)
+        if cached_df is None or stamp is None:
+            return False
+        watermark = RowWatermark.decode(await self.cache_service.get_dataframe_metadata(self.df_cache_key, stamp.version))
+        if watermark is None:
+            return False
+        result = await self.metrics_repository.get_raw_transactions_after(watermark)
+        if result is None:
+            logger.info("Source rows changed above the watermark; reloading in full")
+            return False
+        new_raw_df, new_watermark = result
+        if new_raw_df.empty:
+            stamp = await self.cache_service.touch_dataframe(self.df_cache_key, self.cache_df_ttl_seconds)
+            if stamp is None:
+                return False
+        else:
+            df = await asyncio.to_thread(lambda: self._append_rows(cached_df, self._process_dataframe(new_raw_df)))
+            stamp = await self.cache_service.set_dataframe(self.df_cache_key, df, self.cache_df_ttl_seconds)
+        await self.cache_service.set_dataframe_metadata(self.df_cache_key, stamp.version, new_watermark.encode(), self.cache_df_ttl_seconds)
+        logger.info(f"Warm-up appended {len(new_raw_df)} new rows after row {watermark.rows}")
+        return True
 
     def _get_clean_data_frame(self) -> Callable[[], Awaitable[DataFrame]]:
         """
         Returns a memoized, decorated, and cached version of the data fetching logic.
         The decorated function is created only once per service instance.
         """
+        if self._clean_data_frame_loader is not None:
+            return self._clean_data_frame_loader
+
         @self.cache_service.cache_dataframe(key=self.df_cache_key, ttl_seconds=self.cache_df_ttl_seconds)
         async def _fetch_and_clean_dataframe() -> DataFrame:
             """This function contains the actual data processing logic."""
-            raw_df: DataFrame = self.metrics_repository.get_raw_transactions()
-            return self._process_dataframe(raw_df)
+            return await self.load_clean_transactions()
         
+        self._clean_data_frame_loader = _fetch_and_clean_dataframe
         return _fetch_and_clean_dataframe
     
     @excluded_from_cache
@@ -162,7 +436,7 @@ class MetricsService(metaclass=Caching):
         df: DataFrame = await self.get_clean_data_frame()
 
         top_countries_df = (
-            df.groupby(self.country)
+            df.groupby(self.country, observed=True)
             .agg(revenue=(self.total_price, "sum"), products_sold=(self.quantity, "sum"))
             .sort_values(
                 by=countries_params.sort_value.value, ascending=countries_params.ascending
@@ -175,6 +449,8 @@ class MetricsService(metaclass=Caching):
             for country, row in top_countries_df.iterrows()
         ]
     
+    # Unknown countries (typos, crawlers) are remembered briefly instead of filtering the frame every time.
+    @cached(negative=(CountryNotFoundException,))
     async def get_top_country_by_name(self, country_name: str) -> TopCountryRevenue | None:
         if country_name is None or country_name.strip() == "":
             raise BadRequestException("Country name is required")
@@ -183,7 +459,7 @@ class MetricsService(metaclass=Caching):
         condition = df[self.country] == country_name
         top_country_df = (
             df[condition]
-            .groupby(self.country)
+            .groupby(self.country, observed=True)
             .agg(revenue=(self.total_price, "sum"), products_sold=(self.quantity, "sum"))
             .sort_values(by="revenue", ascending=False)
             .head(1)
@@ -12,7 +12,7 @@ class ProductService(MetricsService):
     async def get_top_sellers(self, products_metrics_params: ProductMetricsParams): 
         df: DataFrame = await self.get_clean_data_frame()
         top_cellers = (
-            df.groupby(self.stock_code)
+            df.groupby(self.stock_code, observed=True)
             .agg(
                 total_revenue=(self.total_price, "sum"),
                 total_units_sold=(self.quantity, "sum")
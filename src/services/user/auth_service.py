@@ -1,17 +1,20 @@
 from src.database.models.user import User
-from src.repositories.impl.user_repository_sql_alchemy import UserRepository
+from src.repositories.impl.user_repository_sql_alchemy import UserRepository, USERS_TABLE
 from src.schemas.user import RegisterUserDTO, LoginUserDTO, UserDTO
 from fastapi import Response
 from src.exceptions.user_exceptions import *
 from src.services.cookie_service import CookieService
+from src.services.cache_service import CacheService
+from typing import Optional
 import bcrypt
 
 class AuthService():
-    def __init__(self, user_repository:UserRepository, cookie_service: CookieService):
+    def __init__(self, user_repository:UserRepository, cookie_service: CookieService, cache_service: Optional[CacheService] = None):
         self.user_repository = user_repository
         self.cookie_service = cookie_service
+        self.cache_service = cache_service
         
-    def register(self, register_user_dto: RegisterUserDTO, response: Response) -> User:
+    async def register(self, register_user_dto: RegisterUserDTO, response: Response) -> User:
         if self.user_repository.user_does_exist(register_user_dto.username):
             raise UserAlreadyExists()
         
@@ -21,6 +24,8 @@ class AuthService():
 
         new_user = User(username=register_user_dto.username, password=password_hashed.decode('utf-8'))
         user_saved = self.user_repository.save(new_user)
+        if self.cache_service is not None:
+            await self.cache_service.bump_table_version(USERS_TABLE)
         self.cookie_service.set_cookie(response, user_saved)
         return user_saved
 
@@ -1,6 +1,7 @@
-from src.repositories.impl.user_repository_sql_alchemy import UserRepository
+from src.repositories.impl.user_repository_sql_alchemy import UserRepository, USERS_TABLE
 from src.schemas.pagination import PageParams, PageResponse
-from src.aspects.decorators import excluded_from_cache
+from src.schemas.user import UserDTO
+from src.aspects.decorators import cached, excluded_from_cache
 from src.services.cookie_service import CookieService
 from src.services.cache_service import CacheService
 from src.services.user.auth_service import AuthService
@@ -12,24 +13,35 @@ from fastapi import Request
 
 
 class UserService(metaclass=Caching):
+    cache_depends_on_tables = (USERS_TABLE,)
+
     def __init__(self, user_repository:UserRepository, cookie_service: CookieService, cache_service: Optional[CacheService] = None, auth_service: Optional[AuthService] = None):
         self.user_repository = user_repository
         self.cookie_service = cookie_service
         self.cache_service = cache_service
             
     @excluded_from_cache
-    def delete_all(self):
+    async def delete_all(self):
         self.user_repository.delete_all()
+        if self.cache_service is not None:
+            await self.cache_service.bump_table_version(USERS_TABLE)
 
-    def get_current_user(self, request: Request):
+    @excluded_from_cache
+    async def get_current_user(self, request: Request) -> UserDTO:
+        # Not cached itself (the Request differs on every call); the lookup goes through
+        # the cached get_user_by_id.
         user_id = self.cookie_service.get_user_id_from_token(request)
-        return self.get_user_by_id(user_id)
+        return await self.get_user_by_id(user_id)
 
-    def get_user_by_id(self, id: str) -> User:
+    # Not-found lookups are cached too: a registration bumps the user table version,
+    # so a new user is found at once in every worker.
+    @cached(negative=(UserNotFound,))
+    async def get_user_by_id(self, id: str) -> UserDTO:
+        # Returns the DTO rather than the model, so the password hash is never cached.
         user = self.user_repository.get_by_id(id)
         if not user:
             raise UserNotFound(detail=f"User with id {id} not found")
-        return user
+        return UserDTO.model_validate(user)
 
     def list_users(self, params: PageParams) -> PageResponse:
         limit = params.limit
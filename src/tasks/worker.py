@@ -1,9 +1,13 @@
 import asyncio
 import logging
 import random
+import threading
+from typing import Optional
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown
 from src.services.metrics.metrics_service import MetricsService
 from src.core.config import settings
+from src.core.redis_pool import init_redis_pool, close_redis_pool
 from src.dependencies.tasks import get_metrics_service_instance
 
 logging.basicConfig(level=logging.INFO)
@@ -15,6 +19,47 @@ celery_app = Celery(
     backend=settings.CELERY_RESULT_BACKEND
 )
 
+# Pooled connections belong to the event loop that opened them, so each worker process
+# runs one loop (and one Redis pool) in a dedicated thread for its whole life. Tasks from
+# any pool (prefork, solo, or threads running several tasks at once) submit coroutines to it.
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+_worker_loop_thread: Optional[threading.Thread] = None
+_worker_loop_lock = threading.Lock()
+
+def _start_worker_loop() -> asyncio.AbstractEventLoop:
+    global _worker_loop, _worker_loop_thread
+    with _worker_loop_lock:
+        if _worker_loop is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="celery-event-loop", daemon=True)
+            thread.start()
+            _worker_loop, _worker_loop_thread = loop, thread
+            init_redis_pool()
+        return _worker_loop
+
+@worker_process_init.connect
+def init_worker_process(**_kwargs):
+    _start_worker_loop()
+
+@worker_process_shutdown.connect
+def shutdown_worker_process(**_kwargs):
+    global _worker_loop, _worker_loop_thread
+    with _worker_loop_lock:
+        loop, thread = _worker_loop, _worker_loop_thread
+        _worker_loop = _worker_loop_thread = None
+    if loop is None:
+        return
+    asyncio.run_coroutine_threadsafe(close_redis_pool(), loop).result(timeout=10)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=10)
+    loop.close()
+
+def _run(coro):
+    """Runs `coro` on the worker loop and waits for its result; task threads may call it concurrently."""
+    # The solo/threads pools do not send worker_process_init.
+    loop = _worker_loop or _start_worker_loop()
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
 async def _warm_up_cache_async():
     """Helper async function to be called from the sync Celery task."""
     metrics_service: MetricsService = await get_metrics_service_instance()
@@ -28,7 +73,7 @@ def warm_up_dataframe_cache(self):
     """
     try:
         logger.info("Executing task: warm_up_dataframe_cache")
-        asyncio.run(_warm_up_cache_async())
+        _run(_warm_up_cache_async())
         logger.info("Task warm_up_dataframe_cache finished.")
     except Exception as exc:
         logger.error(f"Task warm_up_dataframe_cache failed: {exc}")
@@ -0,0 +1,68 @@
+from src.aspects.caching import Caching
+from src.aspects.decorators import cached, excluded_from_cache
+from src.services.cache_service import CacheService
+from src.services.cache.local_dataframe_cache import LocalDataFrameCache
+from src.services.cache.single_flight import SingleFlight
+
+
+class RecordingCacheService:
+    def __init__(self):
+        self.plans = []
+
+    async def call_cached(self, plan, instance, *args, **kwargs):
+        self.plans.append(plan)
+        return await plan.func(instance, *args, **kwargs)
+
+
+class Service(metaclass=Caching):
+    def __init__(self, cache_service):
+        self.cache_service = cache_service
+
+    async def get_total(self, limit: int) -> int:
+        return limit * 2
+
+    @cached(ttl=30, key=lambda country_name: country_name.lower())
+    async def get_country(self, country_name: str) -> str:
+        return country_name
+
+    @excluded_from_cache
+    async def warm_up(self) -> str:
+        return "warm"
+
+
+async def test_plan_is_built_once_per_method():
+    cache_service = RecordingCacheService()
+    service = Service(cache_service)
+
+    assert await service.get_total(2) == 4
+    assert await service.get_total(3) == 6
+    first, second = cache_service.plans
+
+    assert first is second
+    assert first.family == "Service.get_total"
+    assert first.build_key(3).startswith("Service.get_total:")
+
+
+async def test_cached_policy_sets_ttl_and_key():
+    cache_service = RecordingCacheService()
+    await Service(cache_service).get_country("France")
+    [plan] = cache_service.plans
+
+    assert plan.ttl == 30
+    assert plan.build_key("FRANCE") == "Service.get_country:france"
+
+
+async def test_excluded_methods_and_missing_cache_service_bypass_the_cache():
+    cache_service = RecordingCacheService()
+    assert await Service(cache_service).warm_up() == "warm"
+    assert cache_service.plans == []
+    assert await Service(None).get_total(1) == 2
+
+
+async def test_policy_ttl_is_used_when_storing(fake_redis):
+    cache_service = CacheService(fake_redis, local_cache=LocalDataFrameCache(0))
+    cache_service.single_flight = SingleFlight()
+
+    assert await Service(cache_service).get_country("France") == "France"
+    assert await Service(cache_service).get_country("france") == "France"
+    assert fake_redis.ttls["cache:v0:Service.get_country:france"] == 30
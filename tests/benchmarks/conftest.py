@@ -0,0 +1,12 @@
+from pathlib import Path
+import pytest
+
+BENCHMARKS_DIR = Path(__file__).parent
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(items):
+    """Marks every test in this directory as a benchmark; the default run deselects them."""
+    for item in items:
+        if BENCHMARKS_DIR in item.path.parents:
+            item.add_marker(pytest.mark.benchmark)
@@ -0,0 +1,64 @@
+"""
+Loading and cleaning a synthetic multi-million-row transactions CSV with the old bare
+`pd.read_csv` (every dtype inferred, then converted again by `_process_dataframe`) against
+the schema-driven loader with each parser, and chunked.
+Run with `poetry run pytest tests/benchmarks -m benchmark -s` to see the numbers.
+"""
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import MagicMock
+from src.repositories.impl.metrics_repository_local import MetricsRepositoryLocal, pa_csv
+from src.services.cache_service import CacheService
+from src.services.metrics.metrics_service import MetricsService
+
+ROWS = 2_000_000
+ITEMS_PER_INVOICE = 5
+
+
+@pytest.fixture(scope="module")
+def large_csv(tmp_path_factory):
+    rng = np.random.default_rng(7)
+    invoices = ROWS // ITEMS_PER_INVOICE
+    seconds = np.sort(rng.integers(0, 365 * 86400, invoices))
+    invoice_dates = (pd.Timestamp("2010-12-01") + pd.to_timedelta(seconds, unit="s")).strftime("%-m/%-d/%Y %-H:%M")
+    customers = rng.integers(12000, 18000, ROWS).astype(str)
+    customers[rng.random(ROWS) < 0.25] = ""
+    df = pd.DataFrame({
+        "InvoiceNo": np.repeat((536365 + np.arange(invoices)).astype(str), ITEMS_PER_INVOICE),
+        "StockCode": rng.integers(10000, 99999, ROWS).astype(str),
+        "Description": np.array(["WHITE HANGING HEART", "HAND WARMER", "CREAM CUPID HEARTS"])[rng.integers(0, 3, ROWS)],
+        "Quantity": rng.integers(1, 50, ROWS),
+        "InvoiceDate": np.repeat(np.asarray(invoice_dates), ITEMS_PER_INVOICE),
+        "UnitPrice": rng.uniform(0.5, 20, ROWS).round(2),
+        "CustomerID": customers,
+        "Country": np.array(["United Kingdom", "France", "Germany"])[rng.integers(0, 3, ROWS)],
+    })
+    path = tmp_path_factory.mktemp("csv") / "transactions.csv"
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+def _timed(load) -> tuple[float, pd.DataFrame]:
+    service = MetricsService(None, MagicMock(spec=CacheService), cache_df_ttl_seconds=600)
+    start = time.perf_counter()
+    df = service._process_dataframe(load())
+    return time.perf_counter() - start, df
+
+
+def test_typed_loader_speeds_up_load_and_clean(large_csv):
+    bare_seconds, bare = _timed(lambda: pd.read_csv(large_csv, encoding="utf-8"))
+    timings = {}
+    engines = [("c", 0), ("c", 500_000)] + ([("pyarrow", 0)] if pa_csv is not None else [])
+    for engine, chunk_rows in engines:
+        seconds, df = _timed(lambda: MetricsRepositoryLocal(large_csv, engine=engine, chunk_rows=chunk_rows).get_raw_transactions())
+        timings[f"{engine}{f' chunks of {chunk_rows}' if chunk_rows else ''}"] = seconds
+        pd.testing.assert_series_equal(df["invoicedate"], bare["invoicedate"])
+        pd.testing.assert_series_equal(df["total_price"], bare["total_price"])
+        assert len(df) == ROWS
+
+    print(f"\nbare read_csv: {bare_seconds * 1000:.0f} ms ({ROWS} rows)")
+    for name, seconds in timings.items():
+        print(f"typed loader ({name}): {seconds * 1000:.0f} ms")
+    assert min(timings.values()) < bare_seconds
@@ -0,0 +1,48 @@
+"""
+Encode/decode time and payload size of the DataFrame cache formats.
+Run with `poetry run pytest tests/benchmarks -m benchmark -s` to see the numbers.
+"""
+import time
+import numpy as np
+import pandas as pd
+from src.services.cache.dataframe_codec import DataFrameFormat, encode_dataframe, decode_dataframe
+
+ROWS = 100_000
+
+
+def _synthetic_clean_df(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(42)
+    dates = pd.Timestamp("2010-12-01") + pd.to_timedelta(rng.integers(0, 365 * 24 * 60, rows), unit="min")
+    df = pd.DataFrame({
+        "invoiceno": rng.integers(536000, 580000, rows).astype(str),
+        "stockcode": rng.integers(10000, 90000, rows).astype(str),
+        "description": rng.choice(["WHITE HANGING HEART", "REGENCY CAKESTAND", "JUMBO BAG RED"], rows),
+        "quantity": rng.integers(1, 50, rows).astype(float),
+        "invoicedate": dates,
+        "unitprice": rng.random(rows) * 10,
+        "customerid": rng.integers(12000, 18000, rows).astype(str),
+        "country": rng.choice(["United Kingdom", "France", "Germany", "EIRE"], rows),
+    })
+    df["total_price"] = df["quantity"] * df["unitprice"]
+    return df.set_index("invoicedate", drop=False)
+
+
+def _measure(df: pd.DataFrame, fmt: DataFrameFormat) -> tuple[float, float, int]:
+    start = time.perf_counter()
+    payload = encode_dataframe(df, fmt)
+    encoded = time.perf_counter()
+    decode_dataframe(payload)
+    decoded = time.perf_counter()
+    return encoded - start, decoded - encoded, len(payload)
+
+
+def test_binary_format_beats_json():
+    df = _synthetic_clean_df(ROWS)
+    results = {fmt: _measure(df, fmt) for fmt in DataFrameFormat}
+
+    for fmt, (encode_s, decode_s, size) in results.items():
+        print(f"\n{fmt.value:>6}: encode={encode_s * 1000:8.1f}ms decode={decode_s * 1000:8.1f}ms size={size / 1024:10.1f}KiB")
+
+    json_size = results[DataFrameFormat.JSON][2]
+    assert results[DataFrameFormat.ARROW][2] < json_size
+    assert results[DataFrameFormat.PICKLE][2] < json_size
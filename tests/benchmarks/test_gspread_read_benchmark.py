@@ -0,0 +1,58 @@
+"""
+Reading the transactions sheet offline through a fake gspread client: building the frame
+from per-row records (the old `get_all_records()` path) against raw 2-D values, and one
+sequential read against row ranges fetched concurrently when each request has API latency.
+Run with `poetry run pytest tests/benchmarks -m benchmark -s` to see the numbers.
+"""
+import random
+import time
+from gspread.utils import to_records
+from pandas import DataFrame
+from src.repositories.impl.metrics_repository_gspread import MetricsRepositoryGspread
+from tests.conftest import FakeGspreadClient, FakeWorksheet
+
+ROWS = 100_000
+HEADER = ["InvoiceNo", "StockCode", "Description", "Quantity", "InvoiceDate", "UnitPrice", "CustomerID", "Country"]
+
+
+def _sheet(rows: int, latency: float = 0.0) -> FakeWorksheet:
+    rng = random.Random(7)
+    values = [HEADER] + [
+        [str(536365 + i // 5), f"{rng.randint(10000, 99999)}", "WHITE HANGING HEART", str(rng.randint(1, 50)),
+         "12/1/2010 8:26", f"{rng.uniform(0.5, 20):.2f}", str(rng.randint(12000, 18000)) if i % 4 else "", "United Kingdom"]
+        for i in range(rows)
+    ]
+    return FakeWorksheet(values, latency=latency)
+
+
+def test_raw_values_build_the_frame_faster_than_records():
+    sheet = _sheet(ROWS)
+
+    start = time.perf_counter()
+    values = sheet.get_all_values()
+    records = DataFrame(to_records(values[0], values[1:]))
+    records_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    raw = MetricsRepositoryGspread(FakeGspreadClient(sheet)).get_raw_transactions()
+    raw_seconds = time.perf_counter() - start
+
+    print(f"\nrecords: {records_seconds * 1000:.1f} ms, raw 2-D values: {raw_seconds * 1000:.1f} ms ({ROWS} rows)")
+    assert raw.shape == records.shape
+    assert raw_seconds < records_seconds
+
+
+def test_concurrent_ranges_overlap_request_latency():
+    sheet = _sheet(ROWS, latency=0.05)
+    sheet._row_count = ROWS + 1
+
+    timings = {}
+    for workers in (1, 4):
+        repository = MetricsRepositoryGspread(FakeGspreadClient(sheet), range_rows=ROWS // 8, fetch_workers=workers)
+        start = time.perf_counter()
+        df = repository.get_raw_transactions()
+        timings[workers] = time.perf_counter() - start
+        assert len(df) == ROWS
+
+    print(f"\n9 ranges with 50 ms latency: sequential {timings[1] * 1000:.1f} ms, 4 workers {timings[4] * 1000:.1f} ms")
+    assert timings[4] < timings[1]
@@ -0,0 +1,96 @@
+"""
+Latency of a metrics request answered from the cache when every request builds its own
+gspread client (the old `get_metrics_repository`) against the lazy, once-per-process client.
+Credentials are a generated service-account key, so client creation does its real parsing
+work offline. Run with `poetry run pytest tests/benchmarks -m benchmark -s` to see the numbers.
+"""
+import asyncio
+import json
+import time
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi.testclient import TestClient
+from src.core.config import settings
+from src.dependencies import gspread_client
+from src.dependencies.repositories_di import get_metrics_repository
+from src.dependencies.services_di import get_cache_backend
+from src.main import app
+from src.repositories.impl.metrics_repository_gspread import MetricsRepositoryGspread
+from src.repositories.impl.metrics_repository_gspread import _to_dataframe
+from src.services.cache.impl.memory_cache_backend import MemoryCacheBackend
+from src.services.cache.local_dataframe_cache import LocalDataFrameCache
+from src.services.cache_service import CacheService
+from src.services.metrics.metrics_service import MetricsService
+
+REQUESTS = 50
+
+
+@pytest.fixture
+def service_account_file(tmp_path, monkeypatch):
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption())
+    path = tmp_path / "service_account.json"
+    path.write_text(json.dumps({
+        "type": "service_account",
+        "project_id": "benchmark",
+        "private_key_id": "benchmark",
+        "private_key": pem.decode(),
+        "client_email": "benchmark@example.iam.gserviceaccount.com",
+        "client_id": "",
+        "token_uri": "https://oauth2.googleapis.com/token",
+    }))
+    monkeypatch.setattr(settings, "GOOGLE_APPLICATION_CREDENTIALS", str(path))
+    gspread_client.reset_gspread_client()
+    yield path
+    gspread_client.reset_gspread_client()
+
+
+@pytest.fixture
+def cached_backend(transactions_sheet):
+    backend = MemoryCacheBackend(64 * 1024 * 1024)
+    service = MetricsService(None, CacheService(backend, local_cache=LocalDataFrameCache(0)), cache_df_ttl_seconds=600)
+    df = service._process_dataframe(_to_dataframe(transactions_sheet.values[0], transactions_sheet.values[1:]))
+    asyncio.run(service.cache_service.set_dataframe(service.df_cache_key, df, 600))
+    app.dependency_overrides[get_cache_backend] = lambda: backend
+    yield backend
+    app.dependency_overrides.clear()
+
+
+def _request_latencies(client: TestClient) -> list[float]:
+    latencies = []
+    for _ in range(REQUESTS):
+        start = time.perf_counter()
+        assert client.get("/analysis/kpi_summary").status_code == 200
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def test_lazy_client_keeps_cache_hits_off_the_credentials_path(service_account_file, cached_backend, monkeypatch):
+    created = []
+    create = gspread_client.create_gspread_client
+    monkeypatch.setattr(gspread_client, "create_gspread_client", lambda: created.append(1) or create())
+
+    with TestClient(app) as client:
+        app.dependency_overrides[get_metrics_repository] = lambda: MetricsRepositoryGspread(gspread_client.create_gspread_client())
+        eager = _request_latencies(client)
+        eager_clients = len(created)
+
+        del app.dependency_overrides[get_metrics_repository]
+        created.clear()
+        lazy = _request_latencies(client)
+        lazy_clients = len(created)
+
+        gspread_client.get_gspread_client()
+        gspread_client.get_gspread_client()
+        miss_clients = len(created)
+
+    eager_ms = sum(eager) * 1000 / REQUESTS
+    lazy_cold_ms, lazy_warm_ms = lazy[0] * 1000, sum(lazy[1:]) * 1000 / (REQUESTS - 1)
+    print(f"\nclient per request:  {eager_ms:.3f} ms/request, {eager_clients} clients created")
+    print(f"lazy process client: cold {lazy_cold_ms:.3f} ms, warm {lazy_warm_ms:.3f} ms/request, {lazy_clients} clients created")
+
+    assert eager_clients == REQUESTS
+    assert lazy_clients == 0
+    assert miss_clients == 1
+    assert lazy_warm_ms < eager_ms
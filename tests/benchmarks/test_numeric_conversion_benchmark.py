@@ -0,0 +1,55 @@
+"""
+`MetricsService._clean_and_convert_to_numeric` on a million values, against the previous
+conversion (string-clean every value, then `to_numeric`, `replace` and an `isfinite` pass),
+for an already numeric column, clean numeric text and text with thousands separators.
+Run with `poetry run pytest tests/benchmarks -m benchmark -s` to see the numbers.
+"""
+import time
+from unittest.mock import MagicMock
+import numpy as np
+import pandas as pd
+import pytest
+from src.repositories.metrics_repository import MetricsRepository
+from src.services.cache_service import CacheService
+from src.services.metrics.metrics_service import MetricsService
+
+ROWS = 1_000_000
+
+
+def _previous_conversion(series: pd.Series) -> pd.Series:
+    cleaned = series.astype(str).str.replace(",", "").str.strip()
+    numeric = pd.to_numeric(cleaned, errors="coerce")
+    numeric = numeric.replace([pd.NA, pd.NaT], np.nan)
+    numeric.loc[~np.isfinite(numeric.values)] = np.nan
+    return numeric.fillna(0.0).astype(float)
+
+
+def _columns() -> dict:
+    rng = np.random.default_rng(3)
+    values = rng.uniform(0, 5000, ROWS).round(2)
+    with_separators = pd.Series(values).map("{:,.2f}".format)
+    with_separators[::1000] = "n/a"
+    return {
+        "float64": pd.Series(values),
+        "numeric text": pd.Series(values.astype(str).astype(object)),
+        "text with separators": with_separators,
+    }
+
+
+@pytest.mark.parametrize("kind", ["float64", "numeric text", "text with separators"])
+def test_dtype_aware_conversion(kind):
+    series = _columns()[kind]
+    svc = MetricsService(MagicMock(spec=MetricsRepository), MagicMock(spec=CacheService), cache_df_ttl_seconds=600)
+
+    start = time.perf_counter()
+    expected = _previous_conversion(series)
+    previous_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    out = svc._clean_and_convert_to_numeric(series)
+    seconds = time.perf_counter() - start
+
+    print(f"\n{kind}: previous {previous_seconds * 1000:.1f} ms, dtype-aware {seconds * 1000:.1f} ms")
+    pd.testing.assert_series_equal(out, expected, check_names=False)
+    if kind != "text with separators":
+        assert seconds < previous_seconds
@@ -0,0 +1,52 @@
+"""
+Latency of a cached GET when every request opens its own client (the old
+`get_redis_client`) against a shared pool, measured on a local Redis stand-in.
+Run with `poetry run pytest tests/benchmarks -m benchmark -s` to see the numbers.
+"""
+import asyncio
+import time
+from redis import asyncio as aioredis
+from src.core.redis_pool import create_redis_pool
+
+REQUESTS = 200
+CONCURRENCY = 20
+
+
+async def _per_request(url: str) -> None:
+    client = await aioredis.from_url(url, decode_responses=False)
+    try:
+        await client.get("metrics:clean_dataframe")
+    finally:
+        await client.close()
+
+
+async def _timed_requests(request) -> float:
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def one():
+        async with semaphore:
+            await request()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(REQUESTS)))
+    return time.perf_counter() - start
+
+
+async def test_pooled_client_beats_per_request_client(redis_stand_in):
+    redis_stand_in.store[b"metrics:clean_dataframe"] = b"x" * 1024
+    per_request = await _timed_requests(lambda: _per_request(redis_stand_in.url))
+    per_request_connections = redis_stand_in.connections_accepted
+
+    pool = create_redis_pool(redis_stand_in.url, max_connections=CONCURRENCY)
+    pooled_client = aioredis.Redis(connection_pool=pool)
+    pooled = await _timed_requests(lambda: pooled_client.get("metrics:clean_dataframe"))
+    stats = pool.stats()
+    await pool.disconnect()
+
+    print(f"\nper-request client: {per_request * 1000 / REQUESTS:.3f} ms/request, {per_request_connections} connections")
+    print(f"pooled client:      {pooled * 1000 / REQUESTS:.3f} ms/request, {stats['open_connections']} connections, "
+          f"peak in use {stats['peak_in_use']}, saturated acquisitions {stats['saturated_acquisitions']}")
+
+    assert per_request_connections == REQUESTS
+    assert stats["open_connections"] <= CONCURRENCY
+    assert pooled < per_request
@@ -0,0 +1,52 @@
+"""
+Hit/miss serialization cost of a 4,000-row RFM result: the legacy recursive
+serializer against the compiled per-return-type one.
+Run with `poetry run pytest tests/benchmarks -m benchmark -s` to see the numbers.
+"""
+import json
+import time
+from typing import List
+from src.schemas.metrics import RFMAnalysis, SegmentName
+from src.services.cache_service import CacheService, serializer_registry
+
+ROWS = 4_000
+ROUNDS = 5
+
+
+async def get_rfm_analysis() -> List[RFMAnalysis]: ...
+
+
+def _rfm_rows() -> List[RFMAnalysis]:
+    segments = list(SegmentName)
+    return [
+        RFMAnalysis(recency=i % 5 + 1, frequency=i % 4 + 1, monetary=i % 3 + 1, segment_name=segments[i % len(segments)], total_spend=i * 1.5)
+        for i in range(ROWS)
+    ]
+
+
+def _best_of(func) -> float:
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def test_compiled_serializer_beats_legacy():
+    rows = _rfm_rows()
+    compiled = serializer_registry.for_function(get_rfm_analysis)
+    legacy_payload = CacheService._serialize_value(rows)
+    compiled_payload = compiled.dumps(rows)
+
+    legacy_dump = _best_of(lambda: CacheService._serialize_value(rows))
+    legacy_load = _best_of(lambda: CacheService._deserialize_data(json.loads(legacy_payload), List[RFMAnalysis]))
+    compiled_dump = _best_of(lambda: compiled.dumps(rows))
+    compiled_load = _best_of(lambda: compiled.loads(compiled_payload))
+
+    print(f"\nlegacy:   dump={legacy_dump * 1000:7.2f}ms load={legacy_load * 1000:7.2f}ms")
+    print(f"compiled: dump={compiled_dump * 1000:7.2f}ms load={compiled_load * 1000:7.2f}ms")
+
+    assert compiled.loads(compiled_payload) == rows
+    assert compiled_dump < legacy_dump
+    assert compiled_load < legacy_load
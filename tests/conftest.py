@@ -1,3 +1,6 @@
+import asyncio
+import fnmatch
+import time
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import MagicMock
@@ -34,4 +37,237 @@ def enable_test_mode():
     previous = getattr(settings, "TESTING", False)
     settings.TESTING = True
     yield
-    settings.TESTING = previous
\ No newline at end of file
+    settings.TESTING = previous
+
+class FakeLock:
+    def __init__(self, redis, name, timeout=None):
+        self.redis = redis
+        self.name = name
+        self.timeout = timeout
+
+    async def acquire(self, blocking=None, blocking_timeout=None, token=None):
+        return await self.redis.set(self.name, b"locked", ex=self.timeout, nx=True) is not None
+
+    async def reacquire(self):
+        return True
+
+    async def release(self):
+        await self.redis.delete(self.name)
+
+
+class FakePipeline:
+    """Queues commands and runs them against the FakeRedis on execute()."""
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+        return queue
+
+    async def execute(self):
+        self.redis.pipelines_executed += 1
+        return [await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.commands]
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for `redis.asyncio.Redis` (bytes in, bytes out)."""
+    def __init__(self):
+        self.store = {}
+        self.ttls = {}
+        self.pipelines_executed = 0
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def mget(self, keys):
+        return [self.store.get(key) for key in keys]
+
+    async def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.store:
+            return None
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+        self.store[key] = value
+        self.ttls[key] = ex
+        return True
+
+    async def delete(self, *keys):
+        return sum(1 for key in keys if self.store.pop(key, None) is not None)
+
+    async def incr(self, key):
+        value = int(self.store.get(key, b"0")) + 1
+        self.store[key] = str(value).encode("utf-8")
+        return value
+
+    async def expire(self, key, seconds):
+        if key not in self.store:
+            return False
+        self.ttls[key] = seconds
+        return True
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def unlink(self, *keys):
+        return await self.delete(*keys)
+
+    async def scan_iter(self, match=None, count=None):
+        for key in list(self.store):
+            if match is None or fnmatch.fnmatchcase(key, match.replace("\\", "")):
+                yield key
+
+    def lock(self, name, timeout=None, thread_local=True, **kwargs):
+        return FakeLock(self, name, timeout)
+
+    async def flushdb(self):
+        self.store.clear()
+        self.ttls.clear()
+
+
+@pytest.fixture
+def fake_redis():
+    return FakeRedis()
+
+
+class RedisStandIn:
+    """
+    Tiny RESP server speaking just enough of the protocol (GET/SET/PING, handshake
+    commands acknowledged with OK) to exercise real redis-py connections locally.
+    """
+    def __init__(self):
+        self.store = {}
+        self.connections_accepted = 0
+        self.server = None
+        self._handlers = set()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.sockets[0].getsockname()[:2]
+        return f"redis://{host}:{port}/0"
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self
+
+    async def stop(self):
+        self.server.close()
+        for handler in self._handlers:
+            handler.cancel()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        await self.server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        self.connections_accepted += 1
+        self._handlers.add(asyncio.current_task())
+        try:
+            while True:
+                command = await self._read_command(reader)
+                if command is None:
+                    break
+                writer.write(self._execute(command))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_command(reader):
+        header = await reader.readline()
+        if not header:
+            return None
+        parts = []
+        for _ in range(int(header[1:])):
+            length = int((await reader.readline())[1:])
+            parts.append((await reader.readexactly(length + 2))[:-2])
+        return parts
+
+    def _execute(self, command):
+        name = command[0].upper()
+        if name == b"GET":
+            value = self.store.get(command[1])
+            return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+        if name == b"SET":
+            self.store[command[1]] = command[2]
+        if name == b"PING":
+            return b"+PONG\r\n"
+        return b"+OK\r\n"
+
+
+@pytest.fixture
+async def redis_stand_in():
+    stand_in = await RedisStandIn().start()
+    yield stand_in
+    await stand_in.stop()
+
+
+class FakeWorksheet:
+    """
+    In-memory `sheet1`: `values` is the grid as rows of strings, header first.
+    Reads drop trailing blank cells and rows the way the Sheets API does, are recorded in
+    `reads` and each one takes `latency` seconds, like a round trip to the API.
+    """
+    def __init__(self, values, row_count=None, latency=0.0):
+        self.values = values
+        self._row_count = row_count
+        self.latency = latency
+        self.reads = []
+
+    @property
+    def row_count(self):
+        return self._row_count or len(self.values)
+
+    def get_all_values(self):
+        self.reads.append("all")
+        time.sleep(self.latency)
+        return [list(row) for row in self.values]
+
+    def get(self, cell_range):
+        self.reads.append(cell_range)
+        time.sleep(self.latency)
+        return self._read(cell_range)
+
+    def batch_get(self, ranges):
+        self.reads.append(list(ranges))
+        time.sleep(self.latency)
+        return [self._read(cell_range) for cell_range in ranges]
+
+    def _read(self, cell_range):
+        first, _, last = cell_range.partition(":")
+        rows = [self._trim(row) for row in self.values[int(first) - 1:int(last)]]
+        while rows and not rows[-1]:
+            rows.pop()
+        return rows
+
+    @staticmethod
+    def _trim(row):
+        row = list(row)
+        while row and row[-1] == "":
+            row.pop()
+        return row
+
+
+class FakeGspreadClient:
+    def __init__(self, worksheet):
+        self.worksheet = worksheet
+
+    def open(self, title):
+        return MagicMock(sheet1=self.worksheet)
+
+
+@pytest.fixture
+def transactions_sheet():
+    return FakeWorksheet([
+        ["InvoiceNo", "StockCode", "Description", "Quantity", "InvoiceDate", "UnitPrice", "CustomerID", "Country"],
+        ["536365", "85123A", "WHITE HANGING HEART", "6", "12/1/2010 8:26", "2.55", "17850", "United Kingdom"],
+        ["536366", "22633", "HAND WARMER", "1,000", "12/1/2010 8:28", "1.85", "", "France"],
+    ])
@@ -0,0 +1,49 @@
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from redis import asyncio as aioredis
+from redis.exceptions import ConnectionError
+from src.core import redis_pool
+from src.core.redis_pool import create_redis_pool
+
+
+async def test_pool_reuses_connections_and_reports_saturation(redis_stand_in):
+    pool = create_redis_pool(redis_stand_in.url, max_connections=2)
+    client = aioredis.Redis(connection_pool=pool)
+    await client.set("metrics:clean_dataframe", b"frame")
+
+    values = await asyncio.gather(*(client.get("metrics:clean_dataframe") for _ in range(20)))
+
+    stats = pool.stats()
+    assert values == [b"frame"] * 20
+    assert redis_stand_in.connections_accepted == stats["open_connections"] <= 2
+    assert stats["peak_in_use"] == 2
+    assert stats["in_use"] == 0
+    assert stats["acquisitions"] == 21
+    assert stats["saturated_acquisitions"] > 0
+    await pool.disconnect()
+
+
+async def test_pool_times_out_when_exhausted(redis_stand_in):
+    pool = create_redis_pool(redis_stand_in.url, max_connections=1, timeout=0.05)
+    client = aioredis.Redis(connection_pool=pool)
+    held = await pool.get_connection("GET")
+
+    with pytest.raises(ConnectionError):
+        await client.get("metrics:clean_dataframe")
+
+    assert pool.stats()["timeouts"] == 1
+    await pool.release(held)
+    pool.reset_stats()
+    assert pool.stats()["acquisitions"] == 0
+    await pool.disconnect()
+
+
+def test_lifespan_owns_the_pool():
+    from src.main import app
+
+    with TestClient(app):
+        pool = redis_pool.get_redis_pool()
+        assert pool is not None
+        assert pool.connection_kwargs["decode_responses"] is False
+    assert redis_pool.get_redis_pool() is None
@@ -0,0 +1,19 @@
+from src.dependencies import gspread_client
+
+
+def test_client_is_created_once_per_process(monkeypatch):
+    created = []
+    monkeypatch.setattr(gspread_client, "create_gspread_client", lambda: created.append(object()) or created[-1])
+    gspread_client.reset_gspread_client()
+
+    first = gspread_client.get_gspread_client()
+    assert gspread_client.get_gspread_client() is first
+    assert len(created) == 1
+
+    monkeypatch.setattr(gspread_client, "_client_pid", -1)  # as seen from a forked child
+    assert gspread_client.get_gspread_client() is not first
+
+    gspread_client.reset_gspread_client()
+    gspread_client.get_gspread_client()
+    assert len(created) == 3
+    gspread_client.reset_gspread_client()
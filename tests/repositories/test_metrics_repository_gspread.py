@@ -0,0 +1,70 @@
+from src.repositories.impl.metrics_repository_gspread import MetricsRepositoryGspread
+from tests.conftest import FakeGspreadClient
+
+NEW_ROW = ["536367", "84406B", "CREAM CUPID HEARTS", "8", "12/2/2010 9:00", "2.75", "13047", "United Kingdom"]
+
+
+def test_full_read_returns_strings_and_watermark(transactions_sheet):
+    repository = MetricsRepositoryGspread(FakeGspreadClient(transactions_sheet))
+
+    df, watermark = repository.get_raw_transactions_with_watermark()
+
+    assert list(df.columns) == transactions_sheet.values[0]
+    assert df["Quantity"].tolist() == ["6", "1,000"]
+    assert watermark.rows == 2
+
+
+def test_read_after_watermark_fetches_only_new_rows(transactions_sheet):
+    repository = MetricsRepositoryGspread(FakeGspreadClient(transactions_sheet))
+    _, watermark = repository.get_raw_transactions_with_watermark()
+    transactions_sheet.values.append(NEW_ROW[:-1] + [""])
+    transactions_sheet.values.append(NEW_ROW)
+
+    new_df, new_watermark = repository.get_raw_transactions_after(watermark)
+
+    assert transactions_sheet.reads[-1] == ["1:1", "3:3", "4:5"]
+    assert new_df.values.tolist() == [NEW_ROW[:-1] + [""], NEW_ROW]
+    assert new_watermark.rows == 4
+    assert repository.get_raw_transactions_after(new_watermark)[0].empty
+
+
+def test_read_after_watermark_ignores_blank_grid_rows(transactions_sheet):
+    repository = MetricsRepositoryGspread(FakeGspreadClient(transactions_sheet))
+    _, watermark = repository.get_raw_transactions_with_watermark()
+    transactions_sheet._row_count = 1000
+
+    new_df, new_watermark = repository.get_raw_transactions_after(watermark)
+
+    assert new_df.empty
+    assert new_watermark == watermark
+
+
+def test_changed_header_or_rows_need_a_full_reload(transactions_sheet):
+    repository = MetricsRepositoryGspread(FakeGspreadClient(transactions_sheet))
+    _, watermark = repository.get_raw_transactions_with_watermark()
+
+    transactions_sheet.values[2] = NEW_ROW
+    assert repository.get_raw_transactions_after(watermark) is None
+
+    transactions_sheet.values[:] = transactions_sheet.values[:2]
+    assert repository.get_raw_transactions_after(watermark) is None
+
+    transactions_sheet.values[0] = ["invoice"] + transactions_sheet.values[0][1:]
+    assert repository.get_raw_transactions_after(watermark) is None
+
+
+def test_range_reads_match_a_single_read(transactions_sheet):
+    transactions_sheet.values[1:] = [
+        [] if i in (4, 9) else [str(i), "S", "D", "1", "12/1/2010 8:26", "1.5", str(i) if i % 3 else "", "UK"]
+        for i in range(11)
+    ]
+    transactions_sheet._row_count = 20
+    expected, expected_watermark = MetricsRepositoryGspread(FakeGspreadClient(transactions_sheet)).get_raw_transactions_with_watermark()
+
+    repository = MetricsRepositoryGspread(FakeGspreadClient(transactions_sheet), range_rows=5, fetch_workers=3)
+    df, watermark = repository.get_raw_transactions_with_watermark()
+
+    assert transactions_sheet.reads[1:] == ["1:5", "6:10", "11:15", "16:20"]
+    assert df.equals(expected)
+    assert len(df) == 11 and df.iloc[4].tolist() == [""] * 8
+    assert watermark == expected_watermark
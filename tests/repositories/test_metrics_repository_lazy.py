@@ -0,0 +1,20 @@
+from src.repositories.impl.metrics_repository_gspread import MetricsRepositoryGspread
+from src.repositories.impl.metrics_repository_lazy import MetricsRepositoryLazy
+from tests.conftest import FakeGspreadClient
+
+
+def test_repository_is_built_on_first_read_only(transactions_sheet):
+    built = []
+
+    def factory():
+        built.append(MetricsRepositoryGspread(FakeGspreadClient(transactions_sheet)))
+        return built[-1]
+
+    repository = MetricsRepositoryLazy(factory)
+    assert not repository.is_loaded and built == []
+
+    df, watermark = repository.get_raw_transactions_with_watermark()
+    repository.get_raw_transactions_after(watermark)
+
+    assert len(df) == 2
+    assert len(built) == 1 and repository.repository is built[0]
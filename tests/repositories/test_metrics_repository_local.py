@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.repositories.impl.metrics_repository_local import MetricsRepositoryLocal
+
+CSV = """InvoiceNo,StockCode,Description,Quantity,InvoiceDate,UnitPrice,CustomerID,Country,Extra
+536365,85123A,WHITE HANGING HEART,6,12/1/2010 8:26,2.55,17850,United Kingdom,x
+C536379,D,Discount,-1,12/1/2010 9:41,27.5,14527,United Kingdom,x
+536381,22633,HAND WARMER,12,12/10/2010 10:05,1.85,,France,x
+"""
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text(CSV)
+    return path
+
+
+@pytest.mark.parametrize("engine, chunk_rows", [("pyarrow", 0), ("c", 0), ("c", 2)])
+def test_typed_read_prunes_columns_and_parses_types(csv_path, engine, chunk_rows):
+    df = MetricsRepositoryLocal(str(csv_path), engine=engine, chunk_rows=chunk_rows).get_raw_transactions()
+
+    assert list(df.columns) == ["InvoiceNo", "StockCode", "Description", "Quantity", "InvoiceDate", "UnitPrice", "CustomerID", "Country"]
+    assert df["InvoiceDate"].tolist() == list(pd.to_datetime(["2010-12-01 08:26", "2010-12-01 09:41", "2010-12-10 10:05"]))
+    assert df["Quantity"].dtype == np.float64 and df["Quantity"].tolist() == [6.0, -1.0, 12.0]
+    assert df["InvoiceNo"].tolist() == ["536365", "C536379", "536381"]
+    assert df["CustomerID"].iloc[0] == "17850" and isinstance(df["CustomerID"].iloc[2], float) and np.isnan(df["CustomerID"].iloc[2])
+
+
+def test_dates_in_another_format_fall_back_to_inference(csv_path):
+    csv_path.write_text(CSV.replace("12/10/2010 10:05", "2010-12-10 10:05"))
+
+    df = MetricsRepositoryLocal(str(csv_path), engine="c").get_raw_transactions()
+
+    assert df["InvoiceDate"].iloc[2] == pd.Timestamp("2010-12-10 10:05")
+
+
+@pytest.mark.parametrize("engine", ["pyarrow", "c"])
+def test_file_not_matching_the_schema_is_read_untyped(csv_path, engine):
+    csv_path.write_text(CSV.replace(",6,", ",six,"))
+
+    df = MetricsRepositoryLocal(str(csv_path), engine=engine).get_raw_transactions()
+
+    assert df["Quantity"].tolist() == ["six", "-1", "12"]
+    assert "Extra" in df.columns
+
+
+@pytest.mark.parametrize("engine", ["pyarrow", "c"])
+async def test_customer_ids_match_the_sheet_representation(csv_path, engine, fake_redis):
+    # The untyped read inferred CustomerID as float64 (it has blanks), so the API returned
+    # "17850.0"; read as text it is "17850", as the Google Sheets repository returns it.
+    from src.schemas.metrics import TopSpendersMetricsParams
+    from src.services.cache_service import CacheService
+    from src.services.cache.local_dataframe_cache import LocalDataFrameCache
+    from src.services.metrics.customer_service import CustomerService
+
+    cache = CacheService(fake_redis, df_format="pickle", local_cache=LocalDataFrameCache(0))
+    service = CustomerService(MetricsRepositoryLocal(str(csv_path), engine=engine), cache, cache_df_ttl_seconds=600)
+
+    spenders = await service.get_top_spenders(TopSpendersMetricsParams())
+
+    assert {spender.customer_id for spender in spenders} >= {"17850", "14527"}
@@ -0,0 +1,71 @@
+import json
+from unittest.mock import MagicMock
+import pandas as pd
+import pytest
+from typer.testing import CliRunner
+from src.cli import app as cli
+from src.core.config import settings
+from src.repositories.impl.metrics_repository_gspread import MetricsRepositoryGspread
+from src.repositories.impl.metrics_repository_snapshot import MetricsRepositorySnapshot, write_snapshot
+from src.services.cache_service import CacheService
+from src.services.metrics.metrics_service import MetricsService
+from tests.conftest import FakeGspreadClient
+
+# Snapshots are Parquet/Feather files written and read with pyarrow.
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+async def clean_df(transactions_sheet):
+    service = MetricsService(MetricsRepositoryGspread(FakeGspreadClient(transactions_sheet)), MagicMock(spec=CacheService), cache_df_ttl_seconds=600)
+    return await service.load_clean_transactions()
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "feather"])
+def test_snapshot_round_trip(tmp_path, clean_df, fmt):
+    manifest = write_snapshot(clean_df, str(tmp_path), fmt)
+
+    df = MetricsRepositorySnapshot(str(tmp_path)).get_clean_transactions()
+
+    pd.testing.assert_frame_equal(df, clean_df)
+    assert manifest.rows == 2 and manifest.index == "invoicedate"
+    assert manifest.min_invoice_date == "2010-12-01T08:26:00" and manifest.max_invoice_date == "2010-12-01T08:28:00"
+    assert json.loads((tmp_path / "manifest.json").read_text())["fingerprint"] == manifest.fingerprint
+
+
+def test_rewrites_keep_only_the_current_and_previous_files(tmp_path, clean_df):
+    first = write_snapshot(clean_df, str(tmp_path))
+    second = write_snapshot(clean_df.iloc[:1], str(tmp_path))
+    third = write_snapshot(clean_df, str(tmp_path))
+
+    assert first.file == third.file
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(["manifest.json", second.file, third.file])
+    assert len(MetricsRepositorySnapshot(str(tmp_path)).get_clean_transactions()) == 2
+
+
+async def test_service_uses_the_snapshot_without_cleaning_it_again(tmp_path, clean_df, monkeypatch):
+    write_snapshot(clean_df, str(tmp_path))
+    service = MetricsService(MetricsRepositorySnapshot(str(tmp_path)), MagicMock(spec=CacheService), cache_df_ttl_seconds=600)
+    monkeypatch.setattr(service, "_process_dataframe", MagicMock(side_effect=AssertionError("cleaned twice")))
+
+    pd.testing.assert_frame_equal(await service.load_clean_transactions(), clean_df)
+
+
+def test_missing_snapshot_says_how_to_create_it(tmp_path):
+    with pytest.raises(FileNotFoundError, match="ecommerce-cli snapshot"):
+        MetricsRepositorySnapshot(str(tmp_path)).get_clean_transactions()
+
+
+def test_cli_snapshot_command(tmp_path, monkeypatch):
+    csv_path = tmp_path / "data.csv"
+    csv_path.write_text(
+        "InvoiceNo,StockCode,Description,Quantity,InvoiceDate,UnitPrice,CustomerID,Country\n"
+        "536365,85123A,WHITE HANGING HEART,6,12/1/2010 8:26,2.55,17850,United Kingdom\n"
+    )
+    monkeypatch.setattr(settings, "METRICS_CSV_PATH", str(csv_path))
+
+    result = CliRunner().invoke(cli, ["snapshot", "--source", "local", "--directory", str(tmp_path / "snapshot")])
+
+    assert result.exit_code == 0, result.output
+    assert "Wrote 1 rows from local" in result.output
+    assert MetricsRepositorySnapshot(str(tmp_path / "snapshot")).read_manifest().rows == 1
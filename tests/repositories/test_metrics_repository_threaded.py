@@ -0,0 +1,98 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import pytest
+from src.exceptions.metrics_exceptions import MetricsSourceTimeoutException
+from src.repositories.impl.metrics_repository_gspread import MetricsRepositoryGspread
+from src.repositories.impl.metrics_repository_threaded import MetricsRepositoryThreaded
+from src.repositories.metrics_repository import MetricsRepository
+from src.services.cache_service import CacheService
+from src.services.cache.local_dataframe_cache import LocalDataFrameCache
+from src.services.metrics.metrics_service import MetricsService
+from tests.conftest import FakeGspreadClient
+
+
+class BlockingRepository(MetricsRepository):
+    """Reads block until `release` is set, as a slow sheet read would."""
+    def __init__(self):
+        self.release = threading.Event()
+        self.started = 0
+
+    def get_sheet_name(self) -> str:
+        return "data"
+
+    def get_raw_transactions(self) -> pd.DataFrame:
+        self.started += 1
+        self.release.wait(5)
+        return pd.DataFrame({"a": [1]})
+
+
+@pytest.fixture
+def executor():
+    executor = ThreadPoolExecutor(max_workers=1)
+    yield executor
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def test_reads_run_off_the_event_loop(executor):
+    source = BlockingRepository()
+    repository = MetricsRepositoryThreaded(source, timeout_seconds=0, executor=executor)
+
+    read = asyncio.create_task(repository.get_raw_transactions())
+    await asyncio.sleep(0.05)
+    assert not read.done()
+    source.release.set()
+
+    assert (await read)["a"].tolist() == [1]
+
+
+async def test_a_slow_read_times_out(executor):
+    source = BlockingRepository()
+    repository = MetricsRepositoryThreaded(source, timeout_seconds=0.05, executor=executor)
+
+    start = time.perf_counter()
+    with pytest.raises(MetricsSourceTimeoutException) as exc_info:
+        await repository.get_raw_transactions()
+
+    assert time.perf_counter() - start < 1
+    assert exc_info.value.status_code == 504
+    source.release.set()
+
+
+async def test_cancelled_reads_are_dropped_while_queued(executor):
+    source = BlockingRepository()
+    repository = MetricsRepositoryThreaded(source, timeout_seconds=0, executor=executor)
+    running = asyncio.create_task(repository.get_raw_transactions())
+    queued = asyncio.create_task(repository.get_raw_transactions())
+    await asyncio.sleep(0.05)
+
+    queued.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await queued
+    source.release.set()
+    await running
+    executor.shutdown(wait=True)
+
+    assert source.started == 1
+
+
+async def test_requests_stay_fast_while_the_sheet_is_fetched(fake_redis, transactions_sheet):
+    transactions_sheet.latency = 0.5
+    cache = CacheService(fake_redis, df_format="pickle", local_cache=LocalDataFrameCache(0))
+    service = MetricsService(MetricsRepositoryGspread(FakeGspreadClient(transactions_sheet)), cache, cache_df_ttl_seconds=600)
+    await cache.backend.set("unrelated", b"cached", ex=600)
+
+    fetch = asyncio.create_task(service.get_kpi_summary())
+    await asyncio.sleep(0.05)
+    latencies = []
+    for _ in range(10):
+        start = time.perf_counter()
+        assert await cache.backend.get("unrelated") is not None
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(0.01)
+
+    assert not fetch.done()
+    assert max(latencies) < 0.05
+    assert (await fetch).total_products_sold == 1006
@@ -10,6 +10,16 @@ class FakeCacheService:
     async def delete_cache(self):
         self.cleared = True
 
+    async def invalidate_prefix(self, prefix):
+        self.invalidated_prefix = prefix
+        return 3
+
+    def get_stats(self):
+        return {"families": {"MetricsService.get_total_revenue": {"hits": 2, "misses": 1}}}
+
+    def reset_stats(self):
+        self.stats_reset = True
+
 
 class FakeMetricsService:
     def __init__(self):
@@ -38,3 +48,53 @@ def test_clear_cache_and_warmup(tmp_path):
         assert resp2.json().get("message") == "Cache warmed up successfully"
 
     app.dependency_overrides.clear()
+
+
+def test_invalidate_cache_prefix():
+    fake_cache = FakeCacheService()
+
+    from src.dependencies.services_di import get_cache_service
+    app.dependency_overrides[get_cache_service] = lambda: fake_cache
+
+    with TestClient(app) as client:
+        resp = client.delete("/admin/cache/keys", params={"prefix": "metrics:"})
+        assert resp.status_code == 200
+        assert resp.json()["deleted"] == 3
+        assert fake_cache.invalidated_prefix == "metrics:"
+
+        assert client.delete("/admin/cache/keys").status_code == 422
+
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.parametrize("prefix", ["celery-task-meta-", "cache_meta:", "c", "metrics"])
+def test_invalidate_cache_prefix_rejects_keys_the_cache_does_not_own(prefix):
+    fake_cache = FakeCacheService()
+
+    from src.dependencies.services_di import get_cache_service
+    app.dependency_overrides[get_cache_service] = lambda: fake_cache
+
+    with TestClient(app) as client:
+        resp = client.delete("/admin/cache/keys", params={"prefix": prefix})
+        assert resp.status_code == 422
+        assert "'metrics:'" in resp.json()["message"]
+        assert not hasattr(fake_cache, "invalidated_prefix")
+
+    app.dependency_overrides.clear()
+
+
+def test_cache_stats_and_reset():
+    fake_cache = FakeCacheService()
+
+    from src.dependencies.services_di import get_cache_service
+    app.dependency_overrides[get_cache_service] = lambda: fake_cache
+
+    with TestClient(app) as client:
+        resp = client.get("/admin/cache/stats")
+        assert resp.status_code == 200
+        assert resp.json()["families"]["MetricsService.get_total_revenue"]["hits"] == 2
+
+        assert client.delete("/admin/cache/stats").status_code == 200
+        assert fake_cache.stats_reset
+
+    app.dependency_overrides.clear()
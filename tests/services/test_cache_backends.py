@@ -0,0 +1,134 @@
+import asyncio
+import pandas as pd
+import pytest
+from redis.exceptions import LockError
+from src.services.cache_service import CacheService
+from src.services.cache.local_dataframe_cache import LocalDataFrameCache
+from src.services.cache.single_flight import SingleFlight
+from src.services.cache.impl.memory_cache_backend import MemoryCacheBackend
+from src.services.cache.impl.redis_cache_backend import RedisCacheBackend
+from src.services.cache.impl.sqlite_cache_backend import SqliteCacheBackend
+from src.dependencies.cache_backend import build_cache_backend
+
+
+@pytest.fixture(params=["redis", "memory", "sqlite"])
+async def backend(request, fake_redis, tmp_path):
+    if request.param == "redis":
+        backend = RedisCacheBackend(fake_redis)
+    elif request.param == "memory":
+        backend = MemoryCacheBackend(max_bytes=1024 * 1024)
+    else:
+        backend = SqliteCacheBackend(str(tmp_path / "cache.sqlite3"))
+    yield backend
+    await backend.close()
+
+
+async def test_get_set_mget_and_delete(backend):
+    assert await backend.set("metrics:clean_dataframe", b"frame", ex=60) is True
+    await backend.set("metrics:clean_dataframe:version", "abc@0")
+
+    assert await backend.get("metrics:clean_dataframe") == b"frame"
+    assert await backend.mget(["metrics:clean_dataframe:version", "missing"]) == [b"abc@0", None]
+    assert await backend.set("metrics:clean_dataframe", b"other", nx=True) is None
+    assert await backend.delete("metrics:clean_dataframe", "missing") == 1
+    assert await backend.get("metrics:clean_dataframe") is None
+
+
+async def test_set_many_and_expire_many(backend):
+    await backend.set_many({"metrics:clean_dataframe:chunk:g:0": b"a", "metrics:clean_dataframe:chunk:g:1": b"b"}, ex=600)
+    await backend.expire_many(["metrics:clean_dataframe:chunk:g:0", "missing"], 60)
+
+    assert await backend.mget(["metrics:clean_dataframe:chunk:g:0", "metrics:clean_dataframe:chunk:g:1", "missing"]) == [b"a", b"b", None]
+
+
+async def test_incr_and_prefix_scan(backend):
+    assert await backend.incr("cache_meta:namespace_version") == 1
+    assert await backend.incr("cache_meta:namespace_version") == 2
+    for i in range(5):
+        await backend.set(f"cache:v0:MetricsService.get_page:{i}", b"[]")
+    await backend.set("cache:v0:MetricsService.get_series:", b"[]")
+
+    keys = [key async for key in backend.scan_iter("cache:v0:MetricsService.get_page", count=2)]
+
+    assert sorted(k.decode() if isinstance(k, bytes) else k for k in keys) == [f"cache:v0:MetricsService.get_page:{i}" for i in range(5)]
+
+
+async def test_lock_is_exclusive_until_released(backend):
+    first, second = backend.lock("lock:k", 5), backend.lock("lock:k", 5)
+
+    assert await first.acquire(blocking=False)
+    assert not await second.acquire(blocking=False)
+    await first.reacquire()
+    await first.release()
+    assert await second.acquire(blocking=False)
+
+
+@pytest.mark.parametrize("name", ["memory", "sqlite"])
+async def test_local_entries_and_locks_expire(name, tmp_path):
+    backend = MemoryCacheBackend(1024) if name == "memory" else SqliteCacheBackend(str(tmp_path / "cache.sqlite3"))
+    await backend.set("cache:v0:k", b"value", ex=0.05)
+    lock = backend.lock("lock:k", 0.05)
+    assert await lock.acquire()
+
+    await asyncio.sleep(0.1)
+
+    assert await backend.get("cache:v0:k") is None
+    with pytest.raises(LockError):
+        await lock.reacquire()
+    assert await backend.lock("lock:k", 5).acquire()
+    await backend.close()
+
+
+async def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryCacheBackend(max_bytes=10)
+    await backend.set("a", b"12345")
+    await backend.set("b", b"12345")
+    await backend.get("a")
+    await backend.set("c", b"12345")
+
+    assert await backend.mget(["a", "b", "c"]) == [b"12345", None, b"12345"]
+    assert backend.stats()["evictions"] == 1
+
+
+async def test_sqlite_backend_persists_across_instances(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    first = SqliteCacheBackend(path)
+    await first.set("metrics:clean_dataframe", b"frame")
+    await first.close()
+
+    second = SqliteCacheBackend(path)
+    assert await second.get("metrics:clean_dataframe") == b"frame"
+    await second.close()
+
+
+async def test_cache_service_runs_on_any_backend(backend):
+    cache = CacheService(backend, df_format="pickle", local_cache=LocalDataFrameCache(0))
+    cache.single_flight = SingleFlight()
+    df = pd.DataFrame({"Country": ["United Kingdom", "France"], "Revenue": [10.0, 5.5]})
+    calls = 0
+
+    class Service:
+        cache_depends_on = ("metrics:clean_dataframe",)
+
+        async def get_total(self) -> float:
+            nonlocal calls
+            calls += 1
+            return 15.5
+
+    cached_total = cache.cache(Service.get_total)
+    await cache.set_dataframe("metrics:clean_dataframe", df, ttl_seconds=600)
+    assert await cached_total(Service()) == await cached_total(Service()) == 15.5
+    assert calls == 1
+    pd.testing.assert_frame_equal(await cache.get_dataframe("metrics:clean_dataframe"), df)
+
+    await cache.delete_cache()
+
+    assert await cache.get_dataframe("metrics:clean_dataframe") is None
+    assert await cache.get_namespace_version() == 1
+
+
+def test_backend_is_selected_by_name(fake_redis):
+    assert isinstance(build_cache_backend(fake_redis, "redis"), RedisCacheBackend)
+    assert build_cache_backend(None, "memory") is build_cache_backend(None, "memory")
+    with pytest.raises(ValueError):
+        build_cache_backend(None, "memcached")
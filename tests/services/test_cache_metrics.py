@@ -0,0 +1,29 @@
+from src.services.cache.cache_metrics import CacheMetrics, LATENCY_BUCKETS_MS
+
+
+def test_latency_is_bucketed_per_stage():
+    metrics = CacheMetrics()
+    metrics.observe("MetricsService.get_total_revenue", "lookup", 0.0003)
+    metrics.observe("MetricsService.get_total_revenue", "lookup", 60)
+    with metrics.timed("MetricsService.get_total_revenue", "compute"):
+        pass
+
+    lookup = metrics.snapshot()["MetricsService.get_total_revenue"]["latency"]["lookup"]
+    assert lookup["count"] == 2
+    assert lookup["buckets"][f"le_{LATENCY_BUCKETS_MS[0]}ms"] == 1
+    assert lookup["buckets"]["gt_last"] == 1
+    assert lookup["max_ms"] == 60000
+
+
+def test_counters_and_reset():
+    metrics = CacheMetrics()
+    metrics.increment("metrics:clean_dataframe", "local_hits")
+    metrics.increment("metrics:clean_dataframe", "misses")
+    metrics.increment("metrics:clean_dataframe", "bytes_read", 128)
+
+    snapshot = metrics.snapshot()["metrics:clean_dataframe"]
+    assert snapshot["hit_ratio"] == 0.5
+    assert snapshot["bytes_read"] == 128
+
+    metrics.reset()
+    assert metrics.snapshot() == {}
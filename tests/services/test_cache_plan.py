@@ -0,0 +1,37 @@
+from src.schemas.metrics import SortValue, TopCountryRevenueParams
+from src.schemas.pagination import PageParams
+from src.services.cache.cache_plan import CachePlan, KEY_DIGEST_SIZE, args_key
+from src.services.cache_service import serializer_registry
+
+
+class MetricsService:
+    async def get_top_countries(self, params: TopCountryRevenueParams, page: PageParams = PageParams()) -> list:
+        return []
+
+
+def _plan() -> CachePlan:
+    func = MetricsService.get_top_countries
+    return CachePlan(func=func, family=func.__qualname__, serializer=serializer_registry.for_function(func))
+
+
+def test_keys_are_fixed_length_digests_behind_the_method_name():
+    key = _plan().build_key(TopCountryRevenueParams(limit=5), PageParams(page=3))
+
+    family, digest = key.split(":")
+    assert family == "MetricsService.get_top_countries"
+    assert len(digest) == KEY_DIGEST_SIZE * 2
+
+
+def test_equal_arguments_share_a_key():
+    plan = _plan()
+    params = TopCountryRevenueParams(limit=5, sort_value=SortValue.REVENUE)
+    # Field order, positional vs keyword arguments and explicit defaults do not matter.
+    reordered = TopCountryRevenueParams.model_validate({"sort_value": "revenue", "ascending": False, "limit": 5})
+
+    assert plan.build_key(params) == plan.build_key(params=reordered) == plan.build_key(params, PageParams())
+    assert plan.build_key(params) != plan.build_key(TopCountryRevenueParams(limit=6))
+
+
+def test_args_key_is_stable_for_dicts_and_sets():
+    assert args_key(({"b": 1, "a": {2, 1}},), {}) == args_key(({"a": {1, 2}, "b": 1},), {})
+    assert args_key((1,), {}) != args_key(("1",), {})
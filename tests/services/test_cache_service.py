@@ -0,0 +1,389 @@
+import asyncio
+import threading
+import pandas as pd
+import pytest
+from src.services.cache_service import CacheService
+from src.services.cache import dataframe_codec
+from src.services.cache.dataframe_codec import DataFrameFormat, encode_dataframe, decode_dataframe, resolve_format
+from src.services.cache.local_dataframe_cache import LocalDataFrameCache
+from src.services.cache.single_flight import SingleFlight
+from src.services.cache.cache_metrics import CacheMetrics
+from src.services.cache.dataframe_chunks import ChunkManifest
+
+
+@pytest.fixture
+def clean_df():
+    df = pd.DataFrame({
+        "invoiceno": ["536365", "536366", "536367"],
+        "invoicedate": pd.to_datetime(["2010-12-01 08:26", "2010-12-01 08:28", "2010-12-02 09:00"]),
+        "country": pd.Categorical(["United Kingdom", "France", "United Kingdom"]),
+        "quantity": [6.0, 2.0, 12.0],
+    })
+    return df.set_index("invoicedate", drop=False)
+
+
+requires_pyarrow = pytest.mark.skipif(dataframe_codec.pa is None, reason="pyarrow is not installed")
+
+
+@pytest.mark.parametrize("fmt", [pytest.param(DataFrameFormat.ARROW, marks=requires_pyarrow), DataFrameFormat.PICKLE])
+def test_binary_formats_round_trip_keep_dtypes(clean_df, fmt):
+    payload = encode_dataframe(clean_df, fmt)
+    assert payload.startswith(b"EDF1:" + fmt.value.encode())
+
+    out = decode_dataframe(payload)
+
+    pd.testing.assert_frame_equal(out, clean_df)
+    assert isinstance(out.index, pd.DatetimeIndex)
+    assert isinstance(out["country"].dtype, pd.CategoricalDtype)
+
+
+def test_arrow_falls_back_to_pickle_without_pyarrow(clean_df, monkeypatch):
+    monkeypatch.setattr(dataframe_codec, "pa", None)
+    assert resolve_format("arrow") is DataFrameFormat.PICKLE
+
+    payload = encode_dataframe(clean_df, DataFrameFormat.ARROW)
+
+    assert payload.startswith(b"EDF1:pickle")
+    pd.testing.assert_frame_equal(decode_dataframe(payload), clean_df)
+
+
+def test_legacy_json_entries_are_still_readable(clean_df):
+    legacy = clean_df.reset_index(drop=True).to_json(orient="split")
+    out = decode_dataframe(legacy.encode("utf-8"))
+    assert list(out.columns) == list(clean_df.columns)
+    assert len(out) == len(clean_df)
+
+
+async def test_set_and_get_dataframe(fake_redis, clean_df):
+    cache = CacheService(fake_redis, df_format="pickle", local_cache=LocalDataFrameCache(0))
+    await cache.set_dataframe("metrics:clean_dataframe", clean_df, ttl_seconds=600)
+
+    assert fake_redis.ttls["metrics:clean_dataframe"] == 600
+    pd.testing.assert_frame_equal(await cache.get_dataframe("metrics:clean_dataframe"), clean_df)
+    assert await cache.get_dataframe("missing") is None
+
+
+async def test_l1_serves_frame_while_version_is_unchanged(fake_redis, clean_df):
+    writer = CacheService(fake_redis, df_format="pickle", local_cache=LocalDataFrameCache(0))
+    await writer.set_dataframe("metrics:clean_dataframe", clean_df, ttl_seconds=600)
+    reader = CacheService(fake_redis, df_format="pickle", local_cache=LocalDataFrameCache(10_000_000))
+
+    first = await reader.get_dataframe("metrics:clean_dataframe")
+    second = await reader.get_dataframe("metrics:clean_dataframe")
+
+    assert second is first
+    assert reader.local_cache.stats()["hits"] == 1
+
+
+async def test_l1_refetches_when_version_changes(fake_redis, clean_df):
+    writer = CacheService(fake_redis, df_format="pickle", local_cache=LocalDataFrameCache(0))
+    reader = CacheService(fake_redis, df_format="pickle", local_cache=LocalDataFrameCache(10_000_000))
+    await writer.set_dataframe("metrics:clean_dataframe", clean_df, ttl_seconds=600)
+    await reader.get_dataframe("metrics:clean_dataframe")
+
+    refreshed = clean_df.head(1)
+    await writer.set_dataframe("metrics:clean_dataframe", refreshed, ttl_seconds=600)
+
+    pd.testing.assert_frame_equal(await reader.get_dataframe("metrics:clean_dataframe"), refreshed)
+
+
+async def test_stale_frame_is_served_and_refreshed_once_in_background(fake_redis, clean_df):
+    cache = CacheService(fake_redis, df_format="pickle", local_cache=LocalDataFrameCache(0))
+    cache.single_flight = SingleFlight()
+    await cache.set_dataframe("metrics:clean_dataframe", clean_df, ttl_seconds=600, soft_ttl_seconds=1)
+    stamp = await cache.get_dataframe_stamp("metrics:clean_dataframe")
+    assert not stamp.is_stale()
+    assert stamp.is_stale(now=stamp.fresh_until + 1)
+
+    # Force the stored stamp into the past so the entry is stale.
+    stale = stamp.__class__(version=stamp.version, fresh_until=1.0)
+    await fake_redis.set("metrics:clean_dataframe:version", stale.encode())
+    refreshed = clean_df.head(1)
+    calls = 0
+
+    @cache.cache_dataframe(key="metrics:clean_dataframe", ttl_seconds=600)
+    async def load() -> pd.DataFrame:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return refreshed
+
+    first, second = await asyncio.gather(load(), load())
+    pd.testing.assert_frame_equal(first, clean_df)
+    pd.testing.assert_frame_equal(second, clean_df)
+
+    await asyncio.sleep(0.05)
+    assert calls == 1
+    pd.testing.assert_frame_equal(await cache.get_dataframe("metrics:clean_dataframe"), refreshed)
+
+
+async def test_soft_ttl_not_recorded_when_not_shorter_than_hard_ttl(fake_redis, clean_df):
+    cache = CacheService(fake_redis, df_format="pickle", local_cache=LocalDataFrameCache(0))
+    await cache.set_dataframe("metrics:clean_dataframe", clean_df, ttl_seconds=600, soft_ttl_seconds=600)
+    stamp = await cache.get_dataframe_stamp("metrics:clean_dataframe")
+    assert stamp.fresh_until == 0
+    assert not stamp.is_stale()
+
+
+async def test_generic_values_are_compressed_transparently(fake_redis):
+    cache = CacheService(fake_redis, local_cache=LocalDataFrameCache(0))
+    cache.single_flight = SingleFlight()
+    cache.compressor.min_bytes = 0
+
+    class Service:
+        async def get_rows(self) -> list:
+            return [{"country": "United Kingdom", "revenue": 1.0}] * 200
+
+    cached_rows = cache.cache(Service.get_rows)
+    expected = await cached_rows(Service())
+    [stored] = [value for key, value in fake_redis.store.items() if "Service.get_rows:" in key]
+
+    assert stored.startswith(b"\x00C")
+    assert await cached_rows(Service()) == expected
+
+
+async def test_derived_entries_follow_the_version_of_their_dataframe(fake_redis, clean_df):
+    cache = CacheService(fake_redis, df_format="pickle", local_cache=LocalDataFrameCache(0))
+    cache.single_flight = SingleFlight()
+    calls = 0
+
+    class Service:
+        cache_depends_on = ("metrics:clean_dataframe",)
+
+        async def get_total(self) -> int:
+            nonlocal calls
+            calls += 1
+            return calls
+
+    cached_total = cache.cache(Service.get_total)
+    # Without a cached frame there is nothing to tag the result with, so it is not cached.
+    assert await cached_total(Service()) == 1
+    assert await cached_total(Service()) == 2
+
+    await cache.set_dataframe("metrics:clean_dataframe", clean_df, ttl_seconds=600)
+    assert await cached_total(Service()) == 3
+    assert await cached_total(Service()) == 3
+    [key] = [key for key in fake_redis.store if key.startswith("cache:v0:")]
+    stamp = await cache.get_dataframe_stamp("metrics:clean_dataframe")
+    assert key.endswith(f"|ds={stamp.version}")
+    assert fake_redis.ttls[key] == cache.derived_ttl
+
+    # Reloading identical data keeps the entry; different data invalidates it.
+    await cache.set_dataframe("metrics:clean_dataframe", clean_df.copy(), ttl_seconds=600)
+    assert await cached_total(Service()) == 3
+    await cache.set_dataframe("metrics:clean_dataframe", clean_df.head(1), ttl_seconds=600)
+    assert await cached_total(Service()) == 4
+
+
+async def test_invalidate_prefix_deletes_only_matching_keys_in_batches(fake_redis):
+    cache = CacheService(fake_redis, local_cache=LocalDataFrameCache(0))
+    for i in range(7):
+        await fake_redis.set(f"cache:v0:MetricsService.get_page:{i}", b"[]")
+    await fake_redis.set("cache:v0:MetricsService.get_series:", b"[]")
+
+    deleted = await cache.invalidate_prefix("cache:v0:MetricsService.get_page", batch_size=3)
+
+    assert deleted == 7
+    assert list(fake_redis.store) == ["cache:v0:MetricsService.get_series:"]
+
+
+async def test_delete_cache_keeps_keys_it_does_not_own(fake_redis, clean_df):
+    cache = CacheService(fake_redis, df_format="pickle", local_cache=LocalDataFrameCache(0))
+    await cache.set_dataframe("metrics:clean_dataframe", clean_df, ttl_seconds=600)
+    await fake_redis.set("cache:v1:MetricsService.get_series:", b"[]")
+    await fake_redis.set("celery-task-meta-1", b"{}")
+
+    await cache.delete_cache()
+
+    assert await cache.get_dataframe("metrics:clean_dataframe") is None
+    assert "cache:v1:MetricsService.get_series:" not in fake_redis.store
+    assert "celery-task-meta-1" in fake_redis.store
+    assert await cache.get_namespace_version() == 1
+
+
+async def test_metrics_are_recorded_per_key_family(fake_redis, clean_df):
+    cache = CacheService(fake_redis, df_format="pickle", local_cache=LocalDataFrameCache(0))
+    cache.single_flight = SingleFlight()
+    cache.metrics = CacheMetrics()
+
+    class Service:
+        async def get_total(self) -> int:
+            return 42
+
+    cached_total = cache.cache(Service.get_total)
+    await cached_total(Service())
+    await cached_total(Service())
+    await cache.set_dataframe("metrics:clean_dataframe", clean_df, ttl_seconds=600)
+    await cache.get_dataframe("metrics:clean_dataframe")
+
+    families = cache.get_stats()["families"]
+    total = families[Service.get_total.__qualname__]
+    assert (total["hits"], total["misses"], total["hit_ratio"]) == (1, 1, 0.5)
+    assert total["latency"]["compute"]["count"] == 1
+    assert total["latency"]["write"]["count"] == 1
+    assert total["bytes_read"] == total["bytes_written"] > 0
+    frame = families["metrics:clean_dataframe"]
+    assert frame["hits"] == 1 and frame["latency"]["deserialize"]["count"] == 1
+
+    cache.reset_stats()
+    assert cache.get_stats()["families"] == {}
+
+
+async def test_large_frames_are_stored_in_chunks_behind_a_manifest(fake_redis, clean_df):
+    cache = CacheService(fake_redis, df_format="pickle", local_cache=LocalDataFrameCache(0))
+    cache.df_chunk_rows = 1
+    frame = pd.concat([clean_df] * 3, ignore_index=True)
+
+    await cache.set_dataframe("metrics:clean_dataframe", frame, ttl_seconds=600)
+
+    manifest = ChunkManifest.decode(fake_redis.store["metrics:clean_dataframe"])
+    assert manifest.chunks == manifest.rows == len(frame)
+    assert fake_redis.pipelines_executed == 1
+    assert all(fake_redis.ttls[key] == 600 for key in manifest.chunk_keys("metrics:clean_dataframe"))
+    pd.testing.assert_frame_equal(await cache.get_dataframe("metrics:clean_dataframe"), frame)
+
+    # New data goes to new chunk keys; the replaced ones only get a grace period.
+    await cache.set_dataframe("metrics:clean_dataframe", frame.head(1), ttl_seconds=600)
+    assert all(fake_redis.ttls[key] == cache.df_chunk_grace for key in manifest.chunk_keys("metrics:clean_dataframe"))
+    pd.testing.assert_frame_equal(await cache.get_dataframe("metrics:clean_dataframe"), frame.head(1))
+
+
+async def test_readers_never_see_a_half_written_chunked_frame(fake_redis, clean_df):
+    cache = CacheService(fake_redis, df_format="pickle", local_cache=LocalDataFrameCache(0))
+    cache.df_chunk_rows = 1
+    old, new = pd.concat([clean_df] * 2, ignore_index=True), pd.concat([clean_df] * 3, ignore_index=True)
+    await cache.set_dataframe("metrics:clean_dataframe", old, ttl_seconds=600)
+
+    chunks_written = asyncio.Event()
+    release_writer = asyncio.Event()
+    set_many = cache.backend.set_many
+
+    async def slow_set_many(mapping, ex=None):
+        await set_many(mapping, ex)
+        chunks_written.set()
+        await release_writer.wait()
+
+    cache.backend.set_many = slow_set_many
+    writer = asyncio.create_task(cache.set_dataframe("metrics:clean_dataframe", new, ttl_seconds=600))
+    await chunks_written.wait()
+    pd.testing.assert_frame_equal(await cache.get_dataframe("metrics:clean_dataframe"), old)
+
+    release_writer.set()
+    await writer
+    pd.testing.assert_frame_equal(await cache.get_dataframe("metrics:clean_dataframe"), new)
+
+
+def _record_reads(fake_redis) -> list:
+    reads = []
+    get = fake_redis.get
+
+    async def recording_get(key):
+        reads.append(key)
+        return await get(key)
+
+    fake_redis.get = recording_get
+    return reads
+
+
+async def test_replacing_a_frame_retires_the_previous_chunks_without_scanning(fake_redis, clean_df):
+    cache = CacheService(fake_redis, df_format="pickle", local_cache=LocalDataFrameCache(0))
+    cache.df_chunk_rows = 1
+    await cache.set_dataframe("metrics:other", clean_df, ttl_seconds=600)
+    await cache.set_dataframe("metrics:clean_dataframe", clean_df, ttl_seconds=600)
+    other = ChunkManifest.decode(fake_redis.store["metrics:other"])
+    replaced = ChunkManifest.decode(fake_redis.store["metrics:clean_dataframe"])
+
+    def no_scan(*args, **kwargs):
+        raise AssertionError("set_dataframe scanned the keyspace")
+
+    fake_redis.scan_iter = no_scan
+    reads = _record_reads(fake_redis)
+    await cache.set_dataframe("metrics:clean_dataframe", clean_df.head(1), ttl_seconds=600)
+    await cache.set_dataframe("metrics:clean_dataframe", clean_df.head(2), ttl_seconds=600)
+
+    assert all(fake_redis.ttls[key] == cache.df_chunk_grace for key in replaced.chunk_keys("metrics:clean_dataframe"))
+    assert all(fake_redis.ttls[key] == 600 for key in other.chunk_keys("metrics:other"))
+    # Only the small stamps are read, never the frames being replaced.
+    assert set(reads) == {"metrics:clean_dataframe:version"}
+
+
+async def test_touch_extends_the_chunks_without_reading_the_frame(fake_redis, clean_df):
+    cache = CacheService(fake_redis, df_format="pickle", local_cache=LocalDataFrameCache(0))
+    cache.df_chunk_rows = 1
+    await cache.set_dataframe("metrics:clean_dataframe", clean_df, ttl_seconds=600)
+    manifest = ChunkManifest.decode(fake_redis.store["metrics:clean_dataframe"])
+    reads = _record_reads(fake_redis)
+
+    stamp = await cache.touch_dataframe("metrics:clean_dataframe", ttl_seconds=900)
+
+    assert stamp.chunks == manifest.chunks == len(clean_df)
+    assert all(fake_redis.ttls[key] == 900 for key in ["metrics:clean_dataframe", *manifest.chunk_keys("metrics:clean_dataframe")])
+    assert reads == ["metrics:clean_dataframe:version"]
+
+
+async def test_chunks_are_encoded_off_the_event_loop(fake_redis, clean_df, monkeypatch):
+    from src.services import cache_service
+
+    cache = CacheService(fake_redis, df_format="pickle", local_cache=LocalDataFrameCache(0))
+    cache.df_chunk_rows = 1
+    threads = set()
+
+    def encode(df, fmt):
+        threads.add(threading.current_thread())
+        return encode_dataframe(df, fmt)
+
+    monkeypatch.setattr(cache_service, "encode_dataframe", encode)
+    await cache.set_dataframe("metrics:clean_dataframe", clean_df, ttl_seconds=600)
+
+    assert threads and threading.current_thread() not in threads
+
+
+async def test_missing_chunks_are_a_cache_miss(fake_redis, clean_df):
+    cache = CacheService(fake_redis, df_format="pickle", local_cache=LocalDataFrameCache(0))
+    cache.df_chunk_rows = 1
+    await cache.set_dataframe("metrics:clean_dataframe", clean_df, ttl_seconds=600)
+    manifest = ChunkManifest.decode(fake_redis.store["metrics:clean_dataframe"])
+    await fake_redis.delete(manifest.chunk_keys("metrics:clean_dataframe")[-1])
+
+    assert await cache.get_dataframe("metrics:clean_dataframe") is None
+
+
+async def test_designated_exceptions_are_cached_briefly_and_reraised(fake_redis, clean_df):
+    from src.aspects.decorators import cached
+    from src.exceptions.metrics_exceptions import CountryNotFoundException
+
+    cache = CacheService(fake_redis, df_format="pickle", local_cache=LocalDataFrameCache(0))
+    cache.single_flight = SingleFlight()
+    cache.metrics = CacheMetrics()
+    await cache.set_dataframe("metrics:clean_dataframe", clean_df, ttl_seconds=600)
+    calls = 0
+
+    class Service:
+        cache_depends_on = ("metrics:clean_dataframe",)
+
+        @cached(negative=(CountryNotFoundException,))
+        async def get_country(self, name: str) -> str:
+            nonlocal calls
+            calls += 1
+            raise CountryNotFoundException(name)
+
+        async def get_other(self, name: str) -> str:
+            nonlocal calls
+            calls += 1
+            raise ValueError(name)
+
+    get_country = cache.cache(Service.get_country)
+    for _ in range(3):
+        with pytest.raises(CountryNotFoundException) as exc_info:
+            await get_country(Service(), "Narnia")
+    assert exc_info.value.detail == "Country Narnia not found"
+    assert calls == 1
+    [key] = [key for key in fake_redis.store if "Service.get_country" in key]
+    assert fake_redis.ttls[key] == cache.negative_ttl
+    assert cache.get_stats()["families"][Service.get_country.__qualname__]["negative_hits"] == 2
+
+    get_other = cache.cache(Service.get_other)
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            await get_other(Service(), "Narnia")
+    assert calls == 3
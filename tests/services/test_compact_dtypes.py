@@ -0,0 +1,133 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from fastapi.encoders import jsonable_encoder
+from src.repositories.metrics_repository import MetricsRepository
+from src.schemas.metrics import ProductMetricsParams, SerieType, SortValue, TopCountryRevenueParams, TopSpendersMetricsParams
+from src.schemas.pagination import PageParams
+from src.services.cache_service import CacheService
+from src.services.cache.local_dataframe_cache import LocalDataFrameCache
+from src.services.metrics.customer_service import CustomerService
+from src.services.metrics.metrics_service import MetricsService
+from src.services.metrics.product_service import ProductService
+
+
+def _raw_transactions(rows: int = 3000) -> pd.DataFrame:
+    """Sheet-like rows: every value is text, keys repeat and some descriptions are missing."""
+    rng = np.random.default_rng(7)
+    stock_codes = np.array([f"{code}" for code in range(84000, 84060)] + ["POST", "85123A"])
+    descriptions = np.array([f"ITEM {i}" for i in range(len(stock_codes))], dtype=object)
+    picks = rng.integers(0, len(stock_codes), rows)
+    description = descriptions[picks]
+    description[rng.random(rows) < 0.05] = None
+    start = pd.Timestamp("2010-12-01 08:00")
+    dates = [start + pd.Timedelta(minutes=int(m)) for m in rng.integers(0, 60 * 24 * 400, rows)]
+    return pd.DataFrame({
+        "InvoiceNo": [str(536000 + int(i)) for i in rng.integers(0, rows // 4, rows)],
+        "StockCode": stock_codes[picks],
+        "Description": description,
+        "Quantity": [f"{q:,}" for q in rng.integers(-5, 1500, rows)],
+        "InvoiceDate": [d.strftime("%-m/%-d/%Y %-H:%M") for d in dates],
+        "UnitPrice": [f"{p:.2f}" for p in rng.choice([0.5, 1.25, 2.55, 0.85, 4.95, 12.75], rows)],
+        "CustomerID": [str(c) for c in rng.integers(12000, 12400, rows)],
+        "Country": rng.choice(["United Kingdom", "France", "Germany", "EIRE", "Spain", "Norway"], rows),
+    })
+
+
+def _services(df: pd.DataFrame) -> list:
+    services = []
+    for service_class in (MetricsService, CustomerService, ProductService):
+        service = service_class(MagicMock(spec=MetricsRepository), None, cache_df_ttl_seconds=600)
+        service._clean_data_frame_loader = AsyncMock(return_value=df)
+        services.append(service)
+    return services
+
+
+async def _endpoint_results(df: pd.DataFrame) -> list:
+    metrics, customers, products = _services(df)
+    calls = [
+        lambda: metrics.get_kpi_summary(),
+        *[lambda serie_type=serie_type: metrics.get_series(serie_type) for serie_type in SerieType],
+        lambda: metrics.get_top_countries(TopCountryRevenueParams()),
+        lambda: metrics.get_top_countries(TopCountryRevenueParams(ascending=True, sort_value=SortValue.PRODUCTS_SOLD, limit=3)),
+        lambda: metrics.get_top_country_by_name("France"),
+        lambda: metrics.get_top_country_by_name("Atlantis"),
+        lambda: metrics.get_page(PageParams(page=1, limit=50)),
+        lambda: metrics.get_page(PageParams(page=7, limit=100)),
+        lambda: customers.get_top_spenders(TopSpendersMetricsParams()),
+        lambda: customers.get_top_spenders(TopSpendersMetricsParams(ascending=True, limit=25)),
+        lambda: customers.get_rfm_analysis(),
+        lambda: customers.get_rfm_analysis_page(PageParams(page=2, limit=20)),
+        lambda: products.get_top_sellers(ProductMetricsParams()),
+        lambda: products.get_specific_product_series("84001", SerieType.MONTH),
+    ]
+    results = []
+    for call in calls:
+        try:
+            results.append(json.dumps(jsonable_encoder(await call())))
+        except Exception as exc:
+            results.append(f"raised {type(exc).__name__}")
+    return results
+
+
+def _process(raw: pd.DataFrame, compact: bool) -> pd.DataFrame:
+    service = MetricsService(MagicMock(spec=MetricsRepository), MagicMock(spec=CacheService), cache_df_ttl_seconds=600, compact_dtypes=compact)
+    return service._process_dataframe(raw.copy())
+
+
+async def test_compact_frame_returns_identical_endpoint_results():
+    raw = _raw_transactions()
+    plain, compact = _process(raw, compact=False), _process(raw, compact=True)
+
+    assert all(isinstance(compact[c].dtype, pd.CategoricalDtype) for c in ("country", "stockcode", "customerid", "invoiceno", "description"))
+    assert compact["quantity"].dtype == np.float64 and compact["total_price"].dtype == np.float64
+    assert compact.memory_usage(deep=True).sum() < plain.memory_usage(deep=True).sum() / 2
+    assert await _endpoint_results(compact) == await _endpoint_results(plain)
+
+
+def test_compact_columns_reports_memory_and_keeps_lossy_columns():
+    service = MetricsService(MagicMock(spec=MetricsRepository), MagicMock(spec=CacheService), cache_df_ttl_seconds=600)
+    df = pd.DataFrame({
+        "country": ["France", "Spain"] * 50,
+        "invoiceno": [str(i) for i in range(100)],
+        "unitprice": [0.5, 1.25] * 50,
+        "quantity": [6.0, 1.0] * 50,
+        "precise": [0.1, 0.2] * 50,
+        "count": [1, 300] * 50,
+    })
+
+    df, report = service._compact_columns(df)
+
+    assert set(report) == {"country", "unitprice", "count"}
+    assert all(after < before for before, after in report.values())
+    assert list(df["country"].cat.categories) == ["France", "Spain"]
+    assert df["invoiceno"].dtype == object
+    assert df["unitprice"].dtype == np.float32 and df["count"].dtype == np.int16
+    assert df["quantity"].dtype == np.float64 and df["precise"].dtype == np.float64
+
+
+def test_append_rows_keeps_categoricals_with_the_union_of_categories():
+    service = MetricsService(MagicMock(spec=MetricsRepository), MagicMock(spec=CacheService), cache_df_ttl_seconds=600)
+    cached, _ = service._compact_columns(pd.DataFrame({"country": ["Spain", "France"] * 3, "unitprice": [0.5] * 6}))
+    new_rows = pd.DataFrame({"country": ["Austria"], "unitprice": [1.5]})
+
+    combined = service._append_rows(cached, new_rows)
+
+    assert list(combined["country"].cat.categories) == ["Austria", "France", "Spain"]
+    assert combined["country"].tolist() == ["Spain", "France"] * 3 + ["Austria"]
+    assert combined["unitprice"].dtype == np.float32
+
+
+@pytest.mark.parametrize("df_format", ["arrow", "pickle"])
+async def test_cached_compact_frame_keeps_its_dtypes(fake_redis, df_format):
+    compact = _process(_raw_transactions(), compact=True)
+    cache = CacheService(fake_redis, df_format=df_format, local_cache=LocalDataFrameCache(0))
+    cache.df_chunk_rows = 1000
+
+    await cache.set_dataframe("metrics:clean_dataframe", compact, 600)
+    cached = await cache.get_dataframe("metrics:clean_dataframe")
+
+    assert cached.dtypes.equals(compact.dtypes)
+    pd.testing.assert_frame_equal(cached, compact, check_freq=False)
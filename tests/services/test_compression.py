@@ -0,0 +1,53 @@
+import json
+import pytest
+from src.services.cache.compression import CODECS, CompressionStats, PayloadCompressor, resolve_codec
+
+LARGE = json.dumps([{"recency": 5, "frequency": 4, "segment_name": "Champion"}] * 500).encode("utf-8")
+
+
+@pytest.mark.parametrize("codec", sorted(CODECS))
+def test_round_trip_for_every_installed_codec(codec):
+    compressor = PayloadCompressor(codec=codec, min_bytes=1024, stats=CompressionStats())
+    stored = compressor.compress(LARGE, "CustomerService.get_rfm_analysis")
+
+    assert stored.startswith(b"\x00C")
+    assert len(stored) < len(LARGE)
+    assert compressor.decompress(stored, "CustomerService.get_rfm_analysis") == LARGE
+
+
+def test_small_payloads_are_stored_uncompressed():
+    compressor = PayloadCompressor(codec="zlib", min_bytes=1024, stats=CompressionStats())
+    assert compressor.compress(b'{"total_revenue": 1.0}', "k") == b'{"total_revenue": 1.0}'
+
+
+def test_uncompressed_and_legacy_values_are_returned_as_is():
+    compressor = PayloadCompressor(codec="none", stats=CompressionStats())
+    assert compressor.compress(LARGE, "k") == LARGE
+    assert compressor.decompress(b"[1, 2]", "k") == b"[1, 2]"
+    assert compressor.decompress("[1, 2]", "k") == "[1, 2]"
+
+
+def test_reader_decodes_values_written_with_another_codec():
+    writer = PayloadCompressor(codec="zlib", min_bytes=0, stats=CompressionStats())
+    reader = PayloadCompressor(codec="none", stats=CompressionStats())
+    assert reader.decompress(writer.compress(LARGE, "k"), "k") == LARGE
+
+
+def test_stats_per_family():
+    stats = CompressionStats()
+    compressor = PayloadCompressor(codec="zlib", min_bytes=1024, stats=stats)
+    compressor.decompress(compressor.compress(LARGE, "MetricsService.get_page"), "MetricsService.get_page")
+    compressor.compress(b"[]", "MetricsService.get_series")
+
+    snapshot = stats.snapshot()
+    assert snapshot["MetricsService.get_page"]["compressed_writes"] == 1
+    assert snapshot["MetricsService.get_page"]["compression_ratio"] > 1
+    assert snapshot["MetricsService.get_page"]["reads"] == 1
+    assert snapshot["MetricsService.get_series"]["compressed_writes"] == 0
+    stats.reset()
+    assert stats.snapshot() == {}
+
+
+def test_auto_prefers_installed_codec():
+    assert resolve_codec("auto") in CODECS
+    assert resolve_codec("none") is None
@@ -0,0 +1,51 @@
+import pandas as pd
+from src.services.cache.local_dataframe_cache import LocalDataFrameCache
+
+
+def _df(rows: int) -> pd.DataFrame:
+    return pd.DataFrame({"quantity": [1.0] * rows})
+
+
+def test_get_requires_matching_version():
+    cache = LocalDataFrameCache(max_bytes=1_000_000)
+    df = _df(10)
+    cache.put("k", "v1", df)
+
+    assert cache.get("k", "v1") is df
+    assert cache.get("k", "v2") is None
+    assert cache.get("k", None) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_evicts_least_recently_used_when_over_budget():
+    one_frame = int(_df(1000).memory_usage(deep=True, index=True).sum())
+    cache = LocalDataFrameCache(max_bytes=one_frame * 2)
+    cache.put("a", "v", _df(1000))
+    cache.put("b", "v", _df(1000))
+    cache.get("a", "v")
+    cache.put("c", "v", _df(1000))
+
+    assert cache.get("b", "v") is None
+    assert cache.get("a", "v") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_frames_larger_than_budget_and_disabled_cache_are_not_stored():
+    small = LocalDataFrameCache(max_bytes=10)
+    small.put("k", "v", _df(1000))
+    assert small.stats()["entries"] == 0
+
+    disabled = LocalDataFrameCache(max_bytes=0)
+    disabled.put("k", "v", _df(1))
+    assert disabled.stats()["entries"] == 0
+
+
+def test_invalidate():
+    cache = LocalDataFrameCache(max_bytes=1_000_000)
+    cache.put("a", "v", _df(1))
+    cache.put("b", "v", _df(1))
+    cache.invalidate("a")
+    assert cache.stats()["entries"] == 1
+    cache.invalidate()
+    assert cache.stats()["entries"] == 0
@@ -19,3 +19,40 @@ def test_clean_and_convert_to_numeric():
     # Assert
     assert out.dtype == float
     assert list(out.fillna(0).round(6)) == [1000.0, 0.0, 0.0, 0.0, 0.0, 0.0, 42.0]
+
+
+def test_convert_to_numeric_reports_coerced_values():
+    svc = MetricsService(MagicMock(spec=MetricsRepository), MagicMock(spec=CacheService), cache_df_ttl_seconds=600)
+
+    floats, floats_coerced = svc._convert_to_numeric(pd.Series([1.5, float("nan"), float("inf"), 2.0]))
+    ints, ints_coerced = svc._convert_to_numeric(pd.Series([1, 2, None], dtype="Int64"))
+    text, text_coerced = svc._convert_to_numeric(pd.Series([" 12 ", "1,000.5", "abc", "7"], index=[3, 5, 7, 9]))
+
+    assert floats.tolist() == [1.5, 0.0, 0.0, 2.0] and floats_coerced == 2
+    assert ints.dtype == float and ints.tolist() == [1.0, 2.0, 0.0] and ints_coerced == 1
+    assert text.tolist() == [12.0, 1000.5, 0.0, 7.0] and text_coerced == 1
+    assert list(text.index) == [3, 5, 7, 9]
+
+
+def test_parse_dates_detects_the_format_and_falls_back_per_value():
+    svc = MetricsService(MagicMock(spec=MetricsRepository), MagicMock(spec=CacheService), cache_df_ttl_seconds=600)
+    s = pd.Series(["13/1/2011 8:26", "2/1/2011 9:00", None, "13/1/2011 8:26", "2011-01-05 10:00", "not a date"], index=list("abcdef"), name="invoicedate")
+
+    out = svc._parse_dates(s)
+
+    assert list(out.index) == list("abcdef") and out.name == "invoicedate"
+    assert out.tolist()[:2] == [pd.Timestamp("2011-01-13 08:26"), pd.Timestamp("2011-01-02 09:00")]
+    assert out.isna().tolist() == [False, False, True, False, False, True]
+    assert out["e"] == pd.Timestamp("2011-01-05 10:00")
+    parsed = pd.Series(pd.to_datetime(["2011-01-13"]))
+    assert svc._parse_dates(parsed) is parsed
+
+
+def test_date_and_time_parts_are_parsed_separately_with_the_same_result():
+    svc = MetricsService(MagicMock(spec=MetricsRepository), MagicMock(spec=CacheService), cache_df_ttl_seconds=600)
+    values = pd.Series(["12/1/2010 8:26", "12/1/2010 17:05", "1/31/2011  9:00", "2/1/2011", "12/9/2011 12:50"])
+
+    out = svc._parse_with_format(values, "%m/%d/%Y %H:%M")
+
+    pd.testing.assert_series_equal(out, pd.to_datetime(values, format="%m/%d/%Y %H:%M", errors="coerce"))
+    assert out.isna().tolist() == [False, False, False, True, False]
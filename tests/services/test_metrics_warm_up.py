@@ -0,0 +1,50 @@
+import pandas as pd
+import pytest
+from src.repositories.impl.metrics_repository_gspread import MetricsRepositoryGspread
+from src.services.cache_service import CacheService
+from src.services.cache.local_dataframe_cache import LocalDataFrameCache
+from src.services.metrics.metrics_service import MetricsService
+from tests.conftest import FakeGspreadClient
+
+NEW_ROW = ["536367", "84406B", "CREAM CUPID HEARTS", "8", "12/2/2010 9:00", "2.75", "13047", "United Kingdom"]
+
+
+@pytest.fixture
+def service(fake_redis, transactions_sheet):
+    cache = CacheService(fake_redis, df_format="pickle", local_cache=LocalDataFrameCache(0))
+    return MetricsService(MetricsRepositoryGspread(FakeGspreadClient(transactions_sheet)), cache, cache_df_ttl_seconds=600)
+
+
+async def test_warm_up_appends_only_new_rows(service, transactions_sheet):
+    await service.warm_up_dataframe_cache()
+    transactions_sheet.values.append(NEW_ROW)
+
+    await service.warm_up_dataframe_cache()
+
+    assert transactions_sheet.reads == ["all", ["1:1", "3:3", "4:4"]]
+    df = await service.cache_service.get_dataframe(service.df_cache_key)
+    assert df["invoiceno"].tolist() == ["536365", "536366", "536367"]
+    assert df["quantity"].tolist() == [6.0, 1000.0, 8.0]
+    assert isinstance(df.index, pd.DatetimeIndex)
+
+
+async def test_warm_up_without_new_rows_keeps_the_frame(service, transactions_sheet):
+    await service.warm_up_dataframe_cache()
+    stamp = await service.cache_service.get_dataframe_stamp(service.df_cache_key)
+
+    await service.warm_up_dataframe_cache()
+    await service.warm_up_dataframe_cache()
+
+    assert transactions_sheet.reads[0] == "all" and "all" not in transactions_sheet.reads[1:]
+    assert (await service.cache_service.get_dataframe_stamp(service.df_cache_key)).version == stamp.version
+
+
+async def test_warm_up_reloads_when_rows_shrink(service, transactions_sheet):
+    await service.warm_up_dataframe_cache()
+    del transactions_sheet.values[2]
+
+    await service.warm_up_dataframe_cache()
+
+    assert transactions_sheet.reads[-1] == "all"
+    df = await service.cache_service.get_dataframe(service.df_cache_key)
+    assert df["invoiceno"].tolist() == ["536365"]
@@ -0,0 +1,82 @@
+import math
+from typing import List
+import numpy as np
+import pandas as pd
+from src.database.models.user import User
+from src.schemas.metrics import KPIsSummary, RFMAnalysis, SegmentName, Serie, TopCountryRevenue
+from src.schemas.pagination import PageResponse
+from src.services.cache_service import CacheService, serializer_registry
+
+
+class Service:
+    async def get_rfm_analysis(self) -> List[RFMAnalysis]: ...
+    async def get_kpi_summary(self) -> KPIsSummary: ...
+    async def get_series(self) -> List[Serie]: ...
+    async def get_top_country_by_name(self, country_name: str) -> TopCountryRevenue | None: ...
+    async def get_page(self) -> PageResponse: ...
+    async def get_user(self) -> User: ...
+    async def get_untyped(self): ...
+
+
+def test_serializer_is_built_once_per_function():
+    assert serializer_registry.for_function(Service.get_rfm_analysis) is serializer_registry.for_function(Service.get_rfm_analysis)
+    assert serializer_registry.for_type(List[RFMAnalysis]) is serializer_registry.for_function(Service.get_rfm_analysis)
+
+
+def test_list_of_models_round_trip():
+    rfm = [RFMAnalysis(recency=5, frequency=4, monetary=3.0, segment_name=SegmentName.LOYALTIES, total_spend=120.5)] * 3
+    serializer = serializer_registry.for_function(Service.get_rfm_analysis)
+
+    payload = serializer.dumps(rfm)
+
+    assert isinstance(payload, bytes)
+    assert serializer.loads(payload) == rfm
+
+
+def test_optional_model_round_trip():
+    serializer = serializer_registry.for_function(Service.get_top_country_by_name)
+    country = TopCountryRevenue(country="France", revenue=10.0, products_sold=2)
+    assert serializer.loads(serializer.dumps(country)) == country
+    assert serializer.loads(serializer.dumps(None)) is None
+
+
+def test_non_finite_floats_round_trip():
+    summary = KPIsSummary(total_revenue=10.0, total_products_sold=0, average_total_products_sold=math.nan)
+    series = [
+        Serie(period="2010-12-01", revenue=5.0, products_sold=1, growth_rate=math.inf),
+        Serie(period="2011-01-01", revenue=0.0, products_sold=0, growth_rate=-math.inf),
+    ]
+
+    summary_serializer = serializer_registry.for_function(Service.get_kpi_summary)
+    series_serializer = serializer_registry.for_function(Service.get_series)
+
+    loaded_summary = summary_serializer.loads(summary_serializer.dumps(summary))
+    loaded_series = series_serializer.loads(series_serializer.dumps(series))
+
+    assert math.isnan(loaded_summary.average_total_products_sold)
+    assert [serie.growth_rate for serie in loaded_series] == [math.inf, -math.inf]
+
+
+def test_page_with_dataframe_records_is_serializable():
+    serializer = serializer_registry.for_function(Service.get_page)
+    page = PageResponse(
+        results=[{"invoicedate": pd.Timestamp("2010-12-01 08:26"), "quantity": np.float64(6.0)}],
+        page=1, limit=10, total_pages=1, total_results=1,
+    )
+    loaded = serializer.loads(serializer.dumps(page))
+    assert loaded.results == [{"invoicedate": "2010-12-01T08:26:00", "quantity": 6.0}]
+
+
+def test_reads_entries_written_by_the_legacy_serializer():
+    summary = KPIsSummary(total_revenue=10.0, total_products_sold=2, average_total_products_sold=1.0)
+    legacy_payload = CacheService._serialize_value(summary)
+    assert serializer_registry.for_function(Service.get_kpi_summary).loads(legacy_payload) == summary
+
+
+def test_sqlalchemy_and_untyped_results_use_the_legacy_serializer():
+    user = User(username="mateo", password="hashed", id=1)
+    serializer = serializer_registry.for_function(Service.get_user)
+    assert serializer.dumps(user) == CacheService._serialize_value(user).encode("utf-8")
+
+    untyped = serializer_registry.for_function(Service.get_untyped)
+    assert untyped.loads(untyped.dumps({"a": [1, 2]})) == {"a": [1, 2]}
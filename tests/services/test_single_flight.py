@@ -0,0 +1,101 @@
+import asyncio
+import pandas as pd
+import pytest
+from src.services.cache_service import CacheService
+from src.services.cache.local_dataframe_cache import LocalDataFrameCache
+from src.services.cache.single_flight import SingleFlight, cache_lock
+from src.services.cache.impl.redis_cache_backend import RedisCacheBackend
+
+
+async def test_single_flight_runs_one_task_per_key():
+    flight = SingleFlight()
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    results = await asyncio.gather(*(flight.do("k", compute) for _ in range(10)))
+
+    assert calls == 1
+    assert results == [1] * 10
+    assert not flight.in_flight("k")
+
+
+async def test_single_flight_propagates_errors_to_every_waiter():
+    flight = SingleFlight()
+
+    async def boom():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(*(flight.do("k", boom) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+async def test_cache_lock_is_exclusive_and_released(fake_redis):
+    backend = RedisCacheBackend(fake_redis)
+    async with cache_lock(backend, "lock:k", timeout=5) as first:
+        async with cache_lock(backend, "lock:k", timeout=5) as second:
+            assert first is True
+            assert second is False
+    assert "lock:k" not in fake_redis.store
+
+
+async def test_cache_dataframe_computes_once_for_concurrent_misses(fake_redis):
+    cache = CacheService(fake_redis, df_format="pickle", local_cache=LocalDataFrameCache(0))
+    cache.single_flight = SingleFlight()
+    calls = 0
+
+    @cache.cache_dataframe(key="metrics:clean_dataframe", ttl_seconds=600)
+    async def load() -> pd.DataFrame:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return pd.DataFrame({"quantity": [1.0, 2.0]})
+
+    frames = await asyncio.gather(*(load() for _ in range(5)))
+
+    assert calls == 1
+    assert all(len(df) == 2 for df in frames)
+
+
+async def test_waits_for_lock_holder_in_another_process(fake_redis):
+    cache = CacheService(fake_redis, df_format="pickle", local_cache=LocalDataFrameCache(0))
+    cache.single_flight = SingleFlight()
+    cache.lock_poll_interval_seconds = 0.01
+    await fake_redis.set("lock:metrics:clean_dataframe", b"other-process", nx=True)
+
+    @cache.cache_dataframe(key="metrics:clean_dataframe", ttl_seconds=600)
+    async def load() -> pd.DataFrame:
+        pytest.fail("lock holder should provide the frame")
+
+    async def other_process_finishes():
+        await asyncio.sleep(0.05)
+        writer = CacheService(fake_redis, df_format="pickle", local_cache=LocalDataFrameCache(0))
+        await writer.set_dataframe("metrics:clean_dataframe", pd.DataFrame({"quantity": [3.0]}), 600)
+
+    df, _ = await asyncio.gather(load(), other_process_finishes())
+    assert list(df["quantity"]) == [3.0]
+
+
+async def test_generic_cache_computes_once_for_concurrent_misses(fake_redis):
+    cache = CacheService(fake_redis, local_cache=LocalDataFrameCache(0))
+    cache.single_flight = SingleFlight()
+    calls = 0
+
+    class Service:
+        async def total(self, limit: int) -> int:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return limit * 2
+
+    cached_total = cache.cache(Service.total)
+    service = Service()
+    results = await asyncio.gather(*(cached_total(service, 21) for _ in range(5)))
+
+    assert calls == 1
+    assert results == [42] * 5
@@ -5,10 +5,11 @@ from src.database.models.user import User
 from src.repositories.impl.user_repository_sql_alchemy import UserRepository
 from src.services.cookie_service import CookieService
 from src.services.user.user_service import UserService
-from src.schemas.user import RegisterUserDTO, LoginUserDTO
+from src.schemas.user import RegisterUserDTO, LoginUserDTO, UserDTO
 from src.schemas.pagination import PageParams, PageResponse
 import bcrypt
 from src.services.user.auth_service import AuthService
+from src.exceptions.user_exceptions import UserNotFound
 
 
 # --- Fixtures ---
@@ -60,7 +61,7 @@ def mock_request():
 
 # --- Tests for register method ---
 
-def test_register_success(user_service: UserService, auth_service: AuthService, user_repository_mock: UserRepository, cookie_service_mock: CookieService, register_user_dto: RegisterUserDTO, mock_response: Response, sample_user: User):
+async def test_register_success(user_service: UserService, auth_service: AuthService, user_repository_mock: UserRepository, cookie_service_mock: CookieService, register_user_dto: RegisterUserDTO, mock_response: Response, sample_user: User):
     """Tests the successful registration of a user."""
     user_repository_mock.user_does_exist.return_value = False
     
@@ -70,7 +71,7 @@ def test_register_success(user_service: UserService, auth_service: AuthService,
         
         user_repository_mock.save.return_value = sample_user
         
-        registered_user = auth_service.register(register_user_dto, mock_response)
+        registered_user = await auth_service.register(register_user_dto, mock_response)
         
         user_repository_mock.user_does_exist.assert_called_once_with(register_user_dto.username)
         user_repository_mock.save.assert_called_once()
@@ -84,12 +85,12 @@ def test_register_success(user_service: UserService, auth_service: AuthService,
         cookie_service_mock.set_cookie.assert_called_once_with(mock_response, sample_user)
         assert registered_user == sample_user
 
-def test_register_username_exists(user_service: UserService, auth_service: AuthService, user_repository_mock: UserRepository, register_user_dto: RegisterUserDTO, mock_response: Response):
+async def test_register_username_exists(user_service: UserService, auth_service: AuthService, user_repository_mock: UserRepository, register_user_dto: RegisterUserDTO, mock_response: Response):
     """Tests registration when the username already exists."""
     user_repository_mock.user_does_exist.return_value = True
     
     with pytest.raises(HTTPException) as exc_info:
-        auth_service.register(register_user_dto, mock_response)
+        await auth_service.register(register_user_dto, mock_response)
     
     assert exc_info.value.status_code == status.HTTP_409_CONFLICT
     assert exc_info.value.detail == "Username already exists"
@@ -136,9 +137,9 @@ def test_login_invalid_password(user_service: UserService, auth_service: AuthSer
 
 # --- Tests for delete_all method ---
 
-def test_delete_all(user_service: UserService, auth_service: AuthService, user_repository_mock: UserRepository):
+async def test_delete_all(user_service: UserService, auth_service: AuthService, user_repository_mock: UserRepository):
     """Tests that the delete_all method calls the repository."""
-    user_service.delete_all()
+    await user_service.delete_all()
     user_repository_mock.delete_all.assert_called_once()
 
 # --- Tests for logout method ---
@@ -150,24 +151,24 @@ def test_logout(user_service: UserService, auth_service: AuthService, cookie_ser
 
 # --- Tests for get_current_user method ---
 
-def test_get_current_user_success(user_service: UserService, auth_service: AuthService, cookie_service_mock: CookieService, user_repository_mock: UserRepository, mock_request: Request, sample_user: User):
+async def test_get_current_user_success(user_service: UserService, auth_service: AuthService, cookie_service_mock: CookieService, user_repository_mock: UserRepository, mock_request: Request, sample_user: User):
     """Tests successfully getting the current user."""
     cookie_service_mock.get_user_id_from_token.return_value = sample_user.id
     user_repository_mock.get_by_id.return_value = sample_user
     
-    current_user = user_service.get_current_user(mock_request)
+    current_user = await user_service.get_current_user(mock_request)
     
     cookie_service_mock.get_user_id_from_token.assert_called_once_with(mock_request)
     user_repository_mock.get_by_id.assert_called_once_with(sample_user.id)
-    assert current_user == sample_user
+    assert current_user == UserDTO.model_validate(sample_user)
 
-def test_get_current_user_no_token_or_user_not_found(user_service: UserService, auth_service: AuthService, cookie_service_mock: CookieService, user_repository_mock: UserRepository, mock_request: Request):
+async def test_get_current_user_no_token_or_user_not_found(user_service: UserService, auth_service: AuthService, cookie_service_mock: CookieService, user_repository_mock: UserRepository, mock_request: Request):
     """Tests getting the current user when there is no token or the user is not found."""
     cookie_service_mock.get_user_id_from_token.return_value = None # Simulate no token or invalid token
     user_repository_mock.get_by_id.return_value = None # Simulate user not found when get_by_id is called with None
     
     with pytest.raises(HTTPException) as exc_info:
-        user_service.get_current_user(mock_request)
+        await user_service.get_current_user(mock_request)
     
     assert exc_info.value.status_code == status.HTTP_404_NOT_FOUND
     assert exc_info.value.detail == "User with id None not found" # get_user_by_id is called with None
@@ -176,22 +177,22 @@ def test_get_current_user_no_token_or_user_not_found(user_service: UserService,
 
 # --- Tests for get_user_by_id method ---
 
-def test_get_user_by_id_success(user_service: UserService, auth_service: AuthService, user_repository_mock: UserRepository, sample_user: User):
+async def test_get_user_by_id_success(user_service: UserService, auth_service: AuthService, user_repository_mock: UserRepository, sample_user: User):
     """Tests successfully getting a user by ID."""
     user_repository_mock.get_by_id.return_value = sample_user
     
-    found_user = user_service.get_user_by_id(sample_user.id)
+    found_user = await user_service.get_user_by_id(sample_user.id)
     
     user_repository_mock.get_by_id.assert_called_once_with(sample_user.id)
-    assert found_user == sample_user
+    assert found_user == UserDTO.model_validate(sample_user)
 
-def test_get_user_by_id_not_found(user_service: UserService, auth_service: AuthService, user_repository_mock: UserRepository):
+async def test_get_user_by_id_not_found(user_service: UserService, auth_service: AuthService, user_repository_mock: UserRepository):
     """Tests getting a user by ID when the user is not found."""
     user_repository_mock.get_by_id.return_value = None
     non_existent_id = "non-existent-id"
     
     with pytest.raises(HTTPException) as exc_info:
-        user_service.get_user_by_id(non_existent_id)
+        await user_service.get_user_by_id(non_existent_id)
     
     assert exc_info.value.status_code == status.HTTP_404_NOT_FOUND
     assert exc_info.value.detail == f"User with id {non_existent_id} not found"
@@ -251,4 +252,75 @@ def test_list_users_empty_results(user_service: UserService, auth_service: AuthS
     assert response.page == 1
     assert response.limit == 10
     assert response.total_results == 0
-    assert response.total_pages == 0 # (0 + 10 - 1) // 10 = 0
\ No newline at end of file
+    assert response.total_pages == 0 # (0 + 10 - 1) // 10 = 0
+
+# --- Cached user lookups ---
+
+def _cache_service(fake_redis):
+    from src.services.cache_service import CacheService
+    from src.services.cache.local_dataframe_cache import LocalDataFrameCache
+    from src.services.cache.single_flight import SingleFlight
+    cache_service = CacheService(fake_redis, local_cache=LocalDataFrameCache(0))
+    cache_service.single_flight = SingleFlight()
+    return cache_service
+
+@pytest.fixture
+def stored_user():
+    return User(id=7, username="testuser", password="hashed_password")
+
+async def test_user_lookups_are_cached_without_the_password(user_repository_mock, cookie_service_mock, fake_redis, stored_user, mock_request):
+    service = UserService(user_repository_mock, cookie_service_mock, _cache_service(fake_redis))
+    user_repository_mock.get_by_id.return_value = stored_user
+    cookie_service_mock.get_user_id_from_token.return_value = stored_user.id
+
+    first = await service.get_user_by_id(stored_user.id)
+    second = await service.get_current_user(mock_request)
+
+    assert first == second == UserDTO(id=7, username="testuser", is_active=True)
+    user_repository_mock.get_by_id.assert_called_once_with(stored_user.id)
+    assert not any(b"hashed_password" in value for value in fake_redis.store.values())
+
+async def test_users_deleted_on_another_worker_are_not_served(user_repository_mock, cookie_service_mock, fake_redis, stored_user, mock_request):
+    # Two workers: their own CacheService and UserService, one shared backend.
+    worker_a = UserService(user_repository_mock, cookie_service_mock, _cache_service(fake_redis))
+    worker_b = UserService(user_repository_mock, cookie_service_mock, _cache_service(fake_redis))
+    user_repository_mock.get_by_id.return_value = stored_user
+    cookie_service_mock.get_user_id_from_token.return_value = stored_user.id
+    await worker_b.get_current_user(mock_request)
+
+    await worker_a.delete_all()
+    user_repository_mock.get_by_id.return_value = None
+
+    with pytest.raises(UserNotFound):
+        await worker_b.get_current_user(mock_request)
+
+async def test_registering_invalidates_cached_lookups(user_repository_mock, cookie_service_mock, fake_redis, stored_user, register_user_dto, mock_response):
+    service = UserService(user_repository_mock, cookie_service_mock, _cache_service(fake_redis))
+    auth = AuthService(user_repository_mock, cookie_service_mock, _cache_service(fake_redis))
+    user_repository_mock.get_by_id.return_value = stored_user
+    await service.get_user_by_id(stored_user.id)
+
+    user_repository_mock.user_does_exist.return_value = False
+    user_repository_mock.save.return_value = User(id=8, username=register_user_dto.username)
+    await auth.register(register_user_dto, mock_response)
+    await service.get_user_by_id(stored_user.id)
+
+    assert user_repository_mock.get_by_id.call_count == 2
+
+async def test_unknown_users_are_cached_until_a_user_registers(user_repository_mock, cookie_service_mock, fake_redis, stored_user, register_user_dto, mock_response):
+    worker_a = AuthService(user_repository_mock, cookie_service_mock, _cache_service(fake_redis))
+    worker_b = UserService(user_repository_mock, cookie_service_mock, _cache_service(fake_redis))
+    user_repository_mock.get_by_id.return_value = None
+    for _ in range(2):
+        with pytest.raises(UserNotFound) as exc_info:
+            await worker_b.get_user_by_id(stored_user.id)
+    assert exc_info.value.status_code == status.HTTP_404_NOT_FOUND
+    user_repository_mock.get_by_id.assert_called_once()
+
+    # Registered through worker A: worker B finds the user on its next lookup.
+    user_repository_mock.user_does_exist.return_value = False
+    user_repository_mock.save.return_value = stored_user
+    user_repository_mock.get_by_id.return_value = stored_user
+    await worker_a.register(register_user_dto, mock_response)
+
+    assert (await worker_b.get_user_by_id(stored_user.id)).username == stored_user.username
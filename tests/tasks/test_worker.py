@@ -0,0 +1,39 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from src.core import redis_pool
+from src.tasks import worker
+
+
+@pytest.fixture
+def worker_loop():
+    worker.shutdown_worker_process()
+    yield
+    worker.shutdown_worker_process()
+
+
+def test_concurrent_tasks_share_the_worker_loop(worker_loop):
+    async def task(n: int):
+        await asyncio.sleep(0.05)
+        return n, asyncio.get_running_loop(), threading.current_thread().name
+
+    # As with `-P threads -c 4`: several task threads run coroutines at the same time.
+    with ThreadPoolExecutor(max_workers=4) as tasks:
+        results = list(tasks.map(lambda n: worker._run(task(n)), range(8)))
+
+    assert [n for n, _, _ in results] == list(range(8))
+    assert {loop for _, loop, _ in results} == {worker._worker_loop}
+    assert {thread for _, _, thread in results} == {"celery-event-loop"}
+    assert redis_pool.get_redis_pool() is not None
+
+
+def test_shutdown_closes_the_pool_and_stops_the_loop(worker_loop):
+    worker.init_worker_process()
+    loop, thread = worker._worker_loop, worker._worker_loop_thread
+
+    worker.shutdown_worker_process()
+
+    assert not thread.is_alive() and loop.is_closed()
+    assert redis_pool.get_redis_pool() is None
+    assert worker._run(asyncio.sleep(0, result="restarted")) == "restarted"